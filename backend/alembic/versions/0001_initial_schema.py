@@ -0,0 +1,91 @@
+"""Initial schema, as created by Base.metadata.create_all before migrations existed
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-09-01 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.Column("is_admin", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_user_id", "user", ["id"])
+    op.create_index("ix_user_username", "user", ["username"], unique=True)
+    op.create_index("ix_user_email", "user", ["email"], unique=True)
+
+    op.create_table(
+        "event",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=120), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("location", sa.String(length=200), nullable=True),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("end_time", sa.DateTime(), nullable=False),
+        sa.Column("capacity", sa.Integer(), nullable=True),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("category", sa.String(length=50), nullable=True),
+        sa.Column("image_url", sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(["created_by"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_event_id", "event", ["id"])
+
+    op.create_table(
+        "registration",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("event_id", sa.Integer(), nullable=True),
+        sa.Column("registration_date", sa.DateTime(), nullable=True),
+        sa.Column("check_in_time", sa.DateTime(), nullable=True),
+        sa.Column("unique_code", sa.String(length=36), nullable=True),
+        sa.Column("qr_code_path", sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(["event_id"], ["event.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("unique_code"),
+    )
+    op.create_index("ix_registration_id", "registration", ["id"])
+
+    op.create_table(
+        "bugreport",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=120), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("reported_by", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["reported_by"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_bugreport_id", "bugreport", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bugreport_id", table_name="bugreport")
+    op.drop_table("bugreport")
+    op.drop_index("ix_registration_id", table_name="registration")
+    op.drop_table("registration")
+    op.drop_index("ix_event_id", table_name="event")
+    op.drop_table("event")
+    op.drop_index("ix_user_email", table_name="user")
+    op.drop_index("ix_user_username", table_name="user")
+    op.drop_index("ix_user_id", table_name="user")
+    op.drop_table("user")
@@ -0,0 +1,84 @@
+"""Event counters, one registration per user and event, stored predictions, login indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-09-15 00:00:00
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# Registrations that lose to another one of the same (user, event): a checked-in row
+# wins over one that is not, otherwise the earliest registration wins
+_DUPLICATE_REGISTRATIONS = (
+    "FROM registration WHERE EXISTS (SELECT 1 FROM registration AS keep "
+    "WHERE keep.user_id = registration.user_id AND keep.event_id = registration.event_id "
+    "AND keep.id <> registration.id AND ("
+    "(keep.check_in_time IS NOT NULL AND registration.check_in_time IS NULL) "
+    "OR ((keep.check_in_time IS NULL) = (registration.check_in_time IS NULL) AND keep.id < registration.id)))"
+)
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One registration per (user, event) pair must remain for the constraint to be added
+    duplicates = op.get_bind().execute(
+        sa.text(f"SELECT id, user_id, event_id {_DUPLICATE_REGISTRATIONS} ORDER BY id")
+    ).all()
+    if duplicates:
+        logger.warning(
+            "Deleting %d duplicate registrations (id, user_id, event_id): %s",
+            len(duplicates), ", ".join(str(tuple(row)) for row in duplicates),
+        )
+        op.execute(f"DELETE {_DUPLICATE_REGISTRATIONS}")
+    with op.batch_alter_table("registration") as batch_op:
+        batch_op.create_unique_constraint("uq_registration_user_event", ["user_id", "event_id"])
+
+    with op.batch_alter_table("event") as batch_op:
+        batch_op.add_column(sa.Column("registered_count", sa.Integer(), nullable=False, server_default="0"))
+        batch_op.add_column(sa.Column("checked_in_count", sa.Integer(), nullable=False, server_default="0"))
+    op.execute(
+        "UPDATE event SET "
+        "registered_count = (SELECT count(*) FROM registration WHERE registration.event_id = event.id), "
+        "checked_in_count = (SELECT count(registration.check_in_time) FROM registration "
+        "WHERE registration.event_id = event.id)"
+    )
+
+    op.create_index("ix_user_email_lower", "user", [sa.text("lower(email)")])
+    op.create_index("ix_user_username_lower", "user", [sa.text("lower(username)")])
+
+    op.create_table(
+        "attendance_prediction",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("model_version", sa.String(length=64), nullable=False),
+        sa.Column("probability", sa.Float(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["event_id"], ["event.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("event_id", "user_id", "model_version", name="uq_attendance_prediction"),
+    )
+    op.create_index("ix_attendance_prediction_id", "attendance_prediction", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_attendance_prediction_id", table_name="attendance_prediction")
+    op.drop_table("attendance_prediction")
+    op.drop_index("ix_user_username_lower", table_name="user")
+    op.drop_index("ix_user_email_lower", table_name="user")
+    with op.batch_alter_table("registration") as batch_op:
+        batch_op.drop_constraint("uq_registration_user_event", type_="unique")
+    with op.batch_alter_table("event") as batch_op:
+        batch_op.drop_column("checked_in_count")
+        batch_op.drop_column("registered_count")
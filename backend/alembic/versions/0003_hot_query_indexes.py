@@ -0,0 +1,33 @@
+"""Indexes for the filter columns of the event, registration and bug report queries
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-10-01 00:00:00
+"""
+from alembic import op
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_registration_event_id_check_in_time", "registration", ["event_id", "check_in_time"]),
+    ("ix_registration_user_id_registration_date", "registration", ["user_id", "registration_date"]),
+    ("ix_event_category_start_time", "event", ["category", "start_time"]),
+    ("ix_event_start_time", "event", ["start_time"]),
+    ("ix_event_end_time", "event", ["end_time"]),
+    ("ix_event_created_by", "event", ["created_by"]),
+    ("ix_bugreport_reported_by", "bugreport", ["reported_by"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
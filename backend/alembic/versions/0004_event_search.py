@@ -0,0 +1,51 @@
+"""Keyword search over events: tsvector GIN index on PostgreSQL, FTS5 table on SQLite
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-10-08 00:00:00
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+SEARCH_DOCUMENT = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE event_fts USING fts5("
+    "title, description, content='event', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER event_fts_ai AFTER INSERT ON event BEGIN "
+    "INSERT INTO event_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER event_fts_ad AFTER DELETE ON event BEGIN "
+    "INSERT INTO event_fts(event_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER event_fts_au AFTER UPDATE ON event BEGIN "
+    "INSERT INTO event_fts(event_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO event_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    # Index the events that already exist
+    "INSERT INTO event_fts(event_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.create_index("ix_event_search", "event", [sa.text(SEARCH_DOCUMENT)], postgresql_using="gin")
+    elif dialect == "sqlite":
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.drop_index("ix_event_search", table_name="event")
+    elif dialect == "sqlite":
+        for trigger in ("event_fts_au", "event_fts_ad", "event_fts_ai"):
+            op.execute(f"DROP TRIGGER {trigger}")
+        op.execute("DROP TABLE event_fts")
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 from app.api.api_v1.endpoints import test
-from app.api.api_v1.endpoints import auth, events, registrations, users, bug_reports, ml
+from app.api.api_v1.endpoints import auth, events, registrations, users, bug_reports, ml, metrics
 
 
 api_router = APIRouter()
@@ -10,4 +10,5 @@ api_router.include_router(events.router, prefix="/events", tags=["events"])
 api_router.include_router(registrations.router, prefix="/registrations", tags=["registrations"])
 api_router.include_router(bug_reports.router, prefix="/bugs", tags=["bug reports"])
 api_router.include_router(ml.router, prefix="/ml", tags=["machine learning"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 api_router.include_router(test.router, prefix="/test", tags=["test"])
\ No newline at end of file
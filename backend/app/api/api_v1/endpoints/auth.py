@@ -3,6 +3,9 @@ from typing import Any
 
 from fastapi import APIRouter, Body, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 # Direct imports for schemas instead of using app.schemas
@@ -11,14 +14,14 @@ from app.schemas.user import User as UserSchema, UserCreate
 
 from app.api import deps
 from app.core.config import settings
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.security import create_access_token, verify_and_update_password_async
 from app.db.models.user import User
 
 router = APIRouter()
 
 @router.post("/login", response_model=Token)
-def login(
-    db: Session = Depends(deps.get_db),
+async def login(
+    db: AsyncSession = Depends(deps.get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
@@ -27,17 +30,38 @@ def login(
     """
     
   
-    user = db.query(User).filter(User.email == form_data.username).first()
-    
- 
-    if not user:
-        user = db.query(User).filter(User.username == form_data.username).first()
+    login = form_data.username.lower()
+    # One lookup for both forms. Case-insensitive matching can find several accounts,
+    # e.g. "Bob" and "bob", so exact matches rank first and each is tried in turn.
+    user = None
+    email_match = func.lower(User.email) == login
+    candidates = (await db.execute(
+        select(User.id, User.password_hash).where(or_(email_match, func.lower(User.username) == login))
+        .order_by(
+            (User.email == form_data.username).desc(),
+            (User.username == form_data.username).desc(),
+            email_match.desc(),
+            User.id,
+        )
+    )).all()
+    # End the read transaction so the connection returns to the pool while hashing runs
+    await db.rollback()
     
-    if not user or not user.verify_password(form_data.password):
+    new_hash = None
+    for candidate in candidates:
+        verified, new_hash = await verify_and_update_password_async(form_data.password, candidate.password_hash)
+        if verified:
+            user = candidate
+            break
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect username/email or password",
         )
+    if new_hash:
+        # Legacy or outdated hash; store it in the configured scheme
+        await db.execute(update(User).where(User.id == user.id).values(password_hash=new_hash))
+        await db.commit()
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
@@ -58,20 +82,6 @@ def register(
     Create new user without the need to be logged in.
     """
     
-    user = db.query(User).filter(User.email == user_in.email).first()
-    if user:
-        raise HTTPException(
-            status_code=400,
-            detail="The user with this email already exists in the system.",
-        )
-    
-    user = db.query(User).filter(User.username == user_in.username).first()
-    if user:
-        raise HTTPException(
-            status_code=400,
-            detail="The user with this username already exists in the system.",
-        )
-    
     new_user = User(
         email=user_in.email,
         username=user_in.username,
@@ -79,6 +89,15 @@ def register(
     )
     new_user.set_password(user_in.password)
     db.add(new_user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as e:
+        # The unique indexes on email and username reject duplicates
+        db.rollback()
+        field = "email" if "email" in str(e.orig) else "username"
+        raise HTTPException(
+            status_code=400,
+            detail=f"The user with this {field} already exists in the system.",
+        )
     db.refresh(new_user)
     return new_user
\ No newline at end of file
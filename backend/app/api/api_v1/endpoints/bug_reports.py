@@ -1,33 +1,39 @@
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.api.pagination import KeysetPage, after_query, before_query
+from app.api.serializers import RowSerializer
+from app.core.encoding import json_response
 from app.schemas.bug_report import BugReport, BugReportCreate, BugReportUpdate
 from app.db.models.bug_report import BugReport as BugReportModel
 from app.db.models.user import User
 
 router = APIRouter()
 
+bug_report_rows = RowSerializer(BugReport, BugReportModel)
+
 @router.get("/", response_model=List[BugReport])
 def list_bug_reports(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = after_query,
+    before: Optional[str] = before_query,
     current_user: User = Depends(deps.get_current_user)
 ):
     """
     Retrieve bug reports.
     """
 
-    if current_user.is_admin:
-        bug_reports = db.query(BugReportModel).offset(skip).limit(limit).all()
-    else:
-        bug_reports = db.query(BugReportModel).filter(
-            BugReportModel.reported_by == current_user.id
-        ).offset(skip).limit(limit).all()
+    page = KeysetPage((BugReportModel.id,), limit, after, before, skip)
+    query = db.query(*bug_report_rows.columns())
+    if not current_user.is_admin:
+        query = query.filter(BugReportModel.reported_by == current_user.id)
     
-    return bug_reports
+    bug_reports = page.rows(page.apply(query).all())
+    return json_response(bug_report_rows.dump(bug_reports), page.headers())
 
 @router.post("/", response_model=BugReport)
 def create_bug_report(
@@ -48,6 +54,7 @@ def create_bug_report(
     db.add(bug_report)
     db.commit()
     db.refresh(bug_report)
+    deps.mark_recent_write(current_user.id)
     return bug_report
 
 @router.get("/{bug_report_id}", response_model=BugReport)
@@ -116,6 +123,7 @@ def update_bug_report(
     
     db.commit()
     db.refresh(bug_report)
+    deps.mark_recent_write(current_user.id)
     return bug_report
 
 @router.delete("/{bug_report_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -137,4 +145,5 @@ def delete_bug_report(
     
     db.delete(bug_report)
     db.commit()
+    deps.mark_recent_write(current_user.id)
     return None
\ No newline at end of file
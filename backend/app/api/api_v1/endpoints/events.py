@@ -1,48 +1,126 @@
+from contextlib import nullcontext
 from typing import List, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
 from app.api import deps
+from app.api.pagination import KeysetPage, after_query, before_query
+from app.api.serializers import RowSerializer
+from app.core.config import settings
 from app.schemas.event import Event, EventCreate, EventUpdate, EventWithAttendees
 from app.db.models.event import Event as EventModel
-from app.db.models.registration import Registration
 from app.db.models.user import User
+from app.db.search import keyword_condition
+from app.services.event_cache import (
+    EVENT_LIST_SCOPE, cached_response, event_cache, event_scope, invalidate_events,
+)
 
 router = APIRouter()
 from fastapi import Response
 
+# sort value -> (keyset columns, descending); every ordering ends with the unique id
+EVENT_SORTS = {
+    "id": ((EventModel.id,), False),
+    "start_time": ((EventModel.start_time, EventModel.id), False),
+    "-start_time": ((EventModel.start_time, EventModel.id), True),
+}
+
+
+# Also the fields a listing can be narrowed to with ?fields=
+event_rows = RowSerializer(EventWithAttendees, EventModel)
+
+
+def _sparse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Requested field names in schema order, always starting with id; None for every field"""
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - event_rows.fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return [name for name in event_rows.fields if name == "id" or name in requested]
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Event times are stored as naive UTC; convert timezone-aware query values to match"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
 @router.get("/", response_model=List[EventWithAttendees])
-def list_events(
-    db: Session = Depends(deps.get_db),
+async def list_events(
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 100,
     category: Optional[str] = Query(None),
-    current_user: User = Depends(deps.get_current_user)
+    start_after: Optional[datetime] = Query(None, description="Only events starting at or after this time"),
+    start_before: Optional[datetime] = Query(None, description="Only events starting before this time"),
+    upcoming: bool = Query(False, description="Only events that have not started yet"),
+    location: Optional[str] = Query(None, description="Case-insensitive substring of the location"),
+    q: Optional[str] = Query(None, max_length=200, description="Keywords that must all appear in the title or description"),
+    sort: str = Query("id", pattern="^(id|start_time|-start_time)$"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return, e.g. title,start_time (id is always included)"
+    ),
+    after: Optional[str] = after_query,
+    before: Optional[str] = before_query,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(deps.get_async_current_user)
 ):
     """
-    Retrieve events with optional filtering by category.
+    Retrieve events, filtered by category, start time, location and keywords.
+    With `fields`, only those columns are read and returned.
+    Rendered pages are cached until an event or its counters change.
     """
-    query = db.query(EventModel)
-    
-   
-    if category:
-        query = query.filter(EventModel.category == category)
-    
-    events = query.offset(skip).limit(limit).all()
-    
- 
-    result = []
-    for event in events:
-        registered_count = db.query(func.count(Registration.id)).filter(
-            Registration.event_id == event.id
-        ).scalar()
-        
-        event_dict = {**event.__dict__}
-        event_dict["registered_count"] = registered_count
-        result.append(event_dict)
-    
-    return result
+    names = _sparse_fields(fields)
+    columns, descending = EVENT_SORTS[sort]
+    page = KeysetPage(columns, limit, after, before, skip, descending)
+    start_after, start_before = _naive_utc(start_after), _naive_utc(start_before)
+    key = await event_cache.key_async(
+        [EVENT_LIST_SCOPE],
+        {
+            "skip": skip, "limit": limit, "category": category, "start_after": start_after,
+            "start_before": start_before, "upcoming": upcoming, "location": location, "q": q,
+            "sort": sort, "fields": names, "after": after, "before": before,
+        },
+    )
+    # A user's own recent write may be newer than the cached page
+    entry = None if await deps.has_recent_write_async(current_user.id) else await event_cache.get_async(key)
+    if entry is None:
+        # Pages are cached from the primary only: a lagging replica's page would be stored
+        # under the new generation and served to everyone until it expired
+        read = nullcontext(db) if event_cache.enabled else deps.async_read_session(db, current_user.id)
+        async with read as read_db:
+            # The keyset columns are read too, after the requested ones, to build the cursors
+            query = select(*event_rows.columns(names, extra=columns))
+            
+           
+            if category:
+                query = query.where(EventModel.category == category)
+            if start_after:
+                query = query.where(EventModel.start_time >= start_after)
+            if start_before:
+                query = query.where(EventModel.start_time < start_before)
+            if upcoming:
+                query = query.where(EventModel.start_time >= datetime.utcnow())
+            if location:
+                query = query.where(EventModel.location.icontains(location, autoescape=True))
+            if q:
+                condition = keyword_condition(read_db.bind.dialect.name, EventModel, q)
+                if condition is not None:
+                    query = query.where(condition)
+            
+            result = await read_db.execute(page.apply(query))
+            rows = result.all()
+        entry = await event_cache.store_async(key, event_rows.dump(page.rows(rows), names), page.headers())
+    return cached_response(entry, if_none_match)
 
 @router.post("/", response_model=Event)
 def create_event(
@@ -72,6 +150,8 @@ def create_event(
         db.add(event)
         db.commit()
         db.refresh(event)
+        deps.mark_recent_write(current_user.id)
+        invalidate_events()
         return event
     except Exception as e:
         db.rollback()
@@ -87,26 +167,24 @@ def get_event(
     *,
     db: Session = Depends(deps.get_db),
     event_id: int,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(deps.get_current_user)
 ):
     """
     Get event by ID.
     """
-    event = db.query(EventModel).filter(EventModel.id == event_id).first()
-    if not event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event not found"
-        )
-    
-    registered_count = db.query(func.count(Registration.id)).filter(
-        Registration.event_id == event.id
-    ).scalar()
-    
-    event_dict = {**event.__dict__}
-    event_dict["registered_count"] = registered_count
-    
-    return event_dict
+    key = event_cache.key([event_scope(event_id)], {"id": event_id})
+    entry = event_cache.get(key)
+    if entry is None:
+        event = db.query(EventModel).filter(EventModel.id == event_id).first()
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
+            )
+        
+        entry = event_cache.store(key, EventWithAttendees.model_validate(event).model_dump(mode="json"))
+    return cached_response(entry, if_none_match)
 
 @router.put("/{event_id}", response_model=Event)
 def update_event(
@@ -140,6 +218,8 @@ def update_event(
     
     db.commit()
     db.refresh(event)
+    deps.mark_recent_write(current_user.id)
+    invalidate_events([event.id])
     return event
 
 @router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -168,18 +248,25 @@ def delete_event(
     
     db.delete(event)
     db.commit()
+    deps.mark_recent_write(current_user.id)
+    invalidate_events([event_id])
     return None
 
 
 @router.options("/")
-async def options_handler():
-    return Response(
-        content="",
-        status_code=200,
-        headers={
-            "Access-Control-Allow-Origin": "http://localhost:3000",
-            "Access-Control-Allow-Methods": "POST, GET, DELETE, OPTIONS",
-            "Access-Control-Allow-Headers": "Content-Type, Authorization",
-            "Access-Control-Allow-Credentials": "true",
-        }
-    )
\ No newline at end of file
+async def options_handler(origin: Optional[str] = Header(None)):
+    """
+    Plain OPTIONS request. CORS preflights never reach this handler: CORSMiddleware
+    answers them, with Access-Control-Max-Age so browsers reuse the answer.
+    """
+    headers = {
+        "Allow": "GET, POST, OPTIONS",
+        "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+        "Access-Control-Allow-Headers": "Content-Type, Authorization",
+        "Access-Control-Max-Age": str(settings.CORS_MAX_AGE_SECONDS),
+        "Vary": "Origin",
+    }
+    if origin in settings.BACKEND_CORS_ORIGINS:
+        headers["Access-Control-Allow-Origin"] = origin
+        headers["Access-Control-Allow-Credentials"] = "true"
+    return Response(content="", status_code=200, headers=headers)
\ No newline at end of file
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+
+from app.api import deps
+from app.db.models.user import User
+from app.db.session import async_engine, engine, pool_stats
+from app.services.event_cache import event_cache
+
+router = APIRouter()
+
+@router.get("/")
+def read_metrics(
+    current_user: User = Depends(deps.get_current_admin_user)  # Only admins can see metrics
+):
+    """
+    Runtime metrics of this worker process.
+    """
+    return {
+        "auth_cache": {
+            "tokens": deps.token_cache.stats(),
+            "users": deps.user_cache.stats(),
+        },
+        "event_cache": event_cache.stats(),
+        "db_pool": pool_stats(engine),
+        "db_pool_async": pool_stats(async_engine.sync_engine),
+    }
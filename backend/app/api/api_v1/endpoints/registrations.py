@@ -1,51 +1,49 @@
-import os
-from typing import List, Any
-import qrcode
+from typing import List, Any, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 
 from app.api import deps
+from app.api.pagination import KeysetPage, after_query, before_query
+from app.api.serializers import RowSerializer
+from app.core.encoding import json_response
+from app.core.http_cache import etag_matches
 from app.schemas.registration import Registration, RegistrationCreate, RegistrationWithQR
 from app.db.models.registration import Registration as RegistrationModel
 from app.db.models.event import Event
 from app.db.models.user import User
+from app.db.counters import reserve_seat_async, adjust_checked_in_count_async
 from app.core.config import settings
+from app.services.event_cache import invalidate_events_async
+from app.services.qr import QR_MEDIA_TYPES, get_qr_image, qr_etag, stream_qr_zip, warm_qr_cache
 
 router = APIRouter()
 
-def generate_qr_code(registration_id: str, unique_code: str) -> str:
-    """Generate QR code for event registration and return the file path"""
-  
-    os.makedirs(settings.QR_CODE_DIR, exist_ok=True)
+QR_CACHE_CONTROL = "private, max-age=31536000, immutable"
 
-    qr_data = f"{registration_id}:{unique_code}"
-    
- 
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(qr_data)
-    qr.make(fit=True)
-    
-    img = qr.make_image(fill_color="black", back_color="white")
-    
+registration_rows = RowSerializer(Registration, RegistrationModel)
 
-    file_path = f"{settings.QR_CODE_DIR}/registration_{registration_id}.png"
-    img.save(file_path)
-    
+def qr_code_url(registration_id: int) -> str:
+    """URL of the endpoint that renders a registration's QR code on demand"""
+    return f"{settings.API_V1_STR}/registrations/{registration_id}/qr"
 
-    return f"/static/qrcodes/registration_{registration_id}.png"
+def generate_qr_code(registration_id: str, unique_code: str) -> str:
+    """Pre-render the registration's QR code into the in-memory cache and return its URL.
+    Nothing is written to disk; the image is served by GET /registrations/{id}/qr."""
+    warm_qr_cache(f"{registration_id}:{unique_code}")
+    return qr_code_url(registration_id)
 
 @router.get("/", response_model=List[Registration])
 def list_registrations(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = after_query,
+    before: Optional[str] = before_query,
     current_user: User = Depends(deps.get_current_user)
 ):
     """
@@ -53,50 +51,45 @@ def list_registrations(
     If user is admin, retrieve all registrations.
     If user is regular user, retrieve only their registrations.
     """
-    if current_user.is_admin:
-        registrations = db.query(RegistrationModel).offset(skip).limit(limit).all()
-    else:
-        registrations = db.query(RegistrationModel).filter(
-            RegistrationModel.user_id == current_user.id
-        ).offset(skip).limit(limit).all()
-    
-    return registrations
+    page = KeysetPage((RegistrationModel.id,), limit, after, before, skip)
+    query = db.query(*registration_rows.columns())
+    if not current_user.is_admin:
+        query = query.filter(RegistrationModel.user_id == current_user.id)
+    
+    registrations = page.rows(page.apply(query).all())
+    return json_response(registration_rows.dump(registrations), page.headers())
 
 @router.post("/", response_model=RegistrationWithQR)
-def create_registration(
+async def create_registration(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     registration_in: RegistrationCreate,
-    current_user: User = Depends(deps.get_current_user)
+    current_user: User = Depends(deps.get_async_current_user)
 ):
     """
-    Create new registration and generate QR code.
+    Create new registration and queue its QR code for rendering.
     """
-    # Check if event exists
-    event = db.query(Event).filter(Event.id == registration_in.event_id).first()
-    if not event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event not found"
-        )
-    
-
-    existing_registration = db.query(RegistrationModel).filter(
-        RegistrationModel.user_id == current_user.id,
-        RegistrationModel.event_id == registration_in.event_id
-    ).first()
-    
-    if existing_registration:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User is already registered for this event"
-        )
-    
-    registered_count = db.query(func.count(RegistrationModel.id)).filter(
-        RegistrationModel.event_id == registration_in.event_id
-    ).scalar()
+    user_id = current_user.id
     
-    if event.capacity and registered_count >= event.capacity:
+    # Claim a seat first: the conditional UPDATE locks the event row, so concurrent
+    # registrations for the same event serialize here and capacity is never oversold
+    if not await reserve_seat_async(db, registration_in.event_id):
+        await db.rollback()
+        event = await db.scalar(select(Event.id).where(Event.id == registration_in.event_id))
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
+            )
+        existing_registration = await db.scalar(select(RegistrationModel.id).where(
+            RegistrationModel.user_id == user_id,
+            RegistrationModel.event_id == registration_in.event_id
+        ))
+        if existing_registration:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User is already registered for this event"
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Event is at full capacity"
@@ -104,27 +97,66 @@ def create_registration(
     
   
     registration = RegistrationModel(
-        user_id=current_user.id,
+        user_id=user_id,
         event_id=registration_in.event_id
     )
     db.add(registration)
-    db.commit()
-    db.refresh(registration)
+    try:
+        await db.flush()
+        registration.qr_code_path = qr_code_url(registration.id)
+        await db.commit()
+    except IntegrityError:
+        # uq_registration_user_event rejected a duplicate; rolling back releases the seat
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User is already registered for this event"
+        )
+    await db.refresh(registration)
+    await deps.mark_recent_write_async(user_id)
+    await invalidate_events_async([registration.event_id])
     
-   
-    qr_path = generate_qr_code(str(registration.id), registration.unique_code)
+    # Rendering happens off the request path; the QR endpoint renders on a cache miss anyway
+    generate_qr_code(str(registration.id), registration.unique_code)
     
-
-    registration.qr_code_path = qr_path
-    db.commit()
-    db.refresh(registration)
-    
-
     return {
         **registration.__dict__,
-        "qr_code_url": qr_path
+        "qr_code_url": registration.qr_code_path
     }
 
+@router.get("/event/{event_id}/tickets.zip")
+def download_event_tickets(
+    *,
+    db: Session = Depends(deps.get_db),
+    event_id: int,
+    current_user: User = Depends(deps.get_current_admin_user)  # Only admins can print tickets
+):
+    """
+    Stream a ZIP with the QR ticket of every registration for an event.
+    Images are rendered in parallel by the worker pool and written to the response
+    entry by entry, so memory use does not grow with the size of the event.
+    """
+    event = db.query(Event.id).filter(Event.id == event_id).first()
+    if not event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found"
+        )
+    
+    tickets = db.query(RegistrationModel.id, RegistrationModel.unique_code).filter(
+        RegistrationModel.event_id == event_id
+    ).order_by(RegistrationModel.id).all()
+    
+    items = (
+        (f"registration_{registration_id}.png", f"{registration_id}:{unique_code}")
+        for registration_id, unique_code in tickets
+    )
+    return StreamingResponse(
+        stream_qr_zip(items),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="event_{event_id}_tickets.zip"'}
+    )
+
 @router.get("/{registration_id}", response_model=RegistrationWithQR)
 def get_registration(
     *,
@@ -150,21 +182,59 @@ def get_registration(
     
     return {
         **registration.__dict__,
-        "qr_code_url": registration.qr_code_path
+        "qr_code_url": qr_code_url(registration.id)
     }
 
-@router.post("/{registration_id}/check-in")
-def check_in(
+@router.get("/{registration_id}/qr")
+def get_registration_qr(
     *,
     db: Session = Depends(deps.get_db),
     registration_id: int,
+    format: str = Query("png", pattern="^(png|svg)$"),
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(deps.get_current_user)
+):
+    """
+    Render the registration's QR code (PNG or SVG) on demand.
+    The image never changes for a registration, so it is served with a strong ETag
+    and cached indefinitely by the client.
+    """
+    registration = db.query(RegistrationModel).filter(RegistrationModel.id == registration_id).first()
+    if not registration:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Registration not found"
+        )
+    
+    if not current_user.is_admin and registration.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to access this registration"
+        )
+    
+    qr_data = f"{registration.id}:{registration.unique_code}"
+    headers = {"ETag": qr_etag(qr_data, format), "Cache-Control": QR_CACHE_CONTROL}
+    if etag_matches(headers["ETag"], if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(
+        content=get_qr_image(qr_data, format),
+        media_type=QR_MEDIA_TYPES[format],
+        headers=headers
+    )
+
+@router.post("/{registration_id}/check-in")
+async def check_in(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    registration_id: int,
     unique_code: str,
-    current_user: User = Depends(deps.get_current_admin_user)  # Only admins can check in
+    current_user: User = Depends(deps.get_async_current_admin_user)  # Only admins can check in
 ):
     """
     Check in a participant using their registration QR code.
     """
-    registration = db.query(RegistrationModel).filter(RegistrationModel.id == registration_id).first()
+    registration = await db.scalar(select(RegistrationModel).where(RegistrationModel.id == registration_id))
     if not registration:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -178,14 +248,26 @@ def check_in(
             detail="Invalid check-in code"
         )
     
-    if registration.check_in_time:
+    # Only the request whose UPDATE still finds check_in_time unset counts the check-in
+    event_id = registration.event_id
+    checked_in = await db.execute(
+        update(RegistrationModel)
+        .where(RegistrationModel.id == registration_id, RegistrationModel.check_in_time.is_(None))
+        .values(check_in_time=datetime.utcnow())
+    )
+    if checked_in.rowcount != 1:
+        await db.rollback()
+        check_in_time = await db.scalar(
+            select(RegistrationModel.check_in_time).where(RegistrationModel.id == registration_id)
+        )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Already checked in at " + str(registration.check_in_time)
+            detail="Already checked in at " + str(check_in_time)
         )
     
-    registration.check_in_time = datetime.utcnow()
-    db.commit()
-    db.refresh(registration)
+    await adjust_checked_in_count_async(db, event_id, 1)
+    await db.commit()
+    await deps.mark_recent_write_async(current_user.id)
+    await invalidate_events_async([event_id])
     
     return {"status": "success", "message": "Check-in successful"}
\ No newline at end of file
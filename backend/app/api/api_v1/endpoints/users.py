@@ -1,23 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.api import deps
+from app.api.pagination import KeysetPage, after_query, before_query
+from app.api.serializers import RowSerializer
+from app.core.encoding import json_response
 from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
 from app.db.models.user import User as UserModel
 
 router = APIRouter()
 
+user_rows = RowSerializer(UserSchema, UserModel)
+
 @router.get("/", response_model=List[UserSchema])
 def read_users(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_read_db),
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = after_query,
+    before: Optional[str] = before_query,
     current_user: UserModel = Depends(deps.get_current_active_admin)
 ):
     
-    users = db.query(UserModel).offset(skip).limit(limit).all()
-    return users
+    page = KeysetPage((UserModel.id,), limit, after, before, skip)
+    users = page.rows(page.apply(db.query(*user_rows.columns())).all())
+    return json_response(user_rows.dump(users), page.headers())
 
 @router.post("/", response_model=UserSchema)
 def create_user(
@@ -44,6 +53,45 @@ def create_user(
     db.refresh(new_user)
     return new_user
 
+@router.put("/{user_id}", response_model=UserSchema)
+def update_user(
+    user_id: int,
+    user_in: UserUpdate,
+    db: Session = Depends(deps.get_db),
+    current_user: UserModel = Depends(deps.get_current_active_admin)
+):
+    
+    user = db.query(UserModel).filter(UserModel.id == user_id).first()
+    if not user:
+        raise HTTPException(
+            status_code=404,
+            detail="User not found"
+        )
+    
+    update_data = user_in.model_dump(exclude_unset=True)
+    password = update_data.pop("password", None)
+    for field, value in update_data.items():
+        setattr(user, field, value)
+    if password:
+        user.set_password(password)
+    try:
+        db.commit()
+    except IntegrityError as e:
+        # The unique indexes on email and username reject duplicates
+        db.rollback()
+        field = "email" if "email" in str(e.orig) else "username"
+        raise HTTPException(
+            status_code=400,
+            detail=f"The user with this {field} already exists in the system.",
+        )
+    db.refresh(user)
+    
+    # Requests to this worker see the new email/admin flag at once; other workers
+    # keep their cached snapshot until AUTH_USER_CACHE_TTL_SECONDS runs out
+    deps.invalidate_user(user.id)
+    deps.mark_recent_write(current_user.id)
+    return user
+
 @router.get("/me", response_model=UserSchema)
 def read_user_me(
     current_user: UserModel = Depends(deps.get_current_active_user)
@@ -1,39 +1,97 @@
-from typing import Generator
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Generator
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
 
-from app.db.session import get_db
+from app.db.replicas import read_replicas
+from app.db.session import get_async_db, get_db
 from app.core.config import settings
 from app.core.security import ALGORITHM
+from app.core.cache import TTLCache, build_cache_backend
 from app.db.models.user import User
 from app.schemas.token import TokenPayload
+from app.schemas.user import User as UserSnapshot
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+# token -> verified user id, and user id -> (id, email, username, is_admin) snapshot.
+# Per process; other workers see a user change once their entry's TTL runs out.
+token_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_TOKEN_CACHE_TTL_SECONDS)
+user_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL_SECONDS)
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        token_data = TokenPayload(**payload)
-    except (JWTError, ValidationError):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Could not validate credentials",
-        )
-    user = db.query(User).filter(User.id == token_data.sub).first()
-    if not user:
+
+# "user:<id>" -> True while that user's reads must see their own recent writes. Shared
+# by every worker on the redis backend, since the next request may reach another one.
+recent_writers = build_cache_backend(
+    settings.DATABASE_REPLICA_STICKY_BACKEND,
+    settings.AUTH_CACHE_SIZE,
+    settings.DATABASE_REPLICA_STICKY_SECONDS,
+    settings.DATABASE_REPLICA_STICKY_REDIS_URL,
+    prefix="recent-write:",
+)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop the cached snapshot of a user whose account was modified"""
+    user_cache.delete(user_id)
+
+
+def mark_recent_write(user_id: int) -> None:
+    """Route this user's reads to the primary until replicas have caught up"""
+    recent_writers.set(f"user:{user_id}", True, settings.DATABASE_REPLICA_STICKY_SECONDS)
+
+
+def has_recent_write(user_id: int) -> bool:
+    return recent_writers.get(f"user:{user_id}") is not None
+
+
+async def mark_recent_write_async(user_id: int) -> None:
+    """mark_recent_write for async endpoints: a blocking backend is called off the event loop"""
+    if recent_writers.blocking:
+        await run_in_threadpool(mark_recent_write, user_id)
+    else:
+        mark_recent_write(user_id)
+
+
+async def has_recent_write_async(user_id: int) -> bool:
+    if recent_writers.blocking:
+        return await run_in_threadpool(has_recent_write, user_id)
+    return has_recent_write(user_id)
+
+
+def _verified_user_id(token: str):
+    user_id = token_cache.get(token)
+    if user_id is None:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+            token_data = TokenPayload(**payload)
+        except (JWTError, ValidationError):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Could not validate credentials",
+            )
+        user_id = token_data.sub
+        if user_id is not None:
+            # Never keep a token cached past its own expiry
+            token_cache.set(token, user_id, ttl=payload["exp"] - time.time())
+    return user_id
+
+
+def _snapshot(user_id, db_user) -> UserSnapshot:
+    if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
+    user = UserSnapshot.model_validate(db_user)
+    user_cache.set(user_id, user)
     return user
 
 
-def get_current_admin_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+def _require_admin(current_user: UserSnapshot) -> UserSnapshot:
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -42,6 +100,80 @@ def get_current_admin_user(
     return current_user
 
 
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> UserSnapshot:
+    user_id = _verified_user_id(token)
+    user = user_cache.get(user_id)
+    if user is None:
+        user = _snapshot(user_id, db.query(User).filter(User.id == user_id).first())
+    return user
+
+
+async def get_async_current_user(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> UserSnapshot:
+    """get_current_user for async endpoints; keeps them off the threadpool"""
+    user_id = _verified_user_id(token)
+    user = user_cache.get(user_id)
+    if user is None:
+        db_user = await db.get(User, user_id) if user_id is not None else None
+        user = _snapshot(user_id, db_user)
+    return user
+
+
+def _reads_from_primary(token: str) -> bool:
+    return not read_replicas.configured or has_recent_write(_verified_user_id(token))
+
+
+def get_read_db(
+    primary: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> Generator:
+    """Session for read-only endpoints: a replica when one is configured and reachable"""
+    db = None if _reads_from_primary(token) else read_replicas.session()
+    if db is None:
+        yield primary
+        return
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def async_read_session(primary: AsyncSession, user_id: int) -> AsyncIterator[AsyncSession]:
+    """The session get_async_read_db would give this user, for endpoints that only need one sometimes"""
+    use_primary = not read_replicas.configured or await has_recent_write_async(user_id)
+    db = None if use_primary else await read_replicas.async_session()
+    if db is None:
+        yield primary
+        return
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def get_async_read_db(
+    primary: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+):
+    """get_read_db for async endpoints"""
+    async with async_read_session(primary, _verified_user_id(token)) as db:
+        yield db
+
+
+def get_current_admin_user(
+    current_user: UserSnapshot = Depends(get_current_user),
+) -> UserSnapshot:
+    return _require_admin(current_user)
+
+
+async def get_async_current_admin_user(
+    current_user: UserSnapshot = Depends(get_async_current_user),
+) -> UserSnapshot:
+    return _require_admin(current_user)
+
+
 # Added for backwards compatibility with existing endpoints
 get_current_active_user = get_current_user
 get_current_active_admin = get_current_admin_user
\ No newline at end of file
@@ -0,0 +1,115 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import literal, tuple_
+
+
+def _cursor_value(column, value: Any) -> Any:
+    """A decoded cursor value, checked against the Python type of its (non-null) column"""
+    python_type = column.type.python_type
+    if python_type is datetime:
+        if not isinstance(value, str):
+            raise ValueError(value)
+        return datetime.fromisoformat(value)
+    if python_type is float and type(value) is int:
+        return float(value)
+    # type() rather than isinstance(): True must not pass for an integer id
+    if type(value) is not python_type:
+        raise ValueError(value)
+    return value
+
+
+class KeysetPage:
+    """
+    Keyset (cursor) pagination over a unique ordering, e.g. (id,) or (start_time, id).
+
+    Cursors are opaque tokens holding the sort key of a boundary row. `after` returns
+    the rows that follow it and `before` the rows that precede it, so a page costs
+    the same however deep it is and rows inserted meanwhile cannot shift it. Without
+    a cursor the old skip/limit behaviour applies. The cursors of the neighbouring
+    pages are sent in the X-Next-Cursor and X-Prev-Cursor response headers.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence,
+        limit: int,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        skip: int = 0,
+        descending: bool = False,
+    ):
+        if after and before:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Pass either after or before, not both",
+            )
+        self.columns = list(columns)
+        self.limit = limit
+        self.skip = skip
+        self.descending = descending
+        self.backward = before is not None
+        self.cursor = self._decode(after or before) if (after or before) else None
+        self.next_cursor: Optional[str] = None
+        self.prev_cursor: Optional[str] = None
+
+    def _decode(self, token: str) -> List[Any]:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(token.encode() + b"=" * (-len(token) % 4)))
+            if not isinstance(values, list) or len(values) != len(self.columns):
+                raise ValueError(token)
+            return [_cursor_value(column, value) for column, value in zip(self.columns, values)]
+        except (ValueError, TypeError, binascii.Error):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor",
+            )
+
+    def _encode(self, row) -> str:
+        values = [getattr(row, column.key) for column in self.columns]
+        values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+    def apply(self, query):
+        """Add the ordering, cursor condition and limit to a Query or select()"""
+        # Walking backward reads the preceding rows in reverse order; rows() restores it
+        reverse = self.descending != self.backward
+        if self.cursor is not None:
+            key = tuple_(*self.columns)
+            bound = tuple_(*[literal(value, column.type) for column, value in zip(self.columns, self.cursor)])
+            query = query.where(key < bound if reverse else key > bound)
+        elif self.skip:
+            query = query.offset(self.skip)
+        query = query.order_by(*[column.desc() if reverse else column.asc() for column in self.columns])
+        # One extra row tells whether another page follows
+        return query.limit(self.limit + 1)
+
+    def rows(self, fetched: Sequence) -> list:
+        """Trim the fetched rows to the page and work out the neighbouring cursors"""
+        rows = list(fetched[:self.limit])
+        has_more = len(fetched) > self.limit
+        if self.backward:
+            rows.reverse()
+        if rows:
+            if has_more or self.backward:
+                self.next_cursor = self._encode(rows[-1])
+            if (has_more and self.backward) or (not self.backward and (self.cursor is not None or self.skip)):
+                self.prev_cursor = self._encode(rows[0])
+        return rows
+
+    def headers(self) -> Dict[str, str]:
+        """The X-Next-Cursor / X-Prev-Cursor response headers"""
+        headers = {}
+        if self.next_cursor:
+            headers["X-Next-Cursor"] = self.next_cursor
+        if self.prev_cursor:
+            headers["X-Prev-Cursor"] = self.prev_cursor
+        return headers
+
+
+after_query = Query(None, description="Cursor from X-Next-Cursor: return the rows after it")
+before_query = Query(None, description="Cursor from X-Prev-Cursor: return the rows before it")
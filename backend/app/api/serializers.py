@@ -0,0 +1,28 @@
+from typing import Dict, List, Optional, Sequence, Type
+
+from pydantic import BaseModel
+
+
+class RowSerializer:
+    """
+    Serializes a response schema straight from SQL result tuples: the query selects
+    exactly the schema's columns and each row is zipped into a dict, so no ORM instance
+    is built and no Pydantic validation runs. Only for schemas whose fields are all
+    plain columns of the model, with values the JSON encoder handles as Pydantic does.
+    """
+
+    def __init__(self, schema: Type[BaseModel], model):
+        # id first, then the schema's fields in declaration order
+        self.fields: Dict[str, object] = {name: getattr(model, name) for name in ["id", *schema.model_fields]}
+
+    def columns(self, names: Optional[List[str]] = None, extra: Sequence = ()) -> list:
+        """
+        Columns to select for `names` (default: every field), followed by any `extra`
+        columns that are needed by the query but not returned, e.g. keyset columns.
+        """
+        names = names or list(self.fields)
+        return [self.fields[name] for name in names] + [column for column in extra if column.key not in names]
+
+    def dump(self, rows: Sequence, names: Optional[List[str]] = None) -> List[dict]:
+        names = names or list(self.fields)
+        return [dict(zip(names, row)) for row in rows]
@@ -0,0 +1,150 @@
+import zlib
+from typing import Callable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional, responses fall back to gzip
+    brotli = None
+
+# Media types worth compressing; images such as PNG and archives are compressed already
+COMPRESSIBLE_TYPES = {"application/json", "application/javascript", "image/svg+xml", "application/xml"}
+
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    """Content codings of an Accept-Encoding header, leaving out those refused with q=0"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        # wbits 31: zlib stream with a gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Compresses text and JSON responses of at least `minimum_size` bytes with brotli when
+    the client accepts it and the brotli package is installed, otherwise with gzip.
+    Streaming responses are compressed chunk by chunk. A strong ETag is weakened since
+    the encoded bytes differ from the representation it was computed for.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _encoder(self, scope: Scope) -> Optional[tuple]:
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            return "br", lambda: _Brotli(self.brotli_quality)
+        if "gzip" in accepted:
+            return "gzip", lambda: _Gzip(self.gzip_level)
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoder = self._encoder(scope) if scope["type"] == "http" else None
+        if encoder is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self.app, self.minimum_size, *encoder)(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, minimum_size: int, encoding: str, make_encoder: Callable):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoding = encoding
+        self.make_encoder = make_encoder
+        self.encoder = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.send: Send = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether to compress
+            self.initial_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.started:
+            self.started = True
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            if not _compressible(headers) or (len(body) < self.minimum_size and not more_body):
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+
+            self.encoder = self.make_encoder()
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            body = self.encoder.compress(body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body += self.encoder.finish()
+                headers["Content-Length"] = str(len(body))
+            await self.send(self.initial_message)
+            await self.send({**message, "body": body})
+            return
+
+        if self.encoder is None:
+            await self.send(message)
+            return
+        body = self.encoder.compress(body)
+        if not more_body:
+            body += self.encoder.finish()
+        await self.send({**message, "body": body})
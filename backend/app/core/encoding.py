@@ -0,0 +1,52 @@
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # optional, only needed for JSON_RESPONSE_CLASS=orjson
+    orjson = None
+
+
+def _use_orjson(name: str) -> bool:
+    if name not in ("json", "orjson"):
+        raise ValueError(f"Unknown JSON_RESPONSE_CLASS: {name}")
+    if name == "orjson" and orjson is None:
+        raise RuntimeError("JSON_RESPONSE_CLASS=orjson needs the orjson package (pip install orjson)")
+    return name == "orjson"
+
+
+USE_ORJSON = _use_orjson(settings.JSON_RESPONSE_CLASS)
+
+# Response class for every endpoint that still goes through a response_model
+DefaultJSONResponse = ORJSONResponse if USE_ORJSON else JSONResponse
+
+
+def _default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any, use_orjson: Optional[bool] = None) -> bytes:
+    """
+    Encode plain rows (dicts of str, numbers, None and datetimes) exactly as Pydantic
+    would, with orjson when it is enabled and the standard library otherwise.
+    """
+    if use_orjson is None:
+        use_orjson = USE_ORJSON
+    if use_orjson:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+def json_response(content: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """A JSON response for content that needs no response_model validation"""
+    return Response(content=dumps(content), media_type="application/json", headers=headers)
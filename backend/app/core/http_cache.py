@@ -0,0 +1,103 @@
+import hashlib
+import os
+import re
+from typing import Optional
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# API responses depend on the caller: clients may keep them but must revalidate on every use
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """Weak comparison of an ETag with an If-None-Match header, as RFC 9110 requires for GET"""
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == opaque:
+            return True
+    return False
+
+
+class ConditionalGetMiddleware:
+    """
+    Gives successful GET responses that carry no validator of their own a weak ETag
+    over the body and a revalidating Cache-Control, and answers If-None-Match with a
+    bodiless 304 when the body has not changed. This saves bandwidth, not work: the
+    endpoint still runs. Streaming responses are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        initial_message: Message = {}
+        passthrough = False
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal initial_message, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                passthrough = message["status"] != 200 or "etag" in headers
+                if passthrough:
+                    await send(message)
+                else:
+                    initial_message = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            passthrough = True
+            headers = MutableHeaders(raw=initial_message["headers"])
+            if message.get("more_body", False):
+                await send(initial_message)
+                await send(message)
+                return
+            etag = 'W/"' + hashlib.sha1(message.get("body", b"")).hexdigest() + '"'
+            headers["ETag"] = etag
+            if "cache-control" not in headers:
+                headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+            if etag_matches(etag, if_none_match):
+                for name in ("content-length", "content-type"):
+                    del headers[name]
+                await send({**initial_message, "status": 304})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send(initial_message)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that adds a Cache-Control header to the ETag/Last-Modified validators it
+    already sends. Files whose path (relative to the directory) matches `long_lived` get
+    `cache_control`; every other file, e.g. an unhashed index.html that must pick up a
+    deploy, gets `revalidate_cache_control` and is revalidated through a 304.
+    """
+
+    def __init__(
+        self, *args, cache_control: str, long_lived: str = ".*", revalidate_cache_control: str = "no-cache", **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+        self.long_lived = re.compile(long_lived)
+        self.revalidate_cache_control = revalidate_cache_control
+
+    def file_response(self, full_path, stat_result, scope, *args, **kwargs):
+        response = super().file_response(full_path, stat_result, scope, *args, **kwargs)
+        path = self.get_path(scope).replace(os.sep, "/")
+        cache_control = self.cache_control if self.long_lived.fullmatch(path) else self.revalidate_cache_control
+        response.headers.setdefault("Cache-Control", cache_control)
+        return response
@@ -1,11 +1,50 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone  # Add timezone import
-from typing import Any, Union
+from typing import Any, Callable, Optional, Tuple, Union
+from fastapi import HTTPException, status
 from jose import jwt
 from passlib.context import CryptContext
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Cost of new hashes when PASSWORD_HASH_ROUNDS is unset. The pbkdf2_sha256 default matches
+# the 600000 iterations of the werkzeug hashes that logins replace, not passlib's lower one.
+DEFAULT_HASH_ROUNDS = {"pbkdf2_sha256": 600000, "bcrypt": 12}
+
+
+def _hash_rounds() -> int:
+    return settings.PASSWORD_HASH_ROUNDS or DEFAULT_HASH_ROUNDS[settings.PASSWORD_HASH_SCHEME]
+
+
+def _build_pwd_context() -> CryptContext:
+    # New hashes use PASSWORD_HASH_SCHEME; hashes of the other schemes, or of this one
+    # below the configured cost, still verify but are reported as needing an update.
+    schemes = [settings.PASSWORD_HASH_SCHEME] + [
+        scheme for scheme in ("pbkdf2_sha256", "bcrypt") if scheme != settings.PASSWORD_HASH_SCHEME
+    ]
+    options = {
+        f"{settings.PASSWORD_HASH_SCHEME}__default_rounds": _hash_rounds(),
+        f"{settings.PASSWORD_HASH_SCHEME}__min_rounds": _hash_rounds(),
+    }
+    return CryptContext(schemes=schemes, default=settings.PASSWORD_HASH_SCHEME, deprecated="auto", **options)
+
+
+pwd_context = _build_pwd_context()
+
+# Hashing is CPU-bound (hashlib and bcrypt release the GIL while they work), so it
+# runs on a small dedicated pool instead of whichever request thread asked for it.
+# At most PASSWORD_HASH_MAX_PENDING requests may wait on that pool; the rest get a
+# 503 instead of holding threadpool threads that event reads need.
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
+_hash_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+# Hash formats written by werkzeug.security.generate_password_hash
+WERKZEUG_PREFIXES = ("pbkdf2:", "scrypt:")
 
 ALGORITHM = "HS256"
 
@@ -21,9 +60,102 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
     return encoded_jwt
 
 
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+            )
+        return _hash_executor
+
+
+def _hash_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent sign-ins, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _run_hash_work(fn: Callable, *args) -> Any:
+    if not _hash_slots.acquire(timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS):
+        raise _hash_pool_busy()
+    try:
+        return _get_hash_executor().submit(fn, *args).result()
+    finally:
+        _hash_slots.release()
+
+
+async def _run_hash_work_async(fn: Callable, *args) -> Any:
+    # Same admission limit as _run_hash_work, but waits without blocking the event loop
+    deadline = time.monotonic() + settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS
+    while not _hash_slots.acquire(blocking=False):
+        if time.monotonic() >= deadline:
+            raise _hash_pool_busy()
+        await asyncio.sleep(0.01)
+    try:
+        return await asyncio.wrap_future(_get_hash_executor().submit(fn, *args))
+    finally:
+        _hash_slots.release()
+
+
+def _upgrade_is_not_weaker(werkzeug_hash: str) -> bool:
+    """Whether replacing a werkzeug hash with one of the configured scheme keeps at least its cost"""
+    method = werkzeug_hash.split("$", 1)[0]  # e.g. pbkdf2:sha256:600000
+    kind, _, params = method.partition(":")
+    if kind != "pbkdf2":
+        # scrypt is memory-hard; no configured scheme is a like-for-like replacement
+        return False
+    if settings.PASSWORD_HASH_SCHEME != "pbkdf2_sha256":
+        return True
+    _, _, iterations = params.partition(":")
+    legacy_rounds = int(iterations) if iterations.isdigit() else DEFAULT_PBKDF2_ITERATIONS
+    return _hash_rounds() >= legacy_rounds
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    if hashed_password.startswith(WERKZEUG_PREFIXES):
+        if not check_password_hash(hashed_password, plain_password):
+            return False, None
+        if not _upgrade_is_not_weaker(hashed_password):
+            return True, None
+        return True, pwd_context.hash(plain_password)
+    try:
+        return pwd_context.verify_and_update(plain_password, hashed_password)
+    except (ValueError, TypeError):
+        # Unknown or malformed hash
+        return False, None
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password against a stored hash of any supported format. When it matches and
+    the hash is not in the configured scheme and cost, also returns a replacement hash.
+    """
+    if not hashed_password:
+        return False, None
+    return _run_hash_work(_verify_and_update, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """verify_and_update_password for async endpoints"""
+    if not hashed_password:
+        return False, None
+    return await _run_hash_work_async(_verify_and_update, plain_password, hashed_password)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return verify_and_update_password(plain_password, hashed_password)[0]
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return _run_hash_work(pwd_context.hash, password)
+
+
+def shutdown_hash_pool() -> None:
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is not None:
+            _hash_executor.shutdown(wait=True)
+            _hash_executor = None
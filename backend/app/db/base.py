@@ -3,4 +3,6 @@ from .base_class import Base
 from .models.user import User  
 from .models.event import Event  
 from .models.registration import Registration  
-from .models.bug_report import BugReport  
\ No newline at end of file
+from .models.bug_report import BugReport  
+from .models.attendance_prediction import AttendancePrediction  
+from .models.training_job import TrainingJob  
\ No newline at end of file
@@ -0,0 +1,114 @@
+import logging
+from sqlalchemy import func, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.models.event import Event
+from app.db.models.registration import Registration
+from app.services.event_cache import invalidate_events
+
+
+logger = logging.getLogger(__name__)
+
+
+def _reserve_seat_statement(event_id: int):
+    return (
+        update(Event)
+        .where(
+            Event.id == event_id,
+            or_(
+                Event.capacity.is_(None),
+                Event.capacity == 0,
+                Event.registered_count < Event.capacity,
+            ),
+        )
+        .values(registered_count=Event.registered_count + 1)
+    )
+
+
+def _checked_in_count_statement(event_id: int, delta: int):
+    return (
+        update(Event)
+        .where(Event.id == event_id)
+        .values(checked_in_count=Event.checked_in_count + delta)
+    )
+
+
+async def reserve_seat_async(db: AsyncSession, event_id: int) -> bool:
+    """
+    Claim one seat with a single conditional UPDATE. The row lock it takes is held
+    until the caller commits or rolls back, so concurrent registrations can never
+    push registered_count past capacity. Returns False if the event is full or missing.
+    """
+    return (await db.execute(_reserve_seat_statement(event_id))).rowcount == 1
+
+
+async def adjust_checked_in_count_async(db: AsyncSession, event_id: int, delta: int) -> None:
+    """Atomically add delta to an event's checked_in_count inside the current transaction"""
+    await db.execute(_checked_in_count_statement(event_id, delta))
+
+
+def _actual_counts(db: Session, event_ids=None) -> dict:
+    query = db.query(
+        Registration.event_id,
+        func.count(Registration.id),
+        func.count(Registration.check_in_time),
+    )
+    if event_ids is not None:
+        query = query.filter(Registration.event_id.in_(event_ids))
+    return {
+        event_id: (registered, checked_in)
+        for event_id, registered, checked_in in query.group_by(Registration.event_id)
+    }
+
+
+def _drifted(counters, actual) -> list:
+    drifted = []
+    for event_id, registered_count, checked_in_count in counters:
+        registered, checked_in = actual.get(event_id, (0, 0))
+        if (registered_count, checked_in_count) != (registered, checked_in):
+            drifted.append({
+                "id": event_id,
+                "registered_count": registered,
+                "checked_in_count": checked_in,
+            })
+    return drifted
+
+
+def reconcile_event_counters(db: Session) -> int:
+    """
+    Recompute registered_count/checked_in_count from the registration table
+    and fix every event whose stored counters have drifted.
+    Returns the number of events that were corrected.
+
+    A first unlocked pass finds the events that look drifted. Those rows are then
+    locked (FOR UPDATE) and recounted before anything is written: a registration or
+    check-in still in flight either committed before the lock was granted, and is
+    counted, or waits on the lock and adds itself to the corrected value afterwards.
+    """
+    suspects = _drifted(
+        db.query(Event.id, Event.registered_count, Event.checked_in_count),
+        _actual_counts(db),
+    )
+    if not suspects:
+        return 0
+
+    event_ids = [row["id"] for row in suspects]
+    counters = (
+        db.query(Event.id, Event.registered_count, Event.checked_in_count)
+        .filter(Event.id.in_(event_ids))
+        .order_by(Event.id)
+        .with_for_update()
+        .all()
+    )
+    drifted = _drifted(counters, _actual_counts(db, event_ids))
+
+    if drifted:
+        db.execute(update(Event), drifted)
+        db.commit()
+        invalidate_events([row["id"] for row in drifted])
+        logger.info("Reconciled counters for %d events", len(drifted))
+    else:
+        db.rollback()
+
+    return len(drifted)
@@ -1,7 +1,11 @@
 import logging
+import os
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
-from app.db.base import Base
 from app.db.session import engine
 from app.db.models.user import User
 from app.core.config import settings
@@ -9,10 +13,39 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def alembic_config() -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def _unversioned_revision(connection) -> str:
+    """Revision matching a database that create_all built before migrations existed"""
+    tables = inspect(connection).get_table_names()
+    return "0002" if "attendance_prediction" in tables else "0001"
+
+
+def run_migrations(bind: Engine = engine) -> None:
+    """Bring the schema up to the latest Alembic revision"""
+    config = alembic_config()
+    with bind.begin() as connection:
+        config.attributes["connection"] = connection
+        tables = inspect(connection).get_table_names()
+        if "alembic_version" not in tables and "event" in tables:
+            revision = _unversioned_revision(connection)
+            logger.info("Adopting existing schema at revision %s", revision)
+            command.stamp(config, revision)
+        command.upgrade(config, "head")
+
+
 # Create initial admin user
 def init_db(db: Session) -> None:
-    # Creates tables if  don't exist
-    Base.metadata.create_all(bind=engine)
+    # Creates or upgrades the tables
+    run_migrations()
     
  
     user = db.query(User).first()
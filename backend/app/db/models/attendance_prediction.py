@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, UniqueConstraint
+from datetime import datetime
+
+from ..base_class import Base
+
+
+class AttendancePrediction(Base):
+    __tablename__ = "attendance_prediction"
+    __table_args__ = (
+        UniqueConstraint("event_id", "user_id", "model_version", name="uq_attendance_prediction"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, ForeignKey("event.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    model_version = Column(String(64), nullable=False)
+    probability = Column(Float, nullable=False)
+    computed_at = Column(DateTime, default=datetime.utcnow)
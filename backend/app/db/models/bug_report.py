@@ -9,7 +9,7 @@ class BugReport(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(120), nullable=False)
     description = Column(Text, nullable=False)
-    reported_by = Column(Integer, ForeignKey("user.id"))
+    reported_by = Column(Integer, ForeignKey("user.id"), index=True)
     status = Column(String(20), default="Open")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, Text, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
 from ..base_class import Base
+from ..search import install_sqlite_fts, search_document
 
 
 class Event(Base):
@@ -10,14 +11,29 @@ class Event(Base):
     title = Column(String(120), nullable=False)
     description = Column(Text)
     location = Column(String(200))
-    start_time = Column(DateTime, nullable=False)
-    end_time = Column(DateTime, nullable=False)
+    start_time = Column(DateTime, nullable=False, index=True)
+    end_time = Column(DateTime, nullable=False, index=True)
     capacity = Column(Integer)
-    created_by = Column(Integer, ForeignKey("user.id"))
+    created_by = Column(Integer, ForeignKey("user.id"), index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     category = Column(String(50))
     image_url = Column(String(255))
     
+    # Denormalized counters, maintained inside the registration/check-in transactions
+    registered_count = Column(Integer, nullable=False, default=0, server_default="0")
+    checked_in_count = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    __table_args__ = (
+        Index("ix_event_category_start_time", "category", "start_time"),
+        # Keyword search (see app/db/search.py); SQLite gets an FTS5 table instead
+        Index(
+            "ix_event_search", search_document(title, description), postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
+    
     # Relationships
     creator = relationship("User", back_populates="created_events")
     registrations = relationship("Registration", back_populates="event")
+
+
+install_sqlite_fts(Event.__table__)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, String
+from sqlalchemy import Column, Index, Integer, ForeignKey, DateTime, String, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -7,6 +7,13 @@ from ..base_class import Base
 
 
 class Registration(Base):
+    __table_args__ = (
+        UniqueConstraint("user_id", "event_id", name="uq_registration_user_event"),
+        # An event's registrations/check-ins, and a user's history in date order
+        Index("ix_registration_event_id_check_in_time", "event_id", "check_in_time"),
+        Index("ix_registration_user_id_registration_date", "user_id", "registration_date"),
+    )
+    
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("user.id"))
     event_id = Column(Integer, ForeignKey("event.id"))
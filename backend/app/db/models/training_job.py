@@ -0,0 +1,27 @@
+from sqlalchemy import Boolean, Column, Float, Index, Integer, String, Text, DateTime, text
+from datetime import datetime
+
+from ..base_class import Base
+
+
+class TrainingJob(Base):
+    __tablename__ = "training_job"
+    
+    id = Column(String(32), primary_key=True)
+    status = Column(String(16), nullable=False, default="queued")
+    progress = Column(Float, nullable=False, default=0.0)
+    data_points = Column(Integer)  # known once the job has built its training set
+    error = Column(Text)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime)
+    # Refreshed by the worker running the job; a stale one means that worker is gone
+    heartbeat_at = Column(DateTime)
+
+    # At most one running job across every worker
+    __table_args__ = (
+        Index(
+            "uq_training_job_running", "status", unique=True,
+            postgresql_where=text("status = 'running'"), sqlite_where=text("status = 'running'"),
+        ),
+    )
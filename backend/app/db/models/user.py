@@ -1,8 +1,8 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime
+from sqlalchemy import Boolean, Column, Index, Integer, String, DateTime, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 
+from app.core.security import get_password_hash, verify_and_update_password
 from ..base_class import Base
 
 
@@ -14,13 +14,23 @@ class User(Base):
     is_admin = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # Login matches either field case-insensitively
+    __table_args__ = (
+        Index("ix_user_email_lower", func.lower(email)),
+        Index("ix_user_username_lower", func.lower(username)),
+    )
+    
     # Relationships
     registrations = relationship("Registration", back_populates="user")
     created_events = relationship("Event", back_populates="creator")
     bug_reports = relationship("BugReport", back_populates="reporter")
     
     def set_password(self, password: str):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = get_password_hash(password)
     
     def verify_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        """Check the password, replacing an outdated hash in place (the caller commits)"""
+        verified, new_hash = verify_and_update_password(password, self.password_hash)
+        if new_hash:
+            self.password_hash = new_hash
+        return verified
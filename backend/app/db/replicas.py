@@ -0,0 +1,114 @@
+import itertools
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.session import async_database_url, engine_options
+
+
+logger = logging.getLogger(__name__)
+
+
+class _Replica:
+    """A read replica whose sync and async engines are each created on first use"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.display_url = make_url(url).render_as_string(hide_password=True)
+        self.down_until = 0.0
+        self.engine = None
+        self.async_engine = None
+        self._session_factory = None
+        self._async_session_factory = None
+        self._lock = threading.Lock()
+
+    def session_factory(self) -> Session:
+        with self._lock:
+            if self._session_factory is None:
+                self.engine = create_engine(self.url, **engine_options(self.url))
+                self._session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        return self._session_factory()
+
+    def async_session_factory(self) -> AsyncSession:
+        with self._lock:
+            if self._async_session_factory is None:
+                self.async_engine = create_async_engine(
+                    async_database_url(self.url), **engine_options(self.url, asyncio=True)
+                )
+                self._async_session_factory = async_sessionmaker(
+                    self.async_engine, autoflush=False, expire_on_commit=False
+                )
+        return self._async_session_factory()
+
+
+class ReplicaRouter:
+    """
+    Hands out sessions on read replicas in round-robin order. A replica that fails to
+    connect is skipped for `retry_seconds`; when none is reachable the caller falls
+    back to the primary (None is returned).
+    """
+
+    def __init__(self, urls: List[str], retry_seconds: float = 30.0):
+        self.replicas = [_Replica(url) for url in urls]
+        self.retry_seconds = retry_seconds
+        self._order = itertools.cycle(range(len(self.replicas)))
+        self._lock = threading.Lock()
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.replicas)
+
+    def _candidates(self) -> List[_Replica]:
+        with self._lock:
+            start = next(self._order)
+        now = time.monotonic()
+        rotated = self.replicas[start:] + self.replicas[:start]
+        return [replica for replica in rotated if replica.down_until <= now]
+
+    def _mark_down(self, replica: _Replica) -> None:
+        logger.warning("Read replica %s is unavailable, using the next one", replica.display_url)
+        replica.down_until = time.monotonic() + self.retry_seconds
+
+    def session(self) -> Optional[Session]:
+        for replica in self._candidates():
+            db = replica.session_factory()
+            try:
+                # Connect now so an unreachable replica is detected before the endpoint runs
+                db.connection()
+                return db
+            except DBAPIError:
+                db.close()
+                self._mark_down(replica)
+        return None
+
+    async def async_session(self) -> Optional[AsyncSession]:
+        for replica in self._candidates():
+            db = replica.async_session_factory()
+            try:
+                await db.connection()
+                return db
+            except DBAPIError:
+                await db.close()
+                self._mark_down(replica)
+        return None
+
+    def dispose(self) -> None:
+        for replica in self.replicas:
+            if replica.engine is not None:
+                replica.engine.dispose()
+            if replica.async_engine is not None:
+                replica.async_engine.sync_engine.dispose()
+
+
+read_replicas = ReplicaRouter(
+    [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()],
+    settings.DATABASE_REPLICA_RETRY_SECONDS,
+)
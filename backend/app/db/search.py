@@ -0,0 +1,80 @@
+"""
+Keyword search over event titles and descriptions.
+
+PostgreSQL matches a tsvector expression backed by the GIN index ix_event_search.
+SQLite, used by the tests and small deployments, matches an external-content FTS5
+table kept in sync by triggers. Any other database falls back to LIKE.
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import DDL, and_, column, event, func, literal_column, or_, select, table
+# Registers the typed to_tsvector/plainto_tsquery functions used below
+from sqlalchemy.dialects import postgresql  # noqa: F401
+from sqlalchemy.sql.elements import ColumnElement
+
+SEARCH_CONFIG = "english"
+FTS_TABLE = "event_fts"
+
+# Statements run one at a time: sqlite3 refuses several per execute
+SQLITE_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, description, content='event', content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON event BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON event BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON event BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+]
+
+
+def is_search_table(name: str) -> bool:
+    """The FTS5 table and its shadow tables, which are not part of the models"""
+    return name == FTS_TABLE or name.startswith(FTS_TABLE + "_")
+
+
+def search_document(title, description) -> ColumnElement:
+    """
+    The tsvector that ix_event_search indexes. Constants are literals rather than bound
+    parameters so the query expression stays identical to the index expression.
+    """
+    text = func.coalesce(title, literal_column("''")).op("||")(literal_column("' '")).op("||")(
+        func.coalesce(description, literal_column("''"))
+    )
+    return func.to_tsvector(literal_column(f"'{SEARCH_CONFIG}'"), text)
+
+
+def install_sqlite_fts(event_table) -> None:
+    """Create the FTS5 table and triggers with the event table when running on SQLite"""
+    for statement in SQLITE_FTS_DDL:
+        event.listen(event_table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(
+        event_table, "before_drop", DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite")
+    )
+
+
+def keyword_condition(dialect: str, event_model, keywords: str) -> Optional[ColumnElement]:
+    """
+    WHERE clause matching events that contain every word of `keywords`, or None when
+    there is no word to search for.
+    """
+    words = re.findall(r"\w+", keywords)
+    if not words:
+        return None
+    if dialect == "postgresql":
+        query = func.plainto_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), " ".join(words))
+        return search_document(event_model.title, event_model.description).op("@@")(query)
+    if dialect == "sqlite":
+        fts = table(FTS_TABLE, column("rowid"))
+        match = " ".join('"' + word + '"' for word in words)
+        return event_model.id.in_(
+            select(fts.c.rowid).where(literal_column(FTS_TABLE).op("MATCH")(match))
+        )
+    return and_(*[
+        or_(event_model.title.ilike(f"%{word}%"), event_model.description.ilike(f"%{word}%"))
+        for word in words
+    ])
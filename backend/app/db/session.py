@@ -1,6 +1,13 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
 
 
@@ -8,9 +15,112 @@ from app.core.config import settings
 
 SQLALCHEMY_DATABASE_URI = settings.DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URI)
+# Async drivers used for the AsyncSession engine, by backend
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+# Set while a checkout is being timed; QueuePool._do_get retries by calling itself.
+# A context variable rather than a thread-local, since async checkouts share a thread.
+_timing_checkout: ContextVar[bool] = ContextVar("_timing_checkout", default=False)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a free connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        if _timing_checkout.get():
+            return super()._do_get()
+        token = _timing_checkout.set(True)
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            _timing_checkout.reset(token)
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """InstrumentedQueuePool for engines created with create_async_engine()"""
+
+
+def async_database_url(url: str) -> str:
+    """The same database addressed through its asyncio driver"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend in ASYNC_DRIVERS:
+        url = url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    return url.render_as_string(hide_password=False)
+
+
+def engine_options(url: str, asyncio: bool = False) -> dict:
+    """create_engine() (or create_async_engine()) keyword arguments for `url` built from the DB_* settings"""
+    url = make_url(url)
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    # In-memory SQLite cannot share connections through a queue pool
+    if not (url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")):
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool if asyncio else InstrumentedQueuePool,
+            pool_size=settings.DB_ASYNC_POOL_SIZE if asyncio else settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_ASYNC_MAX_OVERFLOW if asyncio else settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        )
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.get_backend_name() == "postgresql":
+        if asyncio:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def pool_stats(engine) -> dict:
+    """Current usage of the engine's connection pool"""
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        with pool._stats_lock:
+            stats.update(
+                checkouts=pool.checkouts,
+                timeouts=pool.timeouts,
+                wait_ms_avg=pool.wait_seconds_total / pool.checkouts * 1000 if pool.checkouts else 0.0,
+                wait_ms_max=pool.wait_seconds_max * 1000,
+            )
+    return stats
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URI, **engine_options(SQLALCHEMY_DATABASE_URI))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Used by the async endpoints. Objects stay loaded after commit: an expired attribute
+# would need a lazy load, which AsyncSession cannot do implicitly.
+async_engine = create_async_engine(
+    async_database_url(SQLALCHEMY_DATABASE_URI), **engine_options(SQLALCHEMY_DATABASE_URI, asyncio=True)
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -18,4 +128,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,11 +1,22 @@
+import logging
 import os
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from app.api.api_v1.api import api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.encoding import DefaultJSONResponse
+from app.core.http_cache import CachedStaticFiles, ConditionalGetMiddleware
+from app.core.security import shutdown_hash_pool
+from app.services.qr import shutdown_render_pool
+from app.ml.jobs import training_jobs
+from app.db.session import SessionLocal
+from sqlalchemy.exc import SQLAlchemyError
 
-app = FastAPI(title=settings.PROJECT_NAME)
+logger = logging.getLogger(__name__)
+
+# JSON_RESPONSE_CLASS=orjson switches every JSON response to orjson
+app = FastAPI(title=settings.PROJECT_NAME, default_response_class=DefaultJSONResponse)
 
 
 
@@ -15,13 +26,54 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],         
     allow_headers=["*"],         
-    expose_headers=["*"],
+    # Browsers ignore the "*" wildcard on credentialed requests, so name the cursor headers
+    expose_headers=["*", "X-Next-Cursor", "X-Prev-Cursor"],
+    max_age=settings.CORS_MAX_AGE_SECONDS,
+)
+# ETags are computed over the uncompressed body, so compression is added last (outermost)
+app.add_middleware(ConditionalGetMiddleware)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
 )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 if os.path.isdir("static"):
-    app.mount("/static", StaticFiles(directory="static"), name="static")
+    app.mount(
+        "/static",
+        CachedStaticFiles(
+            directory="static",
+            cache_control=f"private, max-age={settings.STATIC_CACHE_MAX_AGE_SECONDS}",
+            # QR codes, and the frontend build's assets/ where every name carries a content
+            # hash; the rest, index.html included, is revalidated so a deploy shows up at once
+            long_lived=r"(qrcodes|assets)/.+",
+        ),
+        name="static",
+    )
+
+@app.on_event("shutdown")
+def stop_qr_render_pool():
+    shutdown_render_pool()
+
+@app.on_event("shutdown")
+def stop_password_hash_pool():
+    shutdown_hash_pool()
+
+@app.on_event("startup")
+def reap_stale_training_jobs():
+    # Jobs left queued or running by a worker that died; housekeeping must not stop startup
+    try:
+        with SessionLocal() as db:
+            training_jobs.reap_stale(db)
+    except SQLAlchemyError as e:
+        logger.warning("Could not reap stale training jobs: %s", e)
+
+@app.on_event("shutdown")
+def stop_training_jobs():
+    training_jobs.shutdown()
 
 @app.get("/")
 def read_root():
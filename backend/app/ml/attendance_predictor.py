@@ -1,5 +1,7 @@
 
+import hashlib
 import os
+import threading
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
@@ -8,12 +10,89 @@ from sklearn.compose import ColumnTransformer
 import joblib
 from datetime import datetime
 
+from app.core.config import settings
+from app.ml.backends import COMPACT_BACKENDS
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models, keyed by file path.
+
+    Models are loaded once per worker with joblib's mmap mode, so the large tree arrays
+    are shared page cache between uvicorn workers instead of private copies. Each get()
+    only stats the file; when a new version has been written (train replaces the file
+    atomically) it is loaded and swapped in. A version is named by a hash of the file's
+    content, so every host holding a copy of the same model agrees on it. Readers never wait on the lock: requests
+    already predicting keep using the model object they picked up.
+    """
+
+    def __init__(self):
+        self._models = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stat(path):
+        stat = os.stat(path)
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _content_version(path):
+        # The same model file has the same version on every host that has a copy of it
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()[:16]
+
+    def current(self, path):
+        """(version, model) for the file at path, or (None, None) if there is no model yet"""
+        try:
+            stat = self._stat(path)
+        except FileNotFoundError:
+            return None, None
+
+        # The stat only tells when to reload; the version is a hash of the file's content
+        entry = self._models.get(path)
+        if entry is not None and entry[0] == stat:
+            return entry[1], entry[2]
+
+        with self._lock:
+            entry = self._models.get(path)
+            if entry is None or entry[0] != stat:
+                entry = (stat, self._content_version(path), joblib.load(path, mmap_mode='r'))
+                self._models[path] = entry
+            return entry[1], entry[2]
+
+    def get(self, path):
+        return self.current(path)[1]
+
+    def publish(self, path, model):
+        """Atomically write a new model version to path and make it current in this process"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(model, tmp_path)
+        version = self._content_version(tmp_path)
+        with self._lock:
+            os.replace(tmp_path, path)
+            self._models[path] = (self._stat(path), version, model)
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+
+model_registry = ModelRegistry()
+
+
 class AttendancePredictor:
+    progress_chunk = 10
+
     def __init__(self):
         self.model = None
+        # Version of the trained model in use; None while falling back to an untrained model
+        self.model_version = None
         
-        self.model_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+        self.model_dir = settings.ML_MODEL_DIR
         self.model_path = os.path.join(self.model_dir, 'attendance_model.pkl')
+        self.training_features_path = os.path.join(self.model_dir, 'training_features.pkl')
         os.makedirs(self.model_dir, exist_ok=True)     
       
         self.categorical_features = ['day_of_week', 'event_category', 'time_slot']
@@ -27,13 +106,20 @@ class AttendancePredictor:
         if self.model is None:
             try:
                
-                self.model = joblib.load(self.model_path)
-            except (FileNotFoundError, EOFError):
-
+                self.model_version, self.model = model_registry.current(self.model_path)
+            except EOFError:
+                self.model_version, self.model = None, None
+            if self.model is None:
                 self._create_basic_model()
     
     def _create_basic_model(self):
         
+        backend = settings.ATTENDANCE_MODEL_BACKEND
+        if backend in COMPACT_BACKENDS:
+            self.model = COMPACT_BACKENDS[backend](self.categorical_features, self.numerical_features)
+            return
+        if backend != "random_forest":
+            raise ValueError(f"Unknown attendance model backend: {backend}")
         
         categorical_transformer = Pipeline(steps=[
             ('onehot', OneHotEncoder(handle_unknown='ignore'))
@@ -55,7 +141,7 @@ class AttendancePredictor:
             ('classifier', RandomForestClassifier(n_estimators=100, random_state=42))
         ])
     
-    def train(self, training_data):
+    def train(self, training_data, progress_callback=None):
        
         if not isinstance(training_data, pd.DataFrame):
             raise ValueError("Training data must be a pandas DataFrame")
@@ -67,15 +153,27 @@ class AttendancePredictor:
             raise ValueError(f"Training data missing required columns: {missing_cols}")
         
         
-        self._ensure_model_loaded()
+        # Always fit a fresh pipeline: the cached model is shared with in-flight predictions
+        self._create_basic_model()
       
         X = training_data[self.categorical_features + self.numerical_features]
         y = training_data['attended']
         
-        self.model.fit(X, y)
+        classifier = getattr(self.model, 'named_steps', {}).get('classifier')
+        if progress_callback is None or not hasattr(classifier, 'warm_start'):
+            self.model.fit(X, y)
+        else:
+            # Grow the forest in chunks so a long training can report how far it got
+            total = classifier.n_estimators
+            self.model.set_params(classifier__warm_start=True)
+            for n_estimators in range(self.progress_chunk, total + self.progress_chunk, self.progress_chunk):
+                self.model.set_params(classifier__n_estimators=min(n_estimators, total))
+                self.model.fit(X, y)
+                progress_callback(min(n_estimators, total) / total)
+            self.model.set_params(classifier__warm_start=False)
         
       
-        joblib.dump(self.model, self.model_path)
+        model_registry.publish(self.model_path, self.model)
     
     def predict_attendance_probability(self, user_data):
        
@@ -0,0 +1,118 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.exceptions import NotFittedError
+from sklearn.linear_model import LogisticRegression
+
+
+class _FeatureEncoder:
+    """
+    Turns the feature frame into a NumPy matrix without a ColumnTransformer:
+    categoricals become integer codes (-1 for values unseen in training).
+    """
+
+    def __init__(self, categorical_features: List[str], numerical_features: List[str]):
+        self.categorical_features = list(categorical_features)
+        self.numerical_features = list(numerical_features)
+        self.categories_: Dict[str, list] = {}
+
+    def fit(self, X: pd.DataFrame) -> "_FeatureEncoder":
+        self.categories_ = {
+            col: sorted(X[col].astype(str).unique().tolist()) for col in self.categorical_features
+        }
+        return self
+
+    def codes(self, X: pd.DataFrame) -> np.ndarray:
+        return np.column_stack([
+            pd.Categorical(X[col].astype(str), categories=self.categories_[col]).codes
+            for col in self.categorical_features
+        ]).astype(np.int64)
+
+    def numeric(self, X: pd.DataFrame) -> np.ndarray:
+        return X[self.numerical_features].to_numpy(dtype=np.float64)
+
+
+class HistGradientBoostingModel:
+    """Histogram gradient boosting with native categorical splits over a NumPy matrix"""
+
+    def __init__(self, categorical_features: List[str], numerical_features: List[str]):
+        self.encoder = _FeatureEncoder(categorical_features, numerical_features)
+        self.classifier = None
+
+    def _matrix(self, X: pd.DataFrame) -> np.ndarray:
+        codes = self.encoder.codes(X).astype(np.float64)
+        codes[codes < 0] = np.nan
+        return np.hstack([codes, self.encoder.numeric(X)])
+
+    def fit(self, X: pd.DataFrame, y) -> "HistGradientBoostingModel":
+        self.encoder.fit(X)
+        n_categorical = len(self.encoder.categorical_features)
+        mask = [True] * n_categorical + [False] * len(self.encoder.numerical_features)
+        self.classifier = HistGradientBoostingClassifier(
+            categorical_features=mask, max_iter=100, random_state=42
+        )
+        self.classifier.fit(self._matrix(X), np.asarray(y))
+        return self
+
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        if self.classifier is None:
+            raise NotFittedError("HistGradientBoostingModel is not fitted")
+        return self.classifier.predict_proba(self._matrix(X))
+
+
+class LogisticScorer:
+    """
+    Logistic regression compiled down to weight arrays. Scoring is a handful of NumPy
+    lookups and one dot product; no scikit-learn objects are kept after fitting.
+    """
+
+    def __init__(self, categorical_features: List[str], numerical_features: List[str]):
+        self.encoder = _FeatureEncoder(categorical_features, numerical_features)
+        self.category_weights: List[np.ndarray] = []
+        self.numeric_weights = None
+        self.mean = None
+        self.scale = None
+        self.intercept = 0.0
+
+    def fit(self, X: pd.DataFrame, y) -> "LogisticScorer":
+        self.encoder.fit(X)
+        codes = self.encoder.codes(X)
+        numeric = self.encoder.numeric(X)
+        self.mean = numeric.mean(axis=0)
+        self.scale = numeric.std(axis=0)
+        self.scale[self.scale == 0] = 1.0
+
+        sizes = [len(self.encoder.categories_[col]) for col in self.encoder.categorical_features]
+        offsets = np.cumsum([0] + sizes[:-1])
+        one_hot = np.zeros((len(X), sum(sizes)))
+        for i, offset in enumerate(offsets):
+            one_hot[np.arange(len(X)), offset + codes[:, i]] = 1.0
+        design = np.hstack([one_hot, (numeric - self.mean) / self.scale])
+
+        model = LogisticRegression(max_iter=1000).fit(design, np.asarray(y))
+        weights = model.coef_[0]
+        # A trailing zero weight makes code -1 (unseen category) contribute nothing
+        self.category_weights = [
+            np.append(weights[offset:offset + size], 0.0) for offset, size in zip(offsets, sizes)
+        ]
+        self.numeric_weights = weights[sum(sizes):]
+        self.intercept = float(model.intercept_[0])
+        return self
+
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        if self.numeric_weights is None:
+            raise NotFittedError("LogisticScorer is not fitted")
+        codes = self.encoder.codes(X)
+        z = self.intercept + ((self.encoder.numeric(X) - self.mean) / self.scale) @ self.numeric_weights
+        for i, weights in enumerate(self.category_weights):
+            z += weights[codes[:, i]]
+        p = 1.0 / (1.0 + np.exp(-z))
+        return np.column_stack([1.0 - p, p])
+
+
+COMPACT_BACKENDS = {
+    "hist_gradient_boosting": HistGradientBoostingModel,
+    "logistic": LogisticScorer,
+}
@@ -0,0 +1,263 @@
+import os
+import tempfile
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.event import Event
+from app.db.models.registration import Registration
+from app.db.models.user import User
+
+DAYS_OF_WEEK = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+FEATURE_COLUMNS = [
+    "day_of_week", "event_category", "time_slot", "days_to_event",
+    "user_past_attendance_rate", "event_popularity", "similar_events_attended",
+]
+
+
+def event_time_features(start_time: datetime) -> Tuple[str, str]:
+    """Day of week name and time slot (morning, afternoon, evening) of an event start"""
+    hour = start_time.hour
+    if hour < 12:
+        time_slot = "morning"
+    elif hour < 17:
+        time_slot = "afternoon"
+    else:
+        time_slot = "evening"
+    return DAYS_OF_WEEK[start_time.weekday()], time_slot
+
+
+def build_prediction_features(db: Session, event: Event, user_ids: List[int]) -> pd.DataFrame:
+    """
+    Feature frame for predicting whether each user attends `event`, one row per user id
+    in the given order. Uses three grouped queries regardless of how many users there are.
+    """
+    if not user_ids:
+        return pd.DataFrame(columns=["user_id"] + FEATURE_COLUMNS)
+
+    day_of_week, time_slot = event_time_features(event.start_time)
+    days_to_event = (event.start_time.date() - pd.Timestamp.now(tz='UTC').date()).days
+
+    history = pd.DataFrame(
+        db.query(
+            Registration.user_id,
+            func.count(Registration.id),
+            func.count(Registration.check_in_time),
+        ).filter(Registration.user_id.in_(user_ids)).group_by(Registration.user_id).all(),
+        columns=["user_id", "registered", "attended"],
+    ).set_index("user_id")
+
+    similar = pd.DataFrame(
+        db.query(Registration.user_id, func.count(Registration.id)).join(Event).filter(
+            Registration.user_id.in_(user_ids),
+            Registration.check_in_time.isnot(None),
+            Event.category == event.category,
+        ).group_by(Registration.user_id).all(),
+        columns=["user_id", "similar_events_attended"],
+    ).set_index("user_id")
+
+    event_registrations = db.query(func.count(Registration.id)).filter(
+        Registration.event_id == event.id
+    ).scalar()
+
+    features = pd.DataFrame(index=pd.Index(user_ids, name="user_id"))
+    features = features.join(history).join(similar)
+    features = features.fillna(0)
+
+    registered = features["registered"].to_numpy(dtype=float)
+    attended = features["attended"].to_numpy(dtype=float)
+    features["user_past_attendance_rate"] = np.divide(
+        attended, registered, out=np.zeros_like(attended), where=registered > 0
+    )
+    features["similar_events_attended"] = features["similar_events_attended"].astype(int)
+    features["day_of_week"] = day_of_week
+    features["event_category"] = event.category or "uncategorized"
+    features["time_slot"] = time_slot
+    features["days_to_event"] = days_to_event
+    features["event_popularity"] = event_registrations / event.capacity if event.capacity else 0
+
+    return features.reset_index()[["user_id"] + FEATURE_COLUMNS]
+
+
+def _count_earlier(targets: pd.DataFrame, history: pd.DataFrame, keys: Sequence[str], inclusive: bool = False) -> np.ndarray:
+    """
+    For every target row, the number of history rows with equal `keys` whose `time` is
+    strictly earlier (or earlier-or-equal when inclusive) than the target's `time`.
+    Both frames are merged and sorted once, then counted with a grouped cumulative sum.
+    """
+    keys = list(keys)
+    queries = targets[keys + ["time"]].assign(_is_history=0, _pos=np.arange(len(targets)))
+    events = history[keys + ["time"]].dropna(subset=["time"]).assign(_is_history=1, _pos=-1)
+    combined = pd.concat([queries, events], ignore_index=True)
+    # On equal times, history rows sort after the target for "<" and before it for "<="
+    combined["_tie"] = 1 - combined["_is_history"] if inclusive else combined["_is_history"]
+    combined = combined.sort_values(keys + ["time", "_tie"], kind="mergesort")
+    combined["_count"] = combined.groupby(keys, dropna=False, sort=False)["_is_history"].cumsum()
+
+    counts = np.zeros(len(targets), dtype=int)
+    answered = combined[combined["_is_history"] == 0]
+    counts[answered["_pos"].to_numpy()] = answered["_count"].to_numpy()
+    return counts
+
+
+TRAINING_COLUMNS = ["registration_id"] + FEATURE_COLUMNS + ["attended"]
+
+
+def _registration_frame(query) -> pd.DataFrame:
+    frame = pd.DataFrame(
+        query.with_entities(
+            Registration.id, Registration.user_id, Registration.event_id,
+            Registration.registration_date, Registration.check_in_time,
+            Event.category, Event.start_time, Event.capacity, Event.id.isnot(None),
+        ).all(),
+        columns=[
+            "registration_id", "user_id", "event_id", "registration_date", "check_in_time",
+            "category", "start_time", "capacity", "event_exists",
+        ],
+    )
+    for column in ("registration_date", "check_in_time", "start_time"):
+        frame[column] = pd.to_datetime(frame[column])
+    frame["event_exists"] = frame["event_exists"].astype(bool)
+    return frame
+
+
+def _training_features(targets: pd.DataFrame, history: pd.DataFrame) -> pd.DataFrame:
+    """Point-in-time features for each target registration, computed from `history`"""
+    at_registration = targets.assign(time=targets["registration_date"])
+
+    past_registrations = _count_earlier(
+        at_registration, history.assign(time=history["registration_date"]), ["user_id"]
+    )
+    # Only check-ins that had already happened when the user registered count as history
+    past_attended = _count_earlier(
+        at_registration, history.assign(time=history["check_in_time"]), ["user_id"]
+    )
+    similar_events_attended = _count_earlier(
+        at_registration,
+        history[history["event_exists"]].assign(time=history["check_in_time"]),
+        ["user_id", "category"],
+    )
+    event_registrations = _count_earlier(
+        at_registration, history.assign(time=history["registration_date"]), ["event_id"], inclusive=True
+    )
+
+    hour = targets["start_time"].dt.hour
+    capacity = targets["capacity"].fillna(0).to_numpy(dtype=float)
+    past_registrations_f = past_registrations.astype(float)
+
+    return pd.DataFrame({
+        "registration_id": targets["registration_id"].to_numpy(),
+        "day_of_week": targets["start_time"].dt.weekday.map(dict(enumerate(DAYS_OF_WEEK))).to_numpy(),
+        "event_category": targets["category"].fillna("uncategorized").to_numpy(),
+        "time_slot": np.select([hour < 12, hour < 17], ["morning", "afternoon"], "evening"),
+        "days_to_event": (
+            targets["start_time"].dt.normalize() - targets["registration_date"].dt.normalize()
+        ).dt.days.to_numpy(),
+        "user_past_attendance_rate": np.divide(
+            past_attended.astype(float), past_registrations_f,
+            out=np.zeros_like(past_registrations_f), where=past_registrations > 0,
+        ),
+        "event_popularity": np.divide(
+            event_registrations.astype(float), capacity, out=np.zeros_like(capacity), where=capacity > 0,
+        ),
+        "similar_events_attended": similar_events_attended,
+        "attended": targets["check_in_time"].notna().astype(int).to_numpy(),
+    })
+
+
+def _load_store(store_path: Optional[str]) -> Optional[dict]:
+    """The persisted training rows and their watermark, or None to rebuild from scratch"""
+    if not store_path or not os.path.exists(store_path):
+        return None
+    store = pd.read_pickle(store_path)
+    # Stores written before the watermark was added hold a bare frame; rebuild those once
+    return store if isinstance(store, dict) else None
+
+
+def _save_store(store_path: str, store: dict) -> None:
+    # A unique temp file, so concurrent runs never write into each other's output
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(store_path) or ".", prefix=os.path.basename(store_path) + ".", suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        pd.to_pickle(store, tmp_path)
+        os.replace(tmp_path, store_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def build_training_set(
+    db: Session, store_path: Optional[str] = None, rescan_days: Optional[float] = None
+) -> pd.DataFrame:
+    """
+    Training rows for every registration of an event that has already ended.
+
+    Features are point-in-time correct: they only use registrations and check-ins that
+    existed at the moment the user registered. Rows of an ended event rarely change, so
+    the table is persisted to `store_path` with a watermark: the highest registration id
+    covered and the events that had not ended yet. Later runs select newer registrations,
+    those of the pending events, and every registration of an event that ended within
+    the last `rescan_days`, whose stored rows are replaced. The re-scan picks up check-ins
+    recorded after the event and registrations whose id was allocated before the
+    watermark but committed after it; changes older than the window are not seen until
+    the store is deleted and rebuilt. The cost follows what changed rather than the whole
+    history.
+    """
+    store = _load_store(store_path)
+    stored = store["features"] if store is not None else None
+    now = pd.Timestamp.now(tz='UTC')
+    max_registration_id = db.query(func.max(Registration.id)).scalar() or 0
+
+    target_criteria = [Event.end_time < now, Registration.id <= max_registration_id]
+    if store is not None:
+        rescan_days = settings.TRAINING_SET_RESCAN_DAYS if rescan_days is None else rescan_days
+        target_criteria.append(or_(
+            Registration.id > store["max_registration_id"],
+            Registration.event_id.in_(store["pending_event_ids"]),
+            Event.end_time >= now - pd.Timedelta(days=rescan_days),
+        ))
+    targets = _registration_frame(
+        db.query(Registration)
+        .join(Event, Event.id == Registration.event_id)
+        .join(User, User.id == Registration.user_id)
+        .filter(*target_criteria)
+    )
+
+    if targets.empty:
+        features = stored if stored is not None else pd.DataFrame(columns=TRAINING_COLUMNS)
+    else:
+        # Full history on the first run; afterwards only the users and events being added
+        history_query = db.query(Registration).outerjoin(Event, Event.id == Registration.event_id)
+        if stored is not None:
+            history_query = history_query.filter(or_(
+                Registration.user_id.in_(targets["user_id"].unique().tolist()),
+                Registration.event_id.in_(targets["event_id"].unique().tolist()),
+            ))
+        history = _registration_frame(history_query)
+        features = _training_features(targets, history)
+        if stored is not None:
+            stored = stored[~stored["registration_id"].isin(features["registration_id"])]
+            features = pd.concat([stored, features], ignore_index=True)
+
+    if store_path:
+        # Events with covered registrations that have not ended are picked up once they do
+        pending_event_ids = [
+            event_id for event_id, in db.query(Registration.event_id).join(Event).filter(
+                Event.end_time >= now, Registration.id <= max_registration_id
+            ).distinct()
+        ]
+        _save_store(store_path, {
+            "features": features,
+            "max_registration_id": max_registration_id,
+            "pending_event_ids": pending_event_ids,
+        })
+
+    return features.sort_values("registration_id", ignore_index=True)
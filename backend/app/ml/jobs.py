@@ -0,0 +1,259 @@
+import queue
+import time
+import uuid
+import threading
+import multiprocessing
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+# Every model, so the mappers the training set queries resolve in the training process
+from app.db.base import Base  # noqa: F401
+from app.db.models.training_job import TrainingJob
+from app.ml.attendance_predictor import AttendancePredictor
+from app.ml.features import build_training_set
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+def _train_in_process(build, database_url: str, store_path: str, model_path: str, messages) -> None:
+    # Entry point of the training process; reports back through the messages queue
+    try:
+        engine = create_engine(database_url)
+        try:
+            with Session(engine) as db:
+                training_data = build(db, store_path)
+        finally:
+            engine.dispose()
+        if training_data.empty:
+            messages.put(("error", "No training data could be generated"))
+            return
+        messages.put(("data_points", len(training_data)))
+
+        predictor = AttendancePredictor()
+        predictor.model_path = model_path
+        predictor.train(training_data, progress_callback=lambda p: messages.put(("progress", p)))
+        messages.put(("done", None))
+    except Exception as e:
+        messages.put(("error", str(e)))
+
+
+class TrainingJobManager:
+    """
+    Runs model trainings as background jobs so API workers never block on a fit.
+    Each job builds its training set and trains in its own spawned process (CPU-bound
+    work, and a process can be terminated on cancel); a watcher thread in the
+    submitting worker relays progress. Job state lives in the training_job table, so
+    any worker can report or cancel a job, and its partial unique index on running jobs
+    lets only one train at a time across every worker. The submitting worker keeps the
+    heartbeat of its queued and running jobs fresh; a job whose heartbeat is older than
+    `stale_seconds` belonged to a worker that died and is marked failed.
+
+    `build(db, store_path)` produces the training rows; it runs in the training process,
+    so it must be a module-level function.
+    """
+
+    def __init__(self, poll_seconds: float = 0.2, stale_seconds: float = 60.0, build=build_training_set):
+        self.build = build
+        self.poll_seconds = poll_seconds
+        self.stale_seconds = stale_seconds
+        # job id -> engine of every job submitted here that has not finished, and
+        # job id -> training process of those that are running
+        self._jobs: Dict[str, object] = {}
+        self._processes: Dict[str, multiprocessing.Process] = {}
+        self._lock = threading.Lock()
+        self._context = multiprocessing.get_context("spawn")
+
+    def submit(self, db: Session, store_path: str, model_path: str) -> TrainingJob:
+        """Queue a training on the feature store at `store_path` that publishes to `model_path`"""
+        job = TrainingJob(id=uuid.uuid4().hex, status=QUEUED, progress=0.0, heartbeat_at=datetime.utcnow())
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        threading.Thread(
+            target=self._run, args=(db.get_bind(), job.id, store_path, model_path),
+            daemon=True, name=f"training-{job.id}",
+        ).start()
+        return job
+
+    def get(self, db: Session, job_id: str) -> Optional[TrainingJob]:
+        return db.get(TrainingJob, job_id)
+
+    def cancel(self, db: Session, job_id: str) -> Optional[TrainingJob]:
+        """
+        Cancel a job from any worker: a queued job is cancelled at once, a running one
+        is stopped by the worker running it within `poll_seconds`.
+        """
+        db.execute(
+            update(TrainingJob).where(TrainingJob.id == job_id, TrainingJob.status == QUEUED)
+            .values(status=CANCELLED, cancel_requested=True, finished_at=datetime.utcnow())
+        )
+        db.execute(
+            update(TrainingJob).where(TrainingJob.id == job_id, TrainingJob.status == RUNNING)
+            .values(cancel_requested=True)
+        )
+        db.commit()
+        with self._lock:
+            process = self._processes.get(job_id)
+        if process is not None and process.is_alive():
+            process.terminate()
+        job = db.get(TrainingJob, job_id)
+        if job is not None:
+            db.refresh(job)
+        return job
+
+    def reap_stale(self, db: Session) -> int:
+        """
+        Mark failed the queued and running jobs whose heartbeat is older than
+        `stale_seconds`: the worker that submitted them is gone. Returns how many.
+        """
+        now = datetime.utcnow()
+        reaped = db.execute(
+            update(TrainingJob)
+            .where(
+                TrainingJob.status.in_((QUEUED, RUNNING)),
+                or_(TrainingJob.heartbeat_at.is_(None),
+                    TrainingJob.heartbeat_at < now - timedelta(seconds=self.stale_seconds)),
+            )
+            .values(status=FAILED, error="The worker running this job stopped", finished_at=now)
+        ).rowcount
+        db.commit()
+        return reaped
+
+    def shutdown(self) -> None:
+        """Stop the queued and running trainings of this worker and mark them cancelled"""
+        with self._lock:
+            jobs = list(self._jobs.items())
+        for job_id, engine in jobs:
+            with self._lock:
+                process = self._processes.get(job_id)
+            if process is not None and process.is_alive():
+                process.terminate()
+            with Session(engine) as db:
+                db.execute(
+                    update(TrainingJob)
+                    .where(TrainingJob.id == job_id, TrainingJob.status.in_((QUEUED, RUNNING)))
+                    .values(status=CANCELLED, cancel_requested=True, finished_at=datetime.utcnow())
+                )
+                db.commit()
+
+    def _update(self, db: Session, job_id: str, **values) -> None:
+        db.execute(update(TrainingJob).where(TrainingJob.id == job_id).values(**values))
+        db.commit()
+
+    def _claim(self, db: Session, job_id: str) -> Optional[bool]:
+        """
+        Move the job from queued to running. False while another job holds the running
+        slot, None when the job was cancelled before it could start.
+        """
+        self.reap_stale(db)
+        now = datetime.utcnow()
+        try:
+            claimed = db.execute(
+                update(TrainingJob)
+                .where(TrainingJob.id == job_id, TrainingJob.status == QUEUED)
+                .values(status=RUNNING, heartbeat_at=now)
+            ).rowcount
+            db.commit()
+        except IntegrityError:
+            # uq_training_job_running: another job is running
+            db.rollback()
+            return False
+        return True if claimed else None
+
+    def _run(self, engine, job_id: str, store_path: str, model_path: str) -> None:
+        with self._lock:
+            self._jobs[job_id] = engine
+        try:
+            with Session(engine) as db:
+                self._train(db, engine, job_id, store_path, model_path)
+        finally:
+            with self._lock:
+                self._jobs.pop(job_id, None)
+
+    def _train(self, db: Session, engine, job_id: str, store_path: str, model_path: str) -> None:
+        last_heartbeat = time.monotonic()
+        while True:
+            claimed = self._claim(db, job_id)
+            if claimed is None:
+                return
+            if claimed:
+                break
+            # Waiting for the running slot: keep the queued job from looking abandoned
+            if time.monotonic() - last_heartbeat >= self.stale_seconds / 4:
+                db.execute(
+                    update(TrainingJob)
+                    .where(TrainingJob.id == job_id, TrainingJob.status == QUEUED)
+                    .values(heartbeat_at=datetime.utcnow())
+                )
+                db.commit()
+                last_heartbeat = time.monotonic()
+            time.sleep(self.poll_seconds)
+
+        messages = self._context.Queue()
+        process = self._context.Process(
+            target=_train_in_process,
+            args=(self.build, engine.url.render_as_string(hide_password=False), store_path, model_path, messages),
+            daemon=True,
+        )
+        with self._lock:
+            self._processes[job_id] = process
+        process.start()
+        try:
+            result = self._watch(db, job_id, process, messages)
+        finally:
+            process.join()
+            with self._lock:
+                self._processes.pop(job_id, None)
+
+        # Only a job still running gets its final state; shutdown() may have settled it
+        db.expire_all()
+        job = db.get(TrainingJob, job_id)
+        if job.status != RUNNING:
+            return
+        if job.cancel_requested:
+            self._update(db, job_id, status=CANCELLED, finished_at=datetime.utcnow())
+        elif result[0] == "done":
+            self._update(db, job_id, status=SUCCEEDED, progress=1.0, finished_at=datetime.utcnow())
+        else:
+            self._update(db, job_id, status=FAILED, error=result[1], finished_at=datetime.utcnow())
+
+    def _watch(self, db: Session, job_id: str, process, messages) -> tuple:
+        """Relay progress and heartbeats until the process reports a result; stop it when cancelled"""
+        last_heartbeat = time.monotonic()
+        while True:
+            try:
+                kind, value = messages.get(timeout=self.poll_seconds)
+            except queue.Empty:
+                if not process.is_alive():
+                    # Drain anything sent just before exit, then give up on this job
+                    try:
+                        kind, value = messages.get(timeout=0.5)
+                    except queue.Empty:
+                        return ("error", f"Training process exited with code {process.exitcode}")
+                else:
+                    kind, value = None, None
+            if kind not in (None, "progress", "data_points"):
+                return (kind, value)
+
+            # A heartbeat well within stale_seconds, without a write on every poll
+            if kind is not None or time.monotonic() - last_heartbeat >= self.stale_seconds / 4:
+                values = {"heartbeat_at": datetime.utcnow()}
+                if kind is not None:
+                    values[kind] = value
+                self._update(db, job_id, **values)
+                last_heartbeat = time.monotonic()
+            db.expire_all()
+            if db.get(TrainingJob, job_id).cancel_requested and process.is_alive():
+                process.terminate()
+
+
+training_jobs = TrainingJobManager()
@@ -0,0 +1,167 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.attendance_prediction import AttendancePrediction
+from app.db.models.event import Event
+from app.db.models.registration import Registration
+from app.db.models.user import User
+from app.ml.attendance_predictor import AttendancePredictor
+from app.ml.features import build_prediction_features
+
+
+logger = logging.getLogger(__name__)
+
+# Returned when no model can score the users, e.g. before the first training
+FALLBACK_PROBABILITY = 0.5
+
+# Postgres advisory lock key held by a running refresh ("pred" in ASCII)
+REFRESH_LOCK_KEY = 0x70726564
+
+
+def _score(db: Session, event: Event, user_ids: List[int], predictor: AttendancePredictor) -> Dict[int, float]:
+    df = build_prediction_features(db, event, user_ids)
+    if df.empty:
+        return {}
+    try:
+        probabilities = predictor.predict_attendance_probability(df)
+    except Exception:
+        predictor.model_version = None
+        probabilities = [FALLBACK_PROBABILITY] * len(df)
+    return {int(user_id): float(p) for user_id, p in zip(df["user_id"], probabilities)}
+
+
+def _store(db: Session, event_id: int, model_version: str, probabilities: Dict[int, float]) -> None:
+    db.bulk_insert_mappings(AttendancePrediction, [
+        {"event_id": event_id, "user_id": user_id, "model_version": model_version, "probability": p}
+        for user_id, p in probabilities.items()
+    ])
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request or refresh stored the same rows first; theirs are equivalent
+        db.rollback()
+
+
+def _replace(
+    db: Session, event_id: int, model_version: str, probabilities: Dict[int, float], attempts: int = 3
+) -> int:
+    """
+    Replace every stored prediction of the event by `probabilities`, deleting and inserting
+    in one transaction. A request that stores rows of its own in between makes the insert
+    fail and the whole transaction roll back, so it is retried. Returns the number of
+    rows now stored for the event and model version.
+    """
+    rows = [
+        {"event_id": event_id, "user_id": user_id, "model_version": model_version, "probability": p}
+        for user_id, p in probabilities.items()
+    ]
+    for _ in range(attempts):
+        db.query(AttendancePrediction).filter(
+            AttendancePrediction.event_id == event_id
+        ).delete(synchronize_session=False)
+        db.bulk_insert_mappings(AttendancePrediction, rows)
+        try:
+            db.commit()
+            break
+        except IntegrityError:
+            db.rollback()
+    return db.query(func.count(AttendancePrediction.id)).filter(
+        AttendancePrediction.event_id == event_id, AttendancePrediction.model_version == model_version
+    ).scalar()
+
+
+def predict_for_event(
+    db: Session, event: Event, user_ids: List[int], predictor: Optional[AttendancePredictor] = None
+) -> Dict[int, float]:
+    """
+    Attendance probability per user id, served from the attendance_prediction table for
+    the current model version. Only users without a stored prediction are scored, and
+    their results are stored for the next caller.
+    """
+    predictor = predictor or AttendancePredictor()
+    predictor._ensure_model_loaded()
+    model_version = predictor.model_version
+
+    probabilities: Dict[int, float] = {}
+    if model_version is not None and user_ids:
+        probabilities = dict(
+            db.query(AttendancePrediction.user_id, AttendancePrediction.probability).filter(
+                AttendancePrediction.event_id == event.id,
+                AttendancePrediction.model_version == model_version,
+                AttendancePrediction.user_id.in_(user_ids),
+            ).all()
+        )
+
+    misses = [user_id for user_id in user_ids if user_id not in probabilities]
+    if misses:
+        scored = _score(db, event, misses, predictor)
+        if predictor.model_version is not None:
+            _store(db, event.id, predictor.model_version, scored)
+        probabilities.update(scored)
+
+    return probabilities
+
+
+def expected_turnout(db: Session, event: Event, predictor: Optional[AttendancePredictor] = None) -> dict:
+    """Expected number of registered users who will attend: the sum of their probabilities"""
+    registered_ids = [
+        user_id for user_id, in db.query(Registration.user_id).filter(Registration.event_id == event.id).all()
+    ]
+    predictor = predictor or AttendancePredictor()
+    probabilities = predict_for_event(db, event, registered_ids, predictor)
+    return {
+        "event_id": event.id,
+        "registered": len(registered_ids),
+        "expected_turnout": sum(probabilities.values()),
+        "model_version": predictor.model_version,
+    }
+
+
+def refresh_upcoming_predictions(db: Session, horizon_days: Optional[int] = None) -> int:
+    """
+    Recompute and store predictions for every user and every event starting within the
+    horizon, replacing rows of older model versions. Returns the number of rows stored.
+    """
+    predictor = AttendancePredictor()
+    predictor._ensure_model_loaded()
+    if predictor.model_version is None:
+        return 0
+
+    horizon_days = settings.PREDICTION_REFRESH_HORIZON_DAYS if horizon_days is None else horizon_days
+    now = datetime.utcnow()
+    events = db.query(Event).filter(
+        Event.start_time > now, Event.start_time <= now + timedelta(days=horizon_days)
+    ).all()
+    user_ids = [user_id for user_id, in db.query(User.id).filter(User.is_admin.isnot(True)).all()]
+
+    stored = 0
+    for event in events:
+        scored = _score(db, event, user_ids, predictor)
+        if predictor.model_version is None:
+            break
+        stored += _replace(db, event.id, predictor.model_version, scored)
+    return stored
+
+
+def refresh_predictions_exclusively(db: Session) -> Optional[int]:
+    """
+    refresh_upcoming_predictions under a Postgres advisory lock, so overlapping runs from
+    several hosts or cron invocations never rewrite the same rows at once. Returns None
+    without refreshing when another run holds the lock. Other databases are not locked.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return refresh_upcoming_predictions(db)
+    # The lock belongs to a connection of its own, since the session's is released on every commit
+    with db.get_bind().connect() as lock_conn:
+        if not lock_conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": REFRESH_LOCK_KEY}).scalar():
+            return None
+        try:
+            return refresh_upcoming_predictions(db)
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": REFRESH_LOCK_KEY})
@@ -56,3 +56,4 @@ class Event(EventInDBBase):
 
 class EventWithAttendees(Event):
     registered_count: int
+    checked_in_count: int = 0
@@ -1,5 +1,5 @@
 from typing import Optional
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -14,6 +14,14 @@ class UserUpdate(BaseModel):
     password: Optional[str] = None
     is_admin: Optional[bool] = None
 
+    @field_validator("email", "username", "is_admin")
+    @classmethod
+    def not_null(cls, v):
+        # Fields may be left out, but these columns cannot be set to NULL
+        if v is None:
+            raise ValueError("may be omitted but not set to null")
+        return v
+
 class User(UserBase):
     id: int
     is_admin: bool
@@ -0,0 +1,109 @@
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import Response, status
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import build_cache_backend
+from app.core.config import settings
+from app.core.encoding import dumps
+from app.core.http_cache import REVALIDATE_CACHE_CONTROL, etag_matches
+
+EVENT_LIST_SCOPE = "events"
+
+
+def event_scope(event_id: int) -> str:
+    return f"event:{event_id}"
+
+
+class ResponseCache:
+    """
+    Rendered JSON responses keyed by request parameters and by the generation of each
+    scope they depend on. Invalidating a scope bumps its generation, so every entry built
+    under the old one is never read again and ages out of the backend. Because the key is
+    taken before the database is read, a response built while a write commits is stored
+    under the stale generation and cannot outlive the invalidation.
+    """
+
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def key(self, scopes: Iterable[str], params: Dict[str, Any]) -> str:
+        generations = [f"{scope}@{self.backend.counter(scope)}" for scope in scopes]
+        return "|".join(generations + [json.dumps(params, sort_keys=True, default=str)])
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.backend.get(key)
+
+    def store(self, key: str, content: Any, headers: Optional[Dict[str, str]] = None) -> dict:
+        body = dumps(content)
+        entry = {
+            "body": body.decode("utf-8"),
+            "etag": '"' + hashlib.sha1(body).hexdigest() + '"',
+            "headers": dict(headers or {}),
+        }
+        self.backend.set(key, entry, self.ttl)
+        return entry
+
+    def invalidate(self, *scopes: str) -> None:
+        for scope in scopes:
+            self.backend.incr(scope)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        return self.backend.stats()
+
+    async def _call(self, fn, *args):
+        if self.backend.blocking:
+            return await run_in_threadpool(fn, *args)
+        return fn(*args)
+
+    async def key_async(self, scopes: Iterable[str], params: Dict[str, Any]) -> str:
+        """key for async endpoints: a blocking backend is called off the event loop"""
+        return await self._call(self.key, list(scopes), params)
+
+    async def get_async(self, key: str) -> Optional[dict]:
+        return await self._call(self.get, key)
+
+    async def store_async(self, key: str, content: Any, headers: Optional[Dict[str, str]] = None) -> dict:
+        return await self._call(self.store, key, content, headers)
+
+    async def invalidate_async(self, *scopes: str) -> None:
+        await self._call(self.invalidate, *scopes)
+
+
+def cached_response(entry: dict, if_none_match: Optional[str] = None) -> Response:
+    """The response for a cache entry: 304 without a body when the client's copy is current"""
+    headers = {**entry["headers"], "ETag": entry["etag"], "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    if etag_matches(entry["etag"], if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
+event_cache = ResponseCache(
+    build_cache_backend(
+        settings.EVENT_CACHE_BACKEND,
+        settings.EVENT_CACHE_SIZE,
+        settings.EVENT_CACHE_TTL_SECONDS,
+        settings.EVENT_CACHE_REDIS_URL,
+    ),
+    settings.EVENT_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_events(event_ids: Iterable[int] = ()) -> None:
+    """Drop every cached event list and the cached detail of the given events"""
+    event_cache.invalidate(EVENT_LIST_SCOPE, *[event_scope(event_id) for event_id in event_ids])
+
+
+async def invalidate_events_async(event_ids: Iterable[int] = ()) -> None:
+    """invalidate_events for async endpoints"""
+    await event_cache.invalidate_async(EVENT_LIST_SCOPE, *[event_scope(event_id) for event_id in event_ids])
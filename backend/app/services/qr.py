@@ -0,0 +1,172 @@
+import io
+import hashlib
+import zipfile
+import threading
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional, Tuple
+
+import qrcode
+import qrcode.image.svg
+
+from app.core.config import settings
+
+QR_MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def render_qr(qr_data: str, fmt: str = "png") -> bytes:
+    """Render QR code data to PNG or SVG bytes"""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+        image_factory=qrcode.image.svg.SvgPathImage if fmt == "svg" else None,
+    )
+    qr.add_data(qr_data)
+    qr.make(fit=True)
+
+    if fmt == "svg":
+        img = qr.make_image()
+        buffer = io.BytesIO()
+        img.save(buffer)
+    else:
+        img = qr.make_image(fill_color="black", back_color="white")
+        buffer = io.BytesIO()
+        img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def render_qr_png(qr_data: str) -> bytes:
+    return render_qr(qr_data, "png")
+
+
+def qr_etag(qr_data: str, fmt: str) -> str:
+    """Strong ETag for a rendered QR image. Rendering is deterministic, so it can be
+    derived from the input without rendering anything."""
+    return '"' + hashlib.sha1(f"{fmt}:{qr_data}".encode()).hexdigest() + '"'
+
+
+class _LRUCache:
+    """Small thread-safe LRU of rendered image bytes"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: tuple, value: bytes) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+qr_cache = _LRUCache(settings.QR_CACHE_SIZE)
+
+
+def get_qr_image(qr_data: str, fmt: str = "png") -> bytes:
+    """Rendered QR image, served from the in-memory LRU when possible"""
+    key = (qr_data, fmt)
+    image = qr_cache.get(key)
+    if image is None:
+        image = render_qr(qr_data, fmt)
+        qr_cache.put(key, image)
+    return image
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that is running the server's threads is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.QR_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def warm_qr_cache(qr_data: str) -> Future:
+    """Render a PNG in the bounded worker pool and put it in the LRU once it is ready"""
+    future = _get_pool().submit(render_qr_png, qr_data)
+
+    def _store(done: Future) -> None:
+        if done.exception() is None:
+            qr_cache.put((qr_data, "png"), done.result())
+
+    future.add_done_callback(_store)
+    return future
+
+
+def render_qr_pngs(items: Iterable[Tuple[str, str]], window: int = 64) -> Iterator[Tuple[str, bytes]]:
+    """
+    Render (name, qr_data) pairs across the worker pool, yielding (name, png) in input order.
+    At most `window` renders are in flight, so memory stays flat however many items there are.
+    """
+    pool = _get_pool()
+    pending: "deque[Tuple[str, Future]]" = deque()
+    for name, qr_data in items:
+        pending.append((name, pool.submit(render_qr_png, qr_data)))
+        if len(pending) >= window:
+            name, future = pending.popleft()
+            yield name, future.result()
+    while pending:
+        name, future = pending.popleft()
+        yield name, future.result()
+
+
+class _ChunkWriter(io.RawIOBase):
+    """Unseekable sink that lets zipfile stream its output chunk by chunk"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_qr_zip(items: Iterable[Tuple[str, str]]) -> Iterator[bytes]:
+    """Stream a ZIP of PNG QR codes for (file name, qr_data) pairs, one entry at a time"""
+    sink = _ChunkWriter()
+    # PNGs are already compressed, so entries are stored rather than deflated
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for name, png in render_qr_pngs(items):
+            archive.writestr(name, png)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def shutdown_render_pool(wait: bool = True) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait)
+            _pool = None
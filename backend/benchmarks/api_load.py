@@ -0,0 +1,126 @@
+"""
+Replay the locustfile.py scenario against a running API and report latency and throughput.
+
+Every virtual user signs up, logs in with their email and then registers for random
+events among ids 1-10, as EventRushUser does, without think time so the server is
+the bottleneck. Start the API separately, e.g.
+
+    DATABASE_URL=postgresql://... uvicorn app.main:app --port 8000
+    python -m benchmarks.api_load --base-url http://localhost:8000 --users 200 --create-events
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Optional
+
+import httpx
+import numpy as np
+import pandas as pd
+
+EVENT_IDS = list(range(1, 11))
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.failures = defaultdict(int)
+
+    async def call(self, name: str, request) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            response = None
+        self.latencies[name].append(time.perf_counter() - start)
+        if response is None or response.status_code >= 500:
+            self.failures[name] += 1
+        return response
+
+    def report(self, elapsed: float) -> pd.DataFrame:
+        rows = []
+        for name, latencies in self.latencies.items():
+            ms = np.array(latencies) * 1000
+            rows.append({
+                "endpoint": name,
+                "requests": len(ms),
+                "failures": self.failures[name],
+                "req_per_s": len(ms) / elapsed,
+                "p50_ms": np.percentile(ms, 50),
+                "p95_ms": np.percentile(ms, 95),
+                "max_ms": ms.max(),
+            })
+        return pd.DataFrame(rows).set_index("endpoint").round(1)
+
+
+async def create_events(client: httpx.AsyncClient) -> None:
+    name = f"organizer{uuid.uuid4().hex[:8]}"
+    await client.post("/api/v1/auth/register", json={"email": f"{name}@example.com", "username": name, "password": "Test1234!"})
+    token = (await client.post("/api/v1/auth/login", data={"username": name, "password": "Test1234!"})).json()["access_token"]
+    start = datetime.utcnow() + timedelta(days=7)
+    for i in EVENT_IDS:
+        await client.post("/api/v1/events/", headers={"Authorization": f"Bearer {token}"}, json={
+            "title": f"Load test event {i}", "description": "load test", "location": "Main Hall",
+            "start_time": (start + timedelta(days=i)).isoformat(),
+            "end_time": (start + timedelta(days=i, hours=2)).isoformat(),
+            "capacity": 1000000, "category": "Tech",
+        })
+
+
+async def virtual_user(client: httpx.AsyncClient, recorder: Recorder, registrations: int, start_gate: asyncio.Event) -> None:
+    name = f"load{uuid.uuid4().hex[:12]}"
+    email, password = f"{name}@example.com", "Test1234!"
+    await start_gate.wait()
+
+    await recorder.call("register", client.post(
+        "/api/v1/auth/register", json={"email": email, "username": name, "password": password}
+    ))
+    response = await recorder.call("login", client.post(
+        "/api/v1/auth/login", data={"username": email, "password": password}
+    ))
+    if response is None or response.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    for _ in range(registrations):
+        await recorder.call("list events", client.get("/api/v1/events/?limit=20", headers=headers))
+        await recorder.call("register for event", client.post(
+            "/api/v1/registrations/", json={"event_id": random.choice(EVENT_IDS)}, headers=headers
+        ))
+
+
+async def run(args) -> None:
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=120) as client:
+        if args.create_events:
+            await create_events(client)
+
+        recorder = Recorder()
+        start_gate = asyncio.Event()
+        tasks = [
+            asyncio.create_task(virtual_user(client, recorder, args.registrations, start_gate))
+            for _ in range(args.users)
+        ]
+        start = time.perf_counter()
+        start_gate.set()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    print(recorder.report(elapsed).to_string())
+    print(f"\n{sum(len(v) for v in recorder.latencies.values()) / elapsed:.1f} requests/s over {elapsed:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=100, help="concurrent virtual users")
+    parser.add_argument("--registrations", type=int, default=10, help="event registrations per user")
+    parser.add_argument("--create-events", action="store_true", help="create the 10 events the scenario registers for")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Compare attendance model backends on synthetic data.
+
+Reports, per backend: training time, size on disk, load time (joblib mmap, as the
+model registry loads it), median scoring latency per batch size, and holdout AUC.
+
+    python -m benchmarks.attendance_models [--rows 50000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+
+from app.core.config import settings
+from app.ml.attendance_predictor import AttendancePredictor
+from app.ml.features import DAYS_OF_WEEK
+
+BACKENDS = ["random_forest", "hist_gradient_boosting", "logistic"]
+BATCH_SIZES = [1, 100, 10000]
+
+
+def synthetic_frame(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "day_of_week": rng.choice(DAYS_OF_WEEK, n),
+        "event_category": rng.choice(["Tech", "Sports", "Music", "Workshop", "uncategorized"], n),
+        "time_slot": rng.choice(["morning", "afternoon", "evening"], n),
+        "days_to_event": rng.integers(0, 60, n),
+        "user_past_attendance_rate": rng.beta(2, 2, n),
+        "event_popularity": rng.random(n) * 1.2,
+        "similar_events_attended": rng.poisson(1.5, n),
+    })
+    logit = (
+        3.0 * (df["user_past_attendance_rate"] - 0.5)
+        + 0.4 * np.minimum(df["similar_events_attended"], 4)
+        - 0.03 * df["days_to_event"]
+        + 0.8 * df["event_popularity"]
+        + np.where(df["time_slot"] == "evening", -0.5, 0.2)
+        + np.where(df["day_of_week"].isin(["Saturday", "Sunday"]), -0.7, 0.0)
+    )
+    df["attended"] = (rng.random(n) < 1 / (1 + np.exp(-logit))).astype(int)
+    return df
+
+
+def bench_backend(backend: str, train: pd.DataFrame, test: pd.DataFrame, workdir: str) -> dict:
+    settings.ATTENDANCE_MODEL_BACKEND = backend
+    predictor = AttendancePredictor()
+    predictor._create_basic_model()
+    features = predictor.categorical_features + predictor.numerical_features
+
+    start = time.perf_counter()
+    predictor.model.fit(train[features], train["attended"])
+    train_seconds = time.perf_counter() - start
+
+    path = os.path.join(workdir, f"{backend}.pkl")
+    joblib.dump(predictor.model, path)
+    start = time.perf_counter()
+    model = joblib.load(path, mmap_mode="r")
+    load_seconds = time.perf_counter() - start
+
+    X = test[features]
+    latencies = {}
+    for batch in BATCH_SIZES:
+        rows = X.iloc[:batch]
+        timings = []
+        for _ in range(max(3, min(50, 20000 // batch))):
+            start = time.perf_counter()
+            model.predict_proba(rows)
+            timings.append(time.perf_counter() - start)
+        latencies[batch] = float(np.median(timings))
+
+    return {
+        "backend": backend,
+        "train_s": train_seconds,
+        "size_kb": os.path.getsize(path) / 1024,
+        "load_ms": load_seconds * 1000,
+        **{f"batch_{b}_ms": latencies[b] * 1000 for b in BATCH_SIZES},
+        "auc": roc_auc_score(test["attended"], model.predict_proba(X)[:, 1]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000, help="training rows (holdout is 20%% of this)")
+    parser.add_argument("--backends", nargs="+", default=BACKENDS, choices=BACKENDS)
+    args = parser.parse_args()
+
+    train = synthetic_frame(args.rows, seed=0)
+    test = synthetic_frame(max(args.rows // 5, max(BATCH_SIZES)), seed=1)
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [bench_backend(backend, train, test, workdir) for backend in args.backends]
+
+    print(pd.DataFrame(results).set_index("backend").round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Burst load against the connection pool under different pool sizes.
+
+Each simulated request checks out a connection, runs a query and keeps the
+connection for --hold-ms (the time an endpoint spends between its first query and
+closing its session). Reports throughput, checkout wait and pool timeouts per
+size:overflow configuration, using the same engine options as the app.
+
+    python -m benchmarks.db_pool [--url postgresql://...] [--concurrency 40] [--pools 5:10 10:20]
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from sqlalchemy import create_engine, exc, text
+
+from app.core.config import settings
+from app.db.session import engine_options, pool_stats
+
+
+def run_burst(url: str, pool_size: int, max_overflow: int, concurrency: int, requests: int, hold_ms: float) -> dict:
+    settings.DB_POOL_SIZE = pool_size
+    settings.DB_MAX_OVERFLOW = max_overflow
+    engine = create_engine(url, **engine_options(url))
+
+    def one_request(_) -> bool:
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                time.sleep(hold_ms / 1000)
+            return True
+        except exc.TimeoutError:
+            return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        succeeded = sum(executor.map(one_request, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    stats = pool_stats(engine)
+    engine.dispose()
+    return {
+        "pool": f"{pool_size}:{max_overflow}",
+        "requests_per_s": succeeded / elapsed,
+        "wait_ms_avg": stats["wait_ms_avg"],
+        "wait_ms_max": stats["wait_ms_max"],
+        "timeouts": stats["timeouts"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="database URL (default: a temporary SQLite file)")
+    parser.add_argument("--concurrency", type=int, default=40, help="concurrent requests (the API threadpool has 40)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--hold-ms", type=float, default=20.0)
+    parser.add_argument("--pool-timeout", type=float, default=settings.DB_POOL_TIMEOUT_SECONDS)
+    parser.add_argument("--pools", nargs="+", default=["5:10", "10:20", "20:20"], help="size:overflow pairs")
+    args = parser.parse_args()
+
+    settings.DB_POOL_TIMEOUT_SECONDS = args.pool_timeout
+    with tempfile.TemporaryDirectory() as workdir:
+        url = args.url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        results = []
+        for pool in args.pools:
+            size, overflow = (int(n) for n in pool.split(":"))
+            results.append(run_burst(url, size, overflow, args.concurrency, args.requests, args.hold_ms))
+
+    print(pd.DataFrame(results).set_index("pool").round(2).to_string())
+
+
+if __name__ == "__main__":
+    main()
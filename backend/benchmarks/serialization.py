@@ -0,0 +1,127 @@
+"""
+Cost of producing one page of each list endpoint: the query plus serialization.
+
+Compares the response_model path (load ORM objects, validate them into the schema,
+dump and encode with the standard library, as FastAPI does) with the row path
+(select the schema's columns and zip the tuples into dicts) encoded with the
+standard library and with orjson.
+
+    python -m benchmarks.serialization [--url postgresql://...] [--page-size 100] [--repeat 200]
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+import pandas as pd
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.api.api_v1.endpoints.bug_reports import bug_report_rows
+from app.api.api_v1.endpoints.events import event_rows
+from app.api.api_v1.endpoints.registrations import registration_rows
+from app.api.api_v1.endpoints.users import user_rows
+from app.core.encoding import dumps
+from app.db.base import Base
+from app.db.models.bug_report import BugReport
+from app.db.models.event import Event
+from app.db.models.registration import Registration
+from app.db.models.user import User
+from app.schemas.bug_report import BugReport as BugReportSchema
+from app.schemas.event import EventWithAttendees
+from app.schemas.registration import Registration as RegistrationSchema
+from app.schemas.user import User as UserSchema
+
+ENDPOINTS = [
+    ("events", Event, EventWithAttendees, event_rows),
+    ("registrations", Registration, RegistrationSchema, registration_rows),
+    ("users", User, UserSchema, user_rows),
+    ("bug_reports", BugReport, BugReportSchema, bug_report_rows),
+]
+
+
+def seed(engine, rows: int) -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2025, 8, 15, 10)
+    with Session(engine) as db:
+        users = [User(username=f"user{i}", email=f"user{i}@example.com", password_hash="x") for i in range(rows)]
+        db.add_all(users)
+        db.flush()
+        events = [
+            Event(
+                title=f"Event {i}", description="A talk about something interesting. " * 15,
+                location="Main Hall", start_time=start + timedelta(hours=i), end_time=start + timedelta(hours=i + 2),
+                capacity=100, category="Tech", image_url=f"https://example.com/{i}.png", created_by=users[i].id,
+            )
+            for i in range(rows)
+        ]
+        db.add_all(events)
+        db.flush()
+        db.add_all([Registration(user_id=u.id, event_id=e.id) for u, e in zip(users, events)])
+        db.add_all([BugReport(title=f"Bug {i}", description="Steps to reproduce. " * 10, reported_by=users[i].id) for i in range(rows)])
+        db.commit()
+
+
+def response_model_page(db, model, schema, page_size: int) -> bytes:
+    adapter = TypeAdapter(List[schema])
+    objects = db.query(model).order_by(model.id).limit(page_size).all()
+    content = adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def row_page(db, model, serializer, page_size: int, use_orjson: bool) -> bytes:
+    rows = db.execute(select(*serializer.columns()).order_by(model.id).limit(page_size)).all()
+    return dumps(serializer.dump(rows), use_orjson=use_orjson)
+
+
+def median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="database URL (default: a temporary SQLite file)")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        url = args.url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        engine = create_engine(url)
+        seed(engine, args.page_size)
+        results = []
+        with Session(engine) as db:
+            for name, model, schema, serializer in ENDPOINTS:
+                # Same bytes either way, so the comparison is like for like
+                assert json.loads(response_model_page(db, model, schema, args.page_size)) == json.loads(
+                    row_page(db, model, serializer, args.page_size, use_orjson=True)
+                )
+                baseline = median_ms(lambda: response_model_page(db, model, schema, args.page_size), args.repeat)
+                rows_json = median_ms(lambda: row_page(db, model, serializer, args.page_size, False), args.repeat)
+                rows_orjson = median_ms(lambda: row_page(db, model, serializer, args.page_size, True), args.repeat)
+                results.append({
+                    "endpoint": name,
+                    "response_model_ms": baseline,
+                    "rows_json_ms": rows_json,
+                    "rows_orjson_ms": rows_orjson,
+                    "speedup": baseline / rows_orjson,
+                })
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+    print(pd.DataFrame(results).set_index("endpoint").round(2).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+from app.db.counters import reconcile_event_counters
+from app.db.session import SessionLocal
+from app.core.config import settings
+from sqlalchemy.engine import make_url
+print(f"Using database: {make_url(settings.DATABASE_URL).render_as_string(hide_password=True)}")
+
+def main():
+    db = SessionLocal()
+    try:
+        return reconcile_event_counters(db)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    fixed = main()
+    print(f"Reconciled counters for {fixed} events")
@@ -0,0 +1,25 @@
+"""
+Re-score upcoming events with the current attendance model. Run it from cron (e.g. hourly)
+or another scheduler rather than inside the API workers; concurrent runs against Postgres
+skip while one already holds the refresh lock.
+"""
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.ml.predictions import refresh_predictions_exclusively
+print(f"Using database: {make_url(settings.DATABASE_URL).render_as_string(hide_password=True)}")
+
+def main():
+    db = SessionLocal()
+    try:
+        return refresh_predictions_exclusively(db)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    stored = main()
+    if stored is None:
+        print("Another refresh is running, skipped")
+    else:
+        print(f"Stored {stored} attendance predictions")
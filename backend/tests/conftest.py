@@ -0,0 +1,220 @@
+# backend/tests/conftest.py
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("EMAIL_FROM", "noreply@example.com")
+os.environ.setdefault("QR_CODE_DIR", tempfile.mkdtemp(prefix="qrcodes-"))
+os.environ.setdefault("ML_MODEL_DIR", tempfile.mkdtemp(prefix="models-"))
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.api import deps
+from app.core.security import create_access_token
+from app.db.base import Base
+from app.db.models.event import Event
+from app.db.models.user import User
+from app.main import app
+from app.services.event_cache import event_cache
+from app.services.qr import shutdown_render_pool
+
+
+@pytest.fixture(scope="session", autouse=True)
+def qr_render_pool():
+    yield
+    shutdown_render_pool()
+
+
+@pytest.fixture(params=[
+    pytest.param("sqlite", id="sqlite"),
+    pytest.param(
+        "postgres", id="postgres",
+        marks=pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set"),
+    ),
+])
+def stand_in_engine(request):
+    """Runs a test on SQLite and, when TEST_POSTGRES_URL is set, on PostgreSQL"""
+    return request.param
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def engine(database_path):
+    """Fresh SQLite database file, shared by the sync and the async sessions"""
+    engine = create_engine(f"sqlite:///{database_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def async_engine(engine, database_path):
+    # No pooling: aiosqlite connections belong to the event loop of the client that opened them
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool)
+    yield async_engine
+    async_engine.sync_engine.dispose()
+
+
+@pytest.fixture
+def db(engine, async_engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    session = TestingSessionLocal()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[deps.get_db] = override_get_db
+    app.dependency_overrides[deps.get_async_db] = override_get_async_db
+    # Ids restart with every database, so cached users from a previous test must go
+    deps.token_cache.clear()
+    deps.user_cache.clear()
+    deps.recent_writers.clear()
+    event_cache.clear()
+    yield session
+    session.close()
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def client(db):
+    with TestClient(app) as client:
+        yield client
+
+
+def _create_user(db, username: str, is_admin: bool = False) -> User:
+    user = User(username=username, email=f"{username}@example.com", is_admin=is_admin)
+    user.set_password("password123")
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def admin_user(db):
+    return _create_user(db, "admin", is_admin=True)
+
+
+@pytest.fixture
+def normal_user(db):
+    return _create_user(db, "student")
+
+
+@pytest.fixture
+def create_events(db, admin_user):
+    """
+    Adds `count` events by the admin, one a day from `start`, and returns them:
+    create_events(count, offset=0, start=datetime(2025, 8, 15, 10), **fields).
+    `fields` override the Event columns of every event, e.g. description or capacity.
+    """
+    def create(count, offset=0, start=datetime(2025, 8, 15, 10), **fields):
+        events = [
+            Event(**{
+                "title": f"Event {i}", "description": "desc", "location": "Main Hall",
+                "capacity": 100, "category": "Tech", "created_by": admin_user.id,
+                "start_time": start + timedelta(days=i), "end_time": start + timedelta(days=i, hours=2),
+                **fields,
+            })
+            for i in range(offset, offset + count)
+        ]
+        db.add_all(events)
+        db.commit()
+        return events
+
+    return create
+
+
+@pytest.fixture
+def admin_token(admin_user):
+    return {"Authorization": f"Bearer {create_access_token(admin_user.id)}"}
+
+
+@pytest.fixture
+def user_token(normal_user):
+    return {"Authorization": f"Bearer {create_access_token(normal_user.id)}"}
+
+
+@pytest.fixture
+def count_queries(engine, async_engine):
+    """Record every SQL statement sent to the database, through either engine, while the fixture is active"""
+    from sqlalchemy import event
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for target in (engine, async_engine.sync_engine):
+        event.listen(target, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    for target in (engine, async_engine.sync_engine):
+        event.remove(target, "before_cursor_execute", before_cursor_execute)
+
+
+class _StandInRedis:
+    """Just enough of the redis-py client API for RedisCacheBackend"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def scan_iter(self, pattern):
+        return [key for key in list(self.data) if key.startswith(pattern.rstrip("*"))]
+
+
+@pytest.fixture
+def stand_in_redis():
+    """An in-memory stand-in for a Redis server shared by several workers"""
+    return _StandInRedis()
+
+
+@pytest.fixture
+def training_frame():
+    """Random attendance training rows: training_frame(n=200, seed=0)"""
+    def build(n=200, seed=0):
+        rng = np.random.default_rng(seed)
+        return pd.DataFrame({
+            "day_of_week": rng.choice(["Monday", "Friday"], n),
+            "event_category": rng.choice(["Tech", "Music"], n),
+            "time_slot": rng.choice(["morning", "evening"], n),
+            "days_to_event": rng.integers(0, 30, n),
+            "user_past_attendance_rate": rng.random(n),
+            "event_popularity": rng.random(n),
+            "similar_events_attended": rng.integers(0, 5, n),
+            "attended": rng.integers(0, 2, n),
+        })
+
+    return build
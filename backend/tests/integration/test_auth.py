@@ -0,0 +1,126 @@
+# backend/tests/integration/test_auth.py
+from datetime import timedelta
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app.core.config import settings
+from app.core.security import create_access_token, pwd_context
+from app.db.models.user import User
+
+
+def test_repeated_requests_skip_user_lookup(client, user_token, count_queries):
+    assert client.get("/api/v1/users/me", headers=user_token).status_code == 200
+    count_queries.clear()
+
+    response = client.get("/api/v1/users/me", headers=user_token)
+    assert response.status_code == 200
+    assert response.json()["username"] == "student"
+    assert count_queries == []
+
+
+def test_updating_user_invalidates_cached_snapshot(client, admin_token, normal_user, user_token):
+    assert client.get("/api/v1/users/", headers=user_token).status_code == 403
+
+    response = client.put(f"/api/v1/users/{normal_user.id}", json={"is_admin": True}, headers=admin_token)
+    assert response.status_code == 200
+
+    assert client.get("/api/v1/users/me", headers=user_token).json()["is_admin"] is True
+    assert client.get("/api/v1/users/", headers=user_token).status_code == 200
+
+
+def test_updating_user_rejects_taken_email_and_null_flags(client, db, admin_user, admin_token, normal_user):
+    url = f"/api/v1/users/{normal_user.id}"
+    response = client.put(url, json={"email": admin_user.email}, headers=admin_token)
+    assert response.status_code == 400
+    assert "email" in response.json()["detail"]
+    response = client.put(url, json={"username": admin_user.username}, headers=admin_token)
+    assert response.status_code == 400
+    assert "username" in response.json()["detail"]
+
+    assert client.put(url, json={"is_admin": None}, headers=admin_token).status_code == 422
+    db.refresh(normal_user)
+    assert (normal_user.email, normal_user.username, normal_user.is_admin) == ("student@example.com", "student", False)
+
+
+def test_expired_token_is_rejected(client, normal_user):
+    token = create_access_token(normal_user.id, expires_delta=timedelta(seconds=-1))
+    response = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 403
+
+
+def test_metrics_expose_auth_cache_hit_rate(client, admin_token):
+    for _ in range(3):
+        client.get("/api/v1/users/me", headers=admin_token)
+
+    metrics = client.get("/api/v1/metrics/", headers=admin_token).json()["auth_cache"]
+    assert metrics["tokens"]["hits"] >= 3
+    assert 0 < metrics["users"]["hit_rate"] <= 1
+
+
+def test_login_upgrades_legacy_password_hash(client, db, normal_user):
+    normal_user.password_hash = generate_password_hash("password123")
+    db.commit()
+
+    response = client.post("/api/v1/auth/login", data={"username": "student", "password": "password123"})
+    assert response.status_code == 200
+
+    db.refresh(normal_user)
+    assert pwd_context.identify(normal_user.password_hash) == settings.PASSWORD_HASH_SCHEME
+    response = client.post("/api/v1/auth/login", data={"username": "student", "password": "password123"})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("login", ["student", "student@example.com", "STUDENT", "Student@Example.com"])
+def test_login_by_username_or_email_uses_one_query(client, normal_user, count_queries, login):
+    count_queries.clear()
+    response = client.post("/api/v1/auth/login", data={"username": login, "password": "password123"})
+
+    assert response.status_code == 200
+    assert len([q for q in count_queries if q.lstrip().upper().startswith("SELECT")]) == 1
+
+
+def test_logins_differing_only_in_case_reach_their_own_accounts(client, db):
+    for username, password in (("Bob", "upper-pass"), ("bob", "lower-pass")):
+        user = User(username=username, email=f"{username}@example.org")
+        user.set_password(password)
+        db.add(user)
+    db.commit()
+
+    for login, password, username in (
+        ("Bob", "upper-pass", "Bob"),
+        ("bob", "lower-pass", "bob"),
+        ("BOB", "lower-pass", "bob"),
+    ):
+        response = client.post("/api/v1/auth/login", data={"username": login, "password": password})
+        assert response.status_code == 200, login
+        token = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        assert client.get("/api/v1/users/me", headers=token).json()["username"] == username
+
+    response = client.post("/api/v1/auth/login", data={"username": "bob", "password": "wrong"})
+    assert response.status_code == 400
+
+
+def test_login_rejects_wrong_password(client, normal_user):
+    response = client.post("/api/v1/auth/login", data={"username": "student", "password": "nope"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("payload, field", [
+    ({"username": "someone", "email": "student@example.com"}, "email"),
+    ({"username": "student", "email": "someone@example.com"}, "username"),
+])
+def test_register_rejects_duplicates(client, normal_user, payload, field):
+    response = client.post("/api/v1/auth/register", json={**payload, "password": "password123"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"The user with this {field} already exists in the system."
+
+
+def test_register_creates_user(client, db):
+    response = client.post(
+        "/api/v1/auth/register",
+        json={"username": "newbie", "email": "newbie@example.com", "password": "password123"},
+    )
+    assert response.status_code == 200
+    assert response.json()["username"] == "newbie"
@@ -0,0 +1,111 @@
+# backend/tests/integration/test_event_cache.py
+from datetime import datetime
+
+from app.db.counters import reconcile_event_counters
+from app.db.models.event import Event
+from app.db.models.registration import Registration
+
+
+def _event(db, creator, title="Talk"):
+    event = Event(
+        title=title, description="desc", location="Main Hall",
+        start_time=datetime(2025, 8, 15, 10), end_time=datetime(2025, 8, 15, 12),
+        capacity=100, category="Tech", created_by=creator.id,
+    )
+    db.add(event)
+    db.commit()
+    return event
+
+
+def _event_queries(statements):
+    return [s for s in statements if "FROM event" in s]
+
+
+def test_event_list_and_detail_are_served_from_cache(client, db, admin_user, user_token, count_queries):
+    event = _event(db, admin_user)
+
+    for url in ("/api/v1/events/", f"/api/v1/events/{event.id}"):
+        first = client.get(url, headers=user_token)
+        count_queries.clear()
+        second = client.get(url, headers=user_token)
+
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert second.headers["etag"] == first.headers["etag"]
+        assert _event_queries(count_queries) == []
+
+
+def test_if_none_match_returns_304_without_body(client, db, admin_user, user_token):
+    event = _event(db, admin_user)
+
+    for url in ("/api/v1/events/", f"/api/v1/events/{event.id}"):
+        etag = client.get(url, headers=user_token).headers["etag"]
+        response = client.get(url, headers={**user_token, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        response = client.get(url, headers={**user_token, "If-None-Match": '"stale"'})
+        assert response.status_code == 200
+
+
+def test_event_writes_invalidate_cached_responses(client, db, admin_user, admin_token, user_token):
+    event = _event(db, admin_user)
+    detail = f"/api/v1/events/{event.id}"
+    list_etag = client.get("/api/v1/events/", headers=user_token).headers["etag"]
+    detail_etag = client.get(detail, headers=user_token).headers["etag"]
+
+    assert client.put(detail, json={"title": "Renamed"}, headers=admin_token).status_code == 200
+    assert client.get(detail, headers=user_token).json()["title"] == "Renamed"
+    response = client.get("/api/v1/events/", headers={**user_token, "If-None-Match": list_etag})
+    assert response.status_code == 200
+    assert [e["title"] for e in response.json()] == ["Renamed"]
+    assert client.get(detail, headers={**user_token, "If-None-Match": detail_etag}).status_code == 200
+
+    assert client.delete(detail, headers=admin_token).status_code == 204
+    assert client.get(detail, headers=user_token).status_code == 404
+    assert client.get("/api/v1/events/", headers=user_token).json() == []
+
+
+def test_counter_changes_invalidate_cached_responses(client, db, admin_user, normal_user, admin_token, user_token):
+    event, other = _event(db, admin_user), _event(db, admin_user, "Other")
+    detail = f"/api/v1/events/{event.id}"
+    other_etag = client.get(f"/api/v1/events/{other.id}", headers=admin_token).headers["etag"]
+    assert client.get(detail, headers=admin_token).json()["registered_count"] == 0
+
+    response = client.post("/api/v1/registrations/", json={"event_id": event.id}, headers=user_token)
+    registration = response.json()
+    assert client.get(detail, headers=admin_token).json()["registered_count"] == 1
+    assert client.get("/api/v1/events/", headers=admin_token).json()[0]["registered_count"] == 1
+
+    client.post(
+        f"/api/v1/registrations/{registration['id']}/check-in",
+        params={"unique_code": registration["unique_code"]},
+        headers=admin_token,
+    )
+    assert client.get(detail, headers=admin_token).json()["checked_in_count"] == 1
+
+    # Other events keep their cached detail
+    response = client.get(f"/api/v1/events/{other.id}", headers={**admin_token, "If-None-Match": other_etag})
+    assert response.status_code == 304
+
+    db.add(Registration(user_id=admin_user.id, event_id=other.id))
+    db.commit()
+    assert reconcile_event_counters(db) == 1
+    assert client.get(f"/api/v1/events/{other.id}", headers=admin_token).json()["registered_count"] == 1
+
+
+def test_writer_bypasses_cached_list(client, db, admin_user, admin_token):
+    _event(db, admin_user)
+    client.get("/api/v1/events/", headers=admin_token)
+
+    response = client.post(
+        "/api/v1/events/",
+        json={
+            "title": "New", "description": "d", "location": "Hall", "capacity": 10, "category": "Tech",
+            "start_time": "2025-09-01T10:00:00", "end_time": "2025-09-01T12:00:00",
+        },
+        headers=admin_token,
+    )
+    assert response.status_code == 200
+    assert [e["title"] for e in client.get("/api/v1/events/", headers=admin_token).json()] == ["Talk", "New"]
@@ -0,0 +1,106 @@
+# backend/tests/integration/test_event_filters.py
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+from app.db.models.event import Event
+
+
+def _create_catalogue(create_events):
+    now = datetime.utcnow().replace(microsecond=0)
+    rows = [
+        ("Intro to Machine Learning", "Hands-on workshop on neural networks", "Lab 1", "Tech", -2),
+        ("Jazz Night", "Live music in the courtyard", "Main Courtyard", "Music", -1),
+        ("Robotics Workshop", "Build and program a line-following robot", "Lab 2", "Tech", 1),
+        ("Career Fair", "Meet recruiters from 40 companies", "Main Hall", "Career", 2),
+        ("Machine Learning Reading Group", None, "Library 100%", "Tech", 3),
+    ]
+    for title, description, location, category, days in rows:
+        create_events(
+            1, start=now + timedelta(days=days),
+            title=title, description=description, location=location, category=category,
+        )
+    return now
+
+
+def _titles(client, headers, query):
+    response = client.get(f"/api/v1/events/?{query}", headers=headers)
+    assert response.status_code == 200, response.json()
+    return [e["title"] for e in response.json()]
+
+
+def test_filter_by_start_time_range_and_upcoming(client, db, admin_user, user_token, create_events):
+    now = _create_catalogue(create_events)
+    start_after = (now - timedelta(days=1)).isoformat()
+    start_before = (now + timedelta(days=2)).isoformat()
+
+    assert _titles(client, user_token, f"start_after={start_after}&start_before={start_before}") == [
+        "Jazz Night", "Robotics Workshop",
+    ]
+    assert _titles(client, user_token, "upcoming=true") == [
+        "Robotics Workshop", "Career Fair", "Machine Learning Reading Group",
+    ]
+    # Timezone-aware bounds are compared in UTC
+    aware = (now + timedelta(days=2, hours=5)).isoformat() + "+05:00"
+    assert _titles(client, user_token, urlencode({"start_after": aware, "category": "Career"})) == ["Career Fair"]
+
+
+def test_filter_by_location_substring(client, db, admin_user, user_token, create_events):
+    _create_catalogue(create_events)
+
+    assert _titles(client, user_token, "location=main") == ["Jazz Night", "Career Fair"]
+    assert _titles(client, user_token, "location=lab&category=Tech") == ["Intro to Machine Learning", "Robotics Workshop"]
+    # LIKE wildcards in the value are matched literally
+    assert _titles(client, user_token, "location=100%25") == ["Machine Learning Reading Group"]
+    assert _titles(client, user_token, "location=_") == []
+
+
+def test_keyword_search(client, db, admin_user, admin_token, user_token, create_events):
+    _create_catalogue(create_events)
+
+    assert _titles(client, user_token, "q=machine learning") == [
+        "Intro to Machine Learning", "Machine Learning Reading Group",
+    ]
+    # Every word must match, in the title or the description, with stemming
+    assert _titles(client, user_token, "q=workshops") == ["Intro to Machine Learning", "Robotics Workshop"]
+    assert _titles(client, user_token, "q=robot workshop") == ["Robotics Workshop"]
+    assert _titles(client, user_token, 'q="recruiters" (companies') == ["Career Fair"]
+    # Punctuation is ignored rather than parsed as query syntax
+    assert len(_titles(client, user_token, "q=!!!")) == 5
+
+    event = db.query(Event).filter(Event.title == "Jazz Night").one()
+    client.put(f"/api/v1/events/{event.id}", json={"description": "Swing and bebop"}, headers=admin_token)
+    assert _titles(client, user_token, "q=bebop") == ["Jazz Night"]
+    assert _titles(client, user_token, "q=courtyard") == []
+    client.delete(f"/api/v1/events/{event.id}", headers=admin_token)
+    assert _titles(client, user_token, "q=bebop") == []
+
+
+def test_sort_by_start_time_pages_by_cursor(client, db, admin_user, user_token, create_events):
+    _create_catalogue(create_events)
+    # Same start time as an existing event: the id breaks the tie
+    twin = db.query(Event).filter(Event.title == "Jazz Night").one()
+    db.add(Event(title="Jazz Jam", start_time=twin.start_time, end_time=twin.end_time, created_by=admin_user.id))
+    db.commit()
+
+    expected = [
+        "Intro to Machine Learning", "Jazz Night", "Jazz Jam", "Robotics Workshop",
+        "Career Fair", "Machine Learning Reading Group",
+    ]
+    for sort, order in (("start_time", expected), ("-start_time", expected[::-1])):
+        seen, cursor = [], None
+        while True:
+            query = f"sort={sort}&limit=4" + (f"&after={cursor}" if cursor else "")
+            response = client.get(f"/api/v1/events/?{query}", headers=user_token)
+            seen += [e["title"] for e in response.json()]
+            cursor = response.headers.get("x-next-cursor")
+            if cursor is None:
+                break
+        assert seen == order
+
+        response = client.get(f"/api/v1/events/?sort={sort}&limit=2&skip=2", headers=user_token)
+        back = client.get(
+            f"/api/v1/events/?sort={sort}&limit=2&before={response.headers['x-prev-cursor']}", headers=user_token
+        )
+        assert [e["title"] for e in back.json()] == order[:2]
+
+    assert client.get("/api/v1/events/?sort=title", headers=user_token).status_code == 422
@@ -0,0 +1,130 @@
+# backend/tests/integration/test_events.py
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.db import counters
+from app.db.counters import reconcile_event_counters
+from app.db.models.event import Event
+from app.db.models.registration import Registration
+
+
+def test_list_events_query_count_is_independent_of_page_size(client, db, admin_user, user_token, count_queries, create_events):
+    """Listing events must not issue one registration count query per event"""
+    events = create_events(30)
+    db.add_all([Registration(user_id=admin_user.id, event_id=event.id) for event in events[:10]])
+    db.commit()
+    reconcile_event_counters(db)
+
+    client.get("/api/v1/users/me", headers=user_token)
+    counts = []
+    for limit in (1, 5, 30):
+        count_queries.clear()
+        response = client.get(f"/api/v1/events/?limit={limit}", headers=user_token)
+        assert response.status_code == 200
+        assert len(response.json()) == limit
+        counts.append(len(count_queries))
+
+    assert counts[0] == counts[1] == counts[2]
+
+    body = client.get("/api/v1/events/?limit=30", headers=user_token).json()
+    assert [e["registered_count"] for e in body] == [1] * 10 + [0] * 20
+
+
+def test_get_event_includes_registered_count(client, db, admin_user, normal_user, user_token, create_events):
+    event = create_events(1)[0]
+    db.add_all([
+        Registration(user_id=admin_user.id, event_id=event.id),
+        Registration(user_id=normal_user.id, event_id=event.id),
+    ])
+    db.commit()
+    reconcile_event_counters(db)
+
+    response = client.get(f"/api/v1/events/{event.id}", headers=user_token)
+    assert response.status_code == 200
+    assert response.json()["registered_count"] == 2
+
+    assert client.get("/api/v1/events/9999", headers=user_token).status_code == 404
+
+
+def test_registration_and_check_in_maintain_event_counters(client, db, admin_user, admin_token, user_token, create_events):
+    event = create_events(1)[0]
+
+    response = client.post("/api/v1/registrations/", json={"event_id": event.id}, headers=user_token)
+    assert response.status_code == 200
+    registration = response.json()
+
+    response = client.post(
+        f"/api/v1/registrations/{registration['id']}/check-in",
+        params={"unique_code": registration["unique_code"]},
+        headers=admin_token,
+    )
+    assert response.status_code == 200
+
+    body = client.get(f"/api/v1/events/{event.id}", headers=user_token).json()
+    assert body["registered_count"] == 1
+    assert body["checked_in_count"] == 1
+    assert reconcile_event_counters(db) == 0
+
+
+def test_reconcile_event_counters_fixes_drift(db, admin_user, normal_user, create_events):
+    drifted, untouched = create_events(2)
+    db.add(Registration(user_id=normal_user.id, event_id=drifted.id))
+    drifted.checked_in_count = 7
+    db.commit()
+
+    assert reconcile_event_counters(db) == 1
+    db.refresh(drifted)
+    db.refresh(untouched)
+    assert (drifted.registered_count, drifted.checked_in_count) == (1, 0)
+    assert (untouched.registered_count, untouched.checked_in_count) == (0, 0)
+
+
+def test_reconcile_keeps_registrations_committed_while_it_runs(db, engine, admin_user, normal_user, create_events, monkeypatch):
+    event = create_events(1)[0]
+    event.checked_in_count = 3
+    db.commit()
+
+    find_drift = counters._drifted
+
+    def register_meanwhile(rows, actual):
+        drifted = find_drift(rows, actual)
+        if not register_meanwhile.done:
+            # Another worker registers between the unlocked pass and the write
+            register_meanwhile.done = True
+            with Session(engine) as other:
+                other.add(Registration(user_id=normal_user.id, event_id=event.id))
+                other.execute(update(Event).where(Event.id == event.id).values(registered_count=Event.registered_count + 1))
+                other.commit()
+        return drifted
+
+    register_meanwhile.done = False
+    monkeypatch.setattr(counters, "_drifted", register_meanwhile)
+
+    assert counters.reconcile_event_counters(db) == 1
+    db.refresh(event)
+    assert (event.registered_count, event.checked_in_count) == (1, 0)
+
+
+def test_sparse_fields_project_columns_in_sql(client, db, admin_user, user_token, count_queries, create_events):
+    create_events(5)
+    full = client.get("/api/v1/events/?sort=start_time", headers=user_token).json()
+
+    count_queries.clear()
+    response = client.get("/api/v1/events/?sort=start_time&limit=3&fields=title, registered_count", headers=user_token)
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": e["id"], "title": e["title"], "registered_count": e["registered_count"]} for e in full[:3]
+    ]
+    statement = next(s for s in count_queries if "FROM event" in s)
+    assert "description" not in statement and "image_url" not in statement
+
+    # The cursor comes from start_time, which is read but not returned
+    cursor = response.headers["x-next-cursor"]
+    response = client.get(f"/api/v1/events/?sort=start_time&fields=start_time&after={cursor}", headers=user_token)
+    assert response.json() == [{"id": e["id"], "start_time": e["start_time"]} for e in full[3:]]
+
+
+def test_unknown_sparse_field_is_rejected(client, db, admin_user, user_token):
+    response = client.get("/api/v1/events/?fields=title,password_hash", headers=user_token)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: password_hash"
@@ -0,0 +1,109 @@
+# backend/tests/integration/test_http_caching.py
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.http_cache import CachedStaticFiles
+from app.db.models.event import Event
+from app.db.models.registration import Registration
+
+LONG_DESCRIPTION = "A long description of the event. " * 5
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br"])
+def test_large_json_responses_are_compressed(client, db, admin_user, user_token, encoding, create_events):
+    if encoding == "br":
+        pytest.importorskip("brotli")
+    create_events(20, description=LONG_DESCRIPTION)
+    plain = client.get("/api/v1/events/", headers={**user_token, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    response = client.get("/api/v1/events/", headers={**user_token, "Accept-Encoding": encoding})
+    assert response.headers["content-encoding"] == encoding
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(plain.content) / 4
+    assert response.json() == plain.json()
+
+    # The strong ETag of the cached page is weakened on the compressed variant and still revalidates
+    assert response.headers["etag"] == "W/" + plain.headers["etag"]
+    response = client.get(
+        "/api/v1/events/", headers={**user_token, "Accept-Encoding": encoding, "If-None-Match": response.headers["etag"]}
+    )
+    assert response.status_code == 304
+
+
+def test_small_and_binary_responses_are_not_compressed(client, db, admin_user, normal_user, user_token, create_events):
+    create_events(1, description=LONG_DESCRIPTION)
+    response = client.get("/api/v1/users/me", headers={**user_token, "Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+    registration = Registration(user_id=normal_user.id, event_id=db.query(Event).first().id)
+    db.add(registration)
+    db.commit()
+    response = client.get(f"/api/v1/registrations/{registration.id}/qr", headers={**user_token, "Accept-Encoding": "gzip"})
+    assert response.headers["content-type"] == "image/png"
+    assert "content-encoding" not in response.headers
+
+
+def test_get_responses_without_validator_get_an_etag(client, db, admin_user, normal_user, user_token, create_events):
+    create_events(2, description=LONG_DESCRIPTION)
+    db.add(Registration(user_id=normal_user.id, event_id=db.query(Event).first().id))
+    db.commit()
+
+    response = client.get("/api/v1/registrations/", headers=user_token)
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    response = client.get("/api/v1/registrations/", headers={**user_token, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # A new registration changes the body and so the ETag
+    client.post("/api/v1/registrations/", json={"event_id": db.query(Event).all()[1].id}, headers=user_token)
+    response = client.get("/api/v1/registrations/", headers={**user_token, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+
+def test_cors_preflight_is_cacheable(client):
+    origin = settings.BACKEND_CORS_ORIGINS[0]
+    response = client.options(
+        "/api/v1/events/",
+        headers={"Origin": origin, "Access-Control-Request-Method": "POST", "Access-Control-Request-Headers": "authorization"},
+    )
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == origin
+    assert response.headers["access-control-max-age"] == str(settings.CORS_MAX_AGE_SECONDS)
+
+    # Plain OPTIONS reaches the handler, which only names allowed origins
+    response = client.options("/api/v1/events/", headers={"Origin": "https://evil.example.com"})
+    assert response.status_code == 200
+    assert response.headers["access-control-max-age"] == str(settings.CORS_MAX_AGE_SECONDS)
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_static_files_are_cacheable(tmp_path):
+    (tmp_path / "qrcodes").mkdir()
+    (tmp_path / "qrcodes" / "qr.png").write_bytes(b"\x89PNG" + b"\0" * 100)
+    (tmp_path / "index.html").write_text("<script src='/static/assets/index-FGz7mhFT.js'></script>")
+    app = FastAPI()
+    app.mount(
+        "/static",
+        CachedStaticFiles(directory=tmp_path, cache_control="private, max-age=60", long_lived=r"qrcodes/.+"),
+    )
+
+    with TestClient(app) as client:
+        response = client.get("/static/qrcodes/qr.png")
+        assert response.headers["cache-control"] == "private, max-age=60"
+        response = client.get("/static/qrcodes/qr.png", headers={"If-None-Match": response.headers["etag"]})
+        assert response.status_code == 304
+        assert response.headers["cache-control"] == "private, max-age=60"
+
+        # The unhashed entry page must be revalidated, or a deploy would point at missing assets
+        response = client.get("/static/index.html")
+        assert response.headers["cache-control"] == "no-cache"
+        response = client.get("/static/index.html", headers={"If-None-Match": response.headers["etag"]})
+        assert response.status_code == 304
+        assert response.headers["cache-control"] == "no-cache"
@@ -0,0 +1,56 @@
+# backend/tests/integration/test_list_serialization.py
+from datetime import datetime
+
+import pytest
+
+from app.core import encoding
+from app.db.models.bug_report import BugReport
+from app.db.models.event import Event
+from app.db.models.registration import Registration
+from app.db.models.user import User
+from app.schemas.bug_report import BugReport as BugReportSchema
+from app.schemas.event import EventWithAttendees
+from app.schemas.registration import Registration as RegistrationSchema
+from app.schemas.user import User as UserSchema
+
+
+@pytest.fixture(params=["json", "orjson"])
+def json_encoder(request, monkeypatch):
+    monkeypatch.setattr(encoding, "USE_ORJSON", request.param == "orjson")
+    return request.param
+
+
+def test_list_endpoints_match_the_pydantic_serialization(client, db, admin_user, admin_token, json_encoder):
+    events = [
+        Event(
+            title="Café night ☕", description=None, location="Hall", capacity=None,
+            start_time=datetime(2025, 8, 15, 18, 30, 0, 250000), end_time=datetime(2025, 8, 15, 22),
+            created_by=admin_user.id,
+        ),
+        Event(title="Talk", start_time=datetime(2025, 8, 16, 10), end_time=datetime(2025, 8, 16, 12), created_by=admin_user.id),
+    ]
+    db.add_all(events)
+    db.commit()
+    db.add_all([Registration(user_id=admin_user.id, event_id=e.id, check_in_time=datetime(2025, 8, 15, 18, 45)) for e in events[:1]])
+    db.add(BugReport(title="Broken", description="QR code \"missing\"", reported_by=admin_user.id))
+    db.commit()
+
+    for url, model, schema in (
+        ("/api/v1/events/", Event, EventWithAttendees),
+        ("/api/v1/registrations/", Registration, RegistrationSchema),
+        ("/api/v1/users/", User, UserSchema),
+        ("/api/v1/bugs/", BugReport, BugReportSchema),
+    ):
+        response = client.get(url, headers=admin_token)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        expected = [
+            schema.model_validate(obj, from_attributes=True).model_dump(mode="json")
+            for obj in db.query(model).order_by(model.id)
+        ]
+        assert response.json() == expected, url
+
+
+def test_encoders_produce_identical_bytes():
+    rows = [{"id": 1, "title": "Ünïcode \"quoted\"", "start_time": datetime(2025, 8, 15, 10, 0, 0, 1), "capacity": None}]
+    assert encoding.dumps(rows, use_orjson=False) == encoding.dumps(rows, use_orjson=True)
@@ -0,0 +1,162 @@
+# backend/tests/integration/test_migrations.py
+import os
+import warnings
+from datetime import datetime, timedelta
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.init_db import alembic_config, run_migrations
+from app.db.search import is_search_table, keyword_condition
+from app.db.models.bug_report import BugReport
+from app.db.models.event import Event
+from app.db.models.registration import Registration
+
+
+def _drop_everything(engine):
+    Base.metadata.drop_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+
+@pytest.fixture
+def empty_engine(stand_in_engine, tmp_path):
+    if stand_in_engine == "sqlite":
+        engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    else:
+        engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    _drop_everything(engine)
+    yield engine
+    _drop_everything(engine)
+    engine.dispose()
+
+
+def _upgrade_to(engine, revision):
+    config = alembic_config()
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+
+
+def test_migrations_produce_the_model_schema(empty_engine):
+    run_migrations(empty_engine)
+
+    with empty_engine.connect() as connection, warnings.catch_warnings():
+        # SQLite cannot reflect the lower() expression indexes, alembic warns and skips them
+        warnings.simplefilter("ignore", UserWarning)
+        context = MigrationContext.configure(
+            connection,
+            opts={"include_name": lambda name, type_, _: not (type_ == "table" and is_search_table(name))},
+        )
+        diff = compare_metadata(context, Base.metadata)
+    assert diff == []
+
+
+def test_database_created_before_migrations_is_adopted(empty_engine):
+    # A database built by the old create_all: the initial schema without alembic_version
+    _upgrade_to(empty_engine, "0001")
+    with empty_engine.begin() as connection:
+        connection.execute(text("DROP TABLE alembic_version"))
+        connection.execute(text(
+            "INSERT INTO \"user\" (id, username, email, password_hash) VALUES (1, 'u', 'u@example.com', 'x')"
+        ))
+        connection.execute(text(
+            "INSERT INTO event (id, title, start_time, end_time) "
+            "VALUES (1, 'Talk', '2025-08-15 10:00:00', '2025-08-15 12:00:00')"
+        ))
+        connection.execute(text(
+            "INSERT INTO registration (id, user_id, event_id, unique_code, check_in_time) "
+            "VALUES (1, 1, 1, 'a', NULL), (2, 1, 1, 'b', '2025-08-15 10:05:00'), (3, 1, 1, 'c', NULL)"
+        ))
+
+    run_migrations(empty_engine)
+
+    with Session(empty_engine) as db:
+        # Of the duplicates, the checked-in registration is the one kept
+        assert [r.id for r in db.query(Registration)] == [2]
+        event = db.get(Event, 1)
+        assert (event.registered_count, event.checked_in_count) == (1, 1)
+        # Events that existed before the search migration are searchable
+        dialect = empty_engine.dialect.name
+        assert db.query(Event.id).filter(keyword_condition(dialect, Event, "talk")).all() == [(1,)]
+    assert "ix_registration_event_id_check_in_time" in {
+        index["name"] for index in inspect(empty_engine).get_indexes("registration")
+    }
+
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _explain(connection, query):
+    sql = str(query.statement.compile(connection, compile_kwargs={"literal_binds": True}))
+    plan = connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()[0]["Plan"]
+    return list(_plan_nodes(plan))
+
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set")
+def test_hot_queries_use_index_scans_on_postgres():
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    _drop_everything(engine)
+    try:
+        run_migrations(engine)
+        with engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO \"user\" (id, username, email, password_hash) "
+                "SELECT i, 'user' || i, 'user' || i || '@example.com', 'x' FROM generate_series(1, 2000) i"
+            ))
+            connection.execute(text(
+                "INSERT INTO event (id, title, start_time, end_time, category, created_by) "
+                "SELECT i, 'Event ' || i, timestamp '2025-01-01' + i * interval '6 hours', "
+                "timestamp '2025-01-01' + i * interval '6 hours' + interval '2 hours', "
+                "'Category ' || i % 50, "
+                "i % 2000 + 1 FROM generate_series(1, 5000) i"
+            ))
+            connection.execute(text(
+                "INSERT INTO registration (user_id, event_id, registration_date, check_in_time, unique_code) "
+                "SELECT i % 2000 + 1, i / 20 + 1, timestamp '2025-01-01' + i * interval '1 minute', "
+                "CASE WHEN i % 3 = 0 THEN timestamp '2025-02-01' END, md5(i::text) FROM generate_series(0, 99999) i"
+            ))
+            connection.execute(text(
+                "INSERT INTO bugreport (title, description, reported_by) "
+                "SELECT 'Bug ' || i, 'desc', i % 2000 + 1 FROM generate_series(1, 50000) i"
+            ))
+            connection.execute(text("ANALYZE"))
+
+        now = datetime(2026, 1, 1)
+        with engine.connect() as connection:
+            # Cost the plans for SSD storage rather than the spinning-disk default of 4
+            connection.execute(text("SET random_page_cost = 1.1"))
+            db = Session(bind=connection)
+            hot_queries = {
+                "ix_registration_event_id_check_in_time": db.query(Registration).filter(
+                    Registration.event_id == 42, Registration.check_in_time.isnot(None)
+                ),
+                "ix_registration_user_id_registration_date": db.query(Registration).filter(
+                    Registration.user_id == 7, Registration.registration_date < now
+                ).order_by(Registration.registration_date.desc()).limit(20),
+                "ix_event_category_start_time": db.query(Event).filter(
+                    Event.category == "Category 7"
+                ).order_by(Event.start_time).limit(20),
+                "ix_event_start_time": db.query(Event).filter(
+                    Event.start_time > now, Event.start_time <= now + timedelta(days=14)
+                ),
+                "ix_event_created_by": db.query(Event).filter(Event.created_by == 7),
+                "ix_bugreport_reported_by": db.query(BugReport).filter(BugReport.reported_by == 7),
+                "ix_event_search": db.query(Event).filter(keyword_condition("postgresql", Event, "event 4242")),
+            }
+            for index_name, query in hot_queries.items():
+                nodes = _explain(connection, query)
+                assert not [n for n in nodes if n["Node Type"] == "Seq Scan"], (index_name, nodes)
+                assert index_name in {n.get("Index Name") for n in nodes}, (index_name, nodes)
+            db.close()
+    finally:
+        _drop_everything(engine)
+        engine.dispose()
@@ -0,0 +1,240 @@
+# backend/tests/integration/test_ml_features.py
+import random
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from app.db.models.event import Event
+from app.db.models.registration import Registration
+from app.db.models.user import User
+from app.ml.features import FEATURE_COLUMNS, build_prediction_features, build_training_set
+
+
+def _reference_features(db, event, users):
+    """The original per-user loop from predict_attendance, kept as the parity oracle"""
+    rows = []
+    for user in users:
+        day_of_week = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"][event.start_time.weekday()]
+        hour = event.start_time.hour
+        if hour < 12:
+            time_slot = "morning"
+        elif hour < 17:
+            time_slot = "afternoon"
+        else:
+            time_slot = "evening"
+        days_to_event = (event.start_time.date() - pd.Timestamp.now(tz='UTC').date()).days
+        user_registrations = db.query(Registration).filter(Registration.user_id == user.id).all()
+        attended_count = sum(1 for reg in user_registrations if reg.check_in_time is not None)
+        user_past_attendance_rate = attended_count / len(user_registrations) if user_registrations else 0
+        event_registrations = db.query(Registration).filter(Registration.event_id == event.id).count()
+        event_popularity = event_registrations / event.capacity if event.capacity else 0
+        similar_events_attended = db.query(Registration).join(Event).filter(
+            Registration.user_id == user.id,
+            Registration.check_in_time.isnot(None),
+            Event.category == event.category
+        ).count()
+        rows.append({
+            "user_id": user.id,
+            "day_of_week": day_of_week,
+            "event_category": event.category or "uncategorized",
+            "time_slot": time_slot,
+            "days_to_event": days_to_event,
+            "user_past_attendance_rate": user_past_attendance_rate,
+            "event_popularity": event_popularity,
+            "similar_events_attended": similar_events_attended,
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def history(db):
+    rng = random.Random(7)
+    users = [User(username=f"s{i}", email=f"s{i}@example.com", password_hash="x") for i in range(40)]
+    base = datetime(2025, 1, 6, 9)
+    events = [
+        Event(
+            title=f"E{i}", start_time=base + timedelta(days=i, hours=rng.choice([0, 5, 10])),
+            end_time=base + timedelta(days=i, hours=12), capacity=rng.choice([None, 0, 25, 60]),
+            category=rng.choice(["Tech", "Sports", "Music", None]),
+        )
+        for i in range(12)
+    ]
+    db.add_all(users + events)
+    db.commit()
+    for user in users[:30]:
+        for event in rng.sample(events, rng.randint(1, 8)):
+            checked_in = rng.random() < 0.6
+            db.add(Registration(
+                user_id=user.id, event_id=event.id,
+                check_in_time=event.start_time if checked_in else None,
+            ))
+    db.commit()
+    return users, events
+
+
+def test_vectorized_features_match_per_user_loop(db, history):
+    users, events = history
+    for event in events:
+        expected = _reference_features(db, event, users)
+        actual = build_prediction_features(db, event, [u.id for u in users])
+        pd.testing.assert_frame_equal(
+            actual, expected[["user_id"] + FEATURE_COLUMNS], check_dtype=False
+        )
+
+
+def test_feature_builder_query_count_is_constant(db, history, count_queries):
+    users, events = history
+    user_ids, event = [u.id for u in users], events[0]
+    db.refresh(event)
+    count_queries.clear()
+    build_prediction_features(db, event, user_ids[:2])
+    few = len(count_queries)
+    count_queries.clear()
+    build_prediction_features(db, event, user_ids)
+    assert len(count_queries) == few == 3
+
+
+def _reference_training_rows(db):
+    """The original per-registration training loop, restricted to check-ins known at registration time"""
+    rows = []
+    past_events = db.query(Event).filter(Event.end_time < pd.Timestamp.now(tz='UTC')).all()
+    for event in past_events:
+        for reg in db.query(Registration).filter(Registration.event_id == event.id).all():
+            if not db.query(User).filter(User.id == reg.user_id).first():
+                continue
+            past = db.query(Registration).filter(
+                Registration.user_id == reg.user_id,
+                Registration.registration_date < reg.registration_date,
+            ).all()
+            attended = [r for r in past if r.check_in_time is not None and r.check_in_time < reg.registration_date]
+            event_registrations = db.query(Registration).filter(
+                Registration.event_id == event.id,
+                Registration.registration_date <= reg.registration_date,
+            ).count()
+            similar = db.query(Registration).join(Event).filter(
+                Registration.user_id == reg.user_id,
+                Registration.check_in_time < reg.registration_date,
+                Event.category == event.category,
+            ).count()
+            rows.append({
+                "registration_id": reg.id,
+                "days_to_event": (event.start_time.date() - reg.registration_date.date()).days,
+                "user_past_attendance_rate": len(attended) / len(past) if past else 0,
+                "event_popularity": event_registrations / event.capacity if event.capacity else 0,
+                "similar_events_attended": similar,
+                "attended": 1 if reg.check_in_time is not None else 0,
+            })
+    return pd.DataFrame(rows).sort_values("registration_id", ignore_index=True)
+
+
+@pytest.fixture
+def past_history(db, history):
+    """Registrations dated before their event and check-ins during it, for events already over"""
+    users, events = history
+    rng = random.Random(11)
+    for i, event in enumerate(events):
+        event.start_time = datetime(2024, 1, 1, 9) + timedelta(days=3 * i, hours=rng.choice([0, 5, 10]))
+        event.end_time = event.start_time + timedelta(hours=3)
+    for registration in db.query(Registration).all():
+        event = db.get(Event, registration.event_id)
+        registration.registration_date = event.start_time - timedelta(days=rng.randint(0, 20), minutes=rng.randint(0, 600))
+        if registration.check_in_time is not None:
+            registration.check_in_time = event.start_time + timedelta(minutes=rng.randint(0, 60))
+    db.commit()
+    return users, events
+
+
+def test_training_set_matches_point_in_time_reference(db, past_history):
+    expected = _reference_training_rows(db)
+    actual = build_training_set(db)
+    pd.testing.assert_frame_equal(actual[expected.columns], expected, check_dtype=False)
+
+
+def test_incremental_training_set_equals_full_rebuild(db, past_history, tmp_path):
+    users, events = past_history
+    store_path = str(tmp_path / "training_features.pkl")
+    late_event = events[-1]
+    late_event.end_time = datetime(2999, 1, 1)
+    db.commit()
+
+    first = build_training_set(db, store_path)
+    late_ids = {r.id for r in db.query(Registration).filter(Registration.event_id == late_event.id)}
+    assert late_ids and not late_ids & set(first["registration_id"])
+
+    late_event.end_time = late_event.start_time + timedelta(hours=3)
+    db.commit()
+    incremental = build_training_set(db, store_path)
+
+    pd.testing.assert_frame_equal(incremental, build_training_set(db), check_dtype=False)
+    assert set(incremental["registration_id"]) == set(first["registration_id"]) | late_ids
+
+
+def test_incremental_run_selects_by_watermark(db, past_history, tmp_path, count_queries):
+    _, events = past_history
+    store_dir = tmp_path / "store"
+    store_dir.mkdir()
+    store_path = str(store_dir / "training_features.pkl")
+    first = build_training_set(db, store_path)
+
+    # A late registration for an event that had already ended
+    latecomer = User(username="latecomer", email="latecomer@example.com", password_hash="x")
+    db.add(latecomer)
+    db.commit()
+    late = Registration(user_id=latecomer.id, event_id=events[0].id)
+    db.add(late)
+    db.commit()
+    count_queries.clear()
+    incremental = build_training_set(db, store_path)
+
+    assert set(incremental["registration_id"]) == set(first["registration_id"]) | {late.id}
+    pd.testing.assert_frame_equal(incremental, build_training_set(db), check_dtype=False)
+    # The stored registration ids are never sent back to the database
+    assert not any("NOT IN" in q.upper() for q in count_queries)
+    assert [path.name for path in store_dir.iterdir()] == ["training_features.pkl"]
+
+
+def test_incremental_run_rescans_recently_ended_events(db, past_history, tmp_path):
+    users, _ = past_history
+    store_path = str(tmp_path / "training_features.pkl")
+    now = datetime.utcnow()
+    recent = Event(title="Yesterday", start_time=now - timedelta(days=1, hours=3), end_time=now - timedelta(days=1),
+                   capacity=10, category="Tech")
+    db.add(recent)
+    db.commit()
+    on_time = Registration(user_id=users[0].id, event_id=recent.id, registration_date=now - timedelta(days=3))
+    watermark = Registration(id=10_000, user_id=users[1].id, event_id=recent.id, registration_date=now - timedelta(days=2))
+    db.add_all([on_time, watermark])
+    db.commit()
+    first = build_training_set(db, store_path)
+    assert first.loc[first["registration_id"] == on_time.id, "attended"].item() == 0
+
+    # A check-in recorded after the row was stored, and a registration whose id was
+    # allocated below the watermark but only committed now
+    on_time.check_in_time = recent.start_time
+    db.add(Registration(id=9_000, user_id=users[2].id, event_id=recent.id, registration_date=now - timedelta(days=2)))
+    db.commit()
+    incremental = build_training_set(db, store_path)
+
+    assert incremental.loc[incremental["registration_id"] == on_time.id, "attended"].item() == 1
+    assert 9_000 in set(incremental["registration_id"])
+    pd.testing.assert_frame_equal(incremental, build_training_set(db), check_dtype=False)
+
+
+def test_train_model_returns_job_that_can_be_polled(client, past_history, admin_token):
+    response = client.post("/api/v1/ml/train-model", headers=admin_token)
+    assert response.status_code == 202
+    job = response.json()
+    # The training set is built by the job, not by the request
+    assert job["status"] in ("queued", "running")
+
+    deadline = time.monotonic() + 120
+    while job["status"] in ("queued", "running") and time.monotonic() < deadline:
+        time.sleep(0.1)
+        job = client.get(f"/api/v1/ml/jobs/{job['job_id']}", headers=admin_token).json()
+    assert job["status"] == "succeeded", job["error"]
+    assert job["progress"] == 1.0
+    assert job["data_points"] > 0
+
+    assert client.get("/api/v1/ml/jobs/unknown", headers=admin_token).status_code == 404
@@ -0,0 +1,108 @@
+# backend/tests/integration/test_pagination.py
+import base64
+import json
+
+from app.db.models.bug_report import BugReport
+from app.db.models.event import Event
+from app.db.models.registration import Registration
+from app.db.models.user import User
+
+
+def _titles(response):
+    return [e["title"] for e in response.json()]
+
+
+def test_events_walk_forward_and_back_with_cursors(client, db, admin_user, user_token, create_events):
+    create_events(7)
+
+    first = client.get("/api/v1/events/?limit=3", headers=user_token)
+    assert _titles(first) == ["Event 0", "Event 1", "Event 2"]
+    assert "x-prev-cursor" not in first.headers
+
+    second = client.get(f"/api/v1/events/?limit=3&after={first.headers['x-next-cursor']}", headers=user_token)
+    assert _titles(second) == ["Event 3", "Event 4", "Event 5"]
+
+    last = client.get(f"/api/v1/events/?limit=3&after={second.headers['x-next-cursor']}", headers=user_token)
+    assert _titles(last) == ["Event 6"]
+    assert "x-next-cursor" not in last.headers
+
+    back = client.get(f"/api/v1/events/?limit=3&before={last.headers['x-prev-cursor']}", headers=user_token)
+    assert _titles(back) == _titles(second)
+    back = client.get(f"/api/v1/events/?limit=3&before={back.headers['x-prev-cursor']}", headers=user_token)
+    assert _titles(back) == _titles(first)
+    assert "x-prev-cursor" not in back.headers
+
+
+def test_cursor_pages_are_stable_when_rows_change(client, db, admin_user, user_token, create_events):
+    create_events(4)
+    first = client.get("/api/v1/events/?limit=2", headers=user_token)
+
+    # Deleting a row on the first page would shift an offset page by one
+    db.delete(db.query(Event).filter(Event.title == "Event 0").one())
+    db.commit()
+    create_events(2, offset=4)
+
+    second = client.get(f"/api/v1/events/?limit=2&after={first.headers['x-next-cursor']}", headers=user_token)
+    assert _titles(second) == ["Event 2", "Event 3"]
+
+
+def test_skip_and_limit_still_work(client, db, admin_user, user_token, create_events):
+    create_events(5)
+
+    response = client.get("/api/v1/events/?skip=2&limit=2", headers=user_token)
+    assert _titles(response) == ["Event 2", "Event 3"]
+    assert "x-prev-cursor" in response.headers
+
+    after = client.get(f"/api/v1/events/?limit=2&after={response.headers['x-next-cursor']}", headers=user_token)
+    assert _titles(after) == ["Event 4"]
+
+
+def test_invalid_cursors_are_rejected(client, db, admin_user, user_token, create_events):
+    create_events(2)
+    cursor = client.get("/api/v1/events/?limit=1", headers=user_token).headers["x-next-cursor"]
+
+    for query in ("after=not-a-cursor", "before=e30", f"after={cursor}&before={cursor}"):
+        response = client.get(f"/api/v1/events/?{query}", headers=user_token)
+        assert response.status_code == 400
+
+    # Well-formed cursors whose values do not fit the sort columns
+    for values, sort in (
+        ([{"a": 1}], "id"), (["1"], "id"), ([True], "id"), ([1.5], "id"), ([None], "id"), ([1, 2], "id"),
+        ([1, 1], "start_time"), (["2025-08-15T10:00:00", "1"], "start_time"), (["not a date", 1], "start_time"),
+    ):
+        token = base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+        response = client.get(f"/api/v1/events/?sort={sort}&after={token}", headers=user_token)
+        assert response.status_code == 400, values
+        assert response.json()["detail"] == "Invalid pagination cursor"
+
+    valid = base64.urlsafe_b64encode(json.dumps(["2025-08-15T10:00:00", 1]).encode()).decode().rstrip("=")
+    assert client.get(f"/api/v1/events/?sort=start_time&after={valid}", headers=user_token).status_code == 200
+
+
+def test_other_lists_paginate_by_cursor(client, db, admin_user, normal_user, admin_token, user_token, create_events):
+    events = create_events(3)
+    db.add_all([User(username=f"u{i}", email=f"u{i}@example.com", password_hash="x") for i in range(3)])
+    db.add_all([Registration(user_id=normal_user.id, event_id=event.id) for event in events])
+    db.add_all([
+        BugReport(title=f"Bug {i}", description="d", reported_by=normal_user.id) for i in range(3)
+    ])
+    db.commit()
+
+    for url, headers in (
+        ("/api/v1/users/", admin_token),
+        ("/api/v1/registrations/", user_token),
+        ("/api/v1/bugs/", user_token),
+    ):
+        everything = [row["id"] for row in client.get(url, headers=headers).json()]
+        assert len(everything) >= 3
+
+        seen, cursor = [], None
+        while True:
+            query = f"?limit=2&after={cursor}" if cursor else "?limit=2"
+            response = client.get(url + query, headers=headers)
+            assert response.status_code == 200
+            seen += [row["id"] for row in response.json()]
+            cursor = response.headers.get("x-next-cursor")
+            if cursor is None:
+                break
+        assert seen == everything
@@ -0,0 +1,122 @@
+# backend/tests/integration/test_predictions.py
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.attendance_prediction import AttendancePrediction
+from app.db.models.event import Event
+from app.db.models.registration import Registration
+from app.db.models.user import User
+from app.ml.attendance_predictor import AttendancePredictor
+from app.ml.predictions import (
+    FALLBACK_PROBABILITY, REFRESH_LOCK_KEY, expected_turnout, predict_for_event, refresh_predictions_exclusively,
+    refresh_upcoming_predictions,
+)
+
+
+@pytest.fixture
+def model_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ML_MODEL_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def trained_model(model_dir, training_frame):
+    AttendancePredictor().train(training_frame())
+
+
+@pytest.fixture
+def upcoming(db):
+    users = [User(username=f"p{i}", email=f"p{i}@example.com", password_hash="x") for i in range(10)]
+    start = datetime.utcnow() + timedelta(days=3)
+    events = [
+        Event(title="Soon", start_time=start, end_time=start + timedelta(hours=2), capacity=20, category="Tech"),
+        Event(title="Later", start_time=start + timedelta(days=60), end_time=start + timedelta(days=60, hours=2)),
+    ]
+    db.add_all(users + events)
+    db.commit()
+    db.add_all([Registration(user_id=u.id, event_id=events[0].id) for u in users[:4]])
+    db.commit()
+    return [u.id for u in users], events
+
+
+def test_predictions_are_stored_and_reused(db, trained_model, upcoming, count_queries):
+    user_ids, (event, _) = upcoming
+
+    first = predict_for_event(db, event, user_ids)
+    assert db.query(AttendancePrediction).count() == len(user_ids)
+
+    db.refresh(event)
+    count_queries.clear()
+    assert predict_for_event(db, event, user_ids) == first
+    # Served entirely from the store: no feature queries, no inserts
+    assert not any(q.lstrip().upper().startswith("INSERT") for q in count_queries)
+    assert len(count_queries) == 1
+
+
+def test_untrained_model_falls_back_without_storing(db, model_dir, upcoming):
+    user_ids, (event, _) = upcoming
+    assert set(predict_for_event(db, event, user_ids).values()) == {FALLBACK_PROBABILITY}
+    assert db.query(AttendancePrediction).count() == 0
+
+
+def test_expected_turnout_sums_registered_users(db, trained_model, upcoming):
+    user_ids, (event, _) = upcoming
+    turnout = expected_turnout(db, event)
+    probabilities = predict_for_event(db, event, user_ids[:4])
+    assert turnout["registered"] == 4
+    assert turnout["expected_turnout"] == pytest.approx(sum(probabilities.values()))
+
+
+def test_refresh_replaces_predictions_for_upcoming_events_only(db, trained_model, upcoming):
+    user_ids, (soon, later) = upcoming
+    db.add(AttendancePrediction(event_id=soon.id, user_id=user_ids[0], model_version="old", probability=0.9))
+    db.commit()
+
+    assert refresh_upcoming_predictions(db) == len(user_ids)
+    rows = db.query(AttendancePrediction).all()
+    assert {r.event_id for r in rows} == {soon.id}
+    assert "old" not in {r.model_version for r in rows}
+    assert len(rows) == len(user_ids)
+
+
+def test_refresh_counts_only_rows_that_were_stored(db, trained_model, upcoming, monkeypatch):
+    user_ids, (soon, _) = upcoming
+    db.add(AttendancePrediction(event_id=soon.id, user_id=user_ids[0], model_version="old", probability=0.9))
+    db.commit()
+
+    def conflicting_commit():
+        # As if a request stored the same rows first, every time
+        raise IntegrityError("INSERT", {}, Exception("uq_attendance_prediction"))
+
+    monkeypatch.setattr(db, "commit", conflicting_commit)
+    assert refresh_upcoming_predictions(db) == 0
+    monkeypatch.undo()
+    # The rollback kept the old rows, which the count must not hide
+    assert [r.model_version for r in db.query(AttendancePrediction)] == ["old"]
+
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set")
+def test_refresh_is_skipped_while_another_run_holds_the_lock():
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    try:
+        with engine.connect() as other_run, Session(engine) as db:
+            other_run.execute(text("SELECT pg_advisory_lock(:key)"), {"key": REFRESH_LOCK_KEY})
+            assert refresh_predictions_exclusively(db) is None
+            other_run.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": REFRESH_LOCK_KEY})
+    finally:
+        engine.dispose()
+
+
+def test_expected_turnout_endpoint(client, trained_model, upcoming, admin_token, user_token):
+    _, (event, _) = upcoming
+    url = f"/api/v1/ml/events/{event.id}/expected-turnout"
+    assert client.get(url, headers=user_token).status_code == 403
+    response = client.get(url, headers=admin_token)
+    assert response.status_code == 200
+    assert response.json()["registered"] == 4
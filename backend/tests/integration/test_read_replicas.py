@@ -0,0 +1,122 @@
+# backend/tests/integration/test_read_replicas.py
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.core.cache import RedisCacheBackend
+from app.db.base import Base
+from app.db.models.event import Event
+from app.db.replicas import ReplicaRouter
+from app.services.event_cache import event_cache
+
+
+def _event(title, creator_id):
+    return Event(
+        title=title, description="desc", location="Main Hall",
+        start_time=datetime(2025, 8, 15, 10), end_time=datetime(2025, 8, 15, 12),
+        capacity=100, category="Tech", created_by=creator_id,
+    )
+
+
+def _replica_url(tmp_path, name, creator_id):
+    """A SQLite file standing in for a replica, holding one event titled after it"""
+    url = f"sqlite:///{tmp_path / name}.db"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        db.add(_event(name, creator_id))
+        db.commit()
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def use_replicas(monkeypatch):
+    # Every request must reach a database for the routing to be observable
+    monkeypatch.setattr(event_cache, "ttl", 0)
+    routers = []
+
+    def use(urls):
+        router = ReplicaRouter(urls, retry_seconds=60)
+        monkeypatch.setattr(deps, "read_replicas", router)
+        routers.append(router)
+        return router
+
+    yield use
+    for router in routers:
+        router.dispose()
+
+
+def _titles(client, headers):
+    response = client.get("/api/v1/events/", headers=headers)
+    assert response.status_code == 200
+    return [event["title"] for event in response.json()]
+
+
+def test_reads_rotate_between_replicas(client, tmp_path, admin_user, user_token, use_replicas):
+    use_replicas([_replica_url(tmp_path, "replica-a", admin_user.id), _replica_url(tmp_path, "replica-b", admin_user.id)])
+
+    seen = [_titles(client, user_token) for _ in range(4)]
+    assert seen == [["replica-a"], ["replica-b"], ["replica-a"], ["replica-b"]]
+
+
+def test_unreachable_replica_is_skipped(client, tmp_path, admin_user, user_token, use_replicas):
+    broken = f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"
+    router = use_replicas([broken, _replica_url(tmp_path, "replica-b", admin_user.id)])
+
+    assert [_titles(client, user_token) for _ in range(3)] == [["replica-b"]] * 3
+    assert router.replicas[0].down_until > 0
+
+
+def test_falls_back_to_primary_when_no_replica_is_reachable(client, db, tmp_path, admin_user, user_token, use_replicas):
+    db.add(_event("primary", admin_user.id))
+    db.commit()
+    use_replicas([f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"])
+
+    assert _titles(client, user_token) == ["primary"]
+
+
+def test_user_reads_own_registration_from_primary(client, db, tmp_path, admin_user, admin_token, user_token, use_replicas):
+    event = _event("primary", admin_user.id)
+    db.add(event)
+    db.commit()
+    use_replicas([_replica_url(tmp_path, "replica-a", admin_user.id)])
+
+    assert _titles(client, user_token) == ["replica-a"]
+    response = client.post("/api/v1/registrations/", json={"event_id": event.id}, headers=user_token)
+    assert response.status_code == 200
+
+    # The user who just registered reads from the primary; everyone else stays on the replica
+    assert _titles(client, user_token) == ["primary"]
+    assert len(client.get("/api/v1/registrations/", headers=user_token).json()) == 1
+    assert _titles(client, admin_token) == ["replica-a"]
+
+
+def test_own_writes_are_visible_on_every_worker(
+    client, db, tmp_path, admin_user, user_token, use_replicas, stand_in_redis, monkeypatch
+):
+    event = _event("primary", admin_user.id)
+    db.add(event)
+    db.commit()
+    use_replicas([_replica_url(tmp_path, "replica-a", admin_user.id)])
+
+    monkeypatch.setattr(deps, "recent_writers", RedisCacheBackend(stand_in_redis, "recent-write:"))
+    assert client.post("/api/v1/registrations/", json={"event_id": event.id}, headers=user_token).status_code == 200
+
+    # The next request lands on another worker, with its own client for the same Redis
+    monkeypatch.setattr(deps, "recent_writers", RedisCacheBackend(stand_in_redis, "recent-write:"))
+    assert _titles(client, user_token) == ["primary"]
+
+
+def test_cached_pages_are_filled_from_the_primary(client, db, tmp_path, admin_user, user_token, use_replicas, monkeypatch):
+    db.add(_event("primary", admin_user.id))
+    db.commit()
+    use_replicas([_replica_url(tmp_path, "lagging-replica", admin_user.id)])
+    monkeypatch.setattr(event_cache, "ttl", 30)
+
+    # A replica page would be stored under the current generation and served to everyone
+    assert _titles(client, user_token) == ["primary"]
+    assert _titles(client, user_token) == ["primary"]
@@ -0,0 +1,224 @@
+# backend/tests/integration/test_registrations.py
+import asyncio
+import io
+import os
+import zipfile
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, func
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.api.api_v1.endpoints.registrations import check_in, create_registration
+from app.db.base import Base
+from app.db.models.event import Event
+from app.db.models.registration import Registration
+from app.db.models.user import User
+from app.db.session import async_database_url
+from app.schemas.registration import RegistrationCreate
+from app.services.qr import render_qr
+
+
+@pytest.fixture
+def concurrent_engine(stand_in_engine, tmp_path):
+    """A real multi-connection database, unlike the single shared connection of the default fixture"""
+    if stand_in_engine == "sqlite":
+        url = f"sqlite:///{tmp_path / 'rush.db'}"
+        engine = create_engine(url, connect_args={"check_same_thread": False, "timeout": 60})
+        connect_args = {"timeout": 60}
+    else:
+        url = os.environ["TEST_POSTGRES_URL"]
+        engine = create_engine(url)
+        connect_args = {}
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield engine, create_async_engine(
+        async_database_url(url), connect_args=connect_args,
+        poolclass=AsyncAdaptedQueuePool, pool_size=50, max_overflow=0,
+    )
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def test_registration_rush_never_oversells(concurrent_engine):
+    engine, async_engine = concurrent_engine
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    capacity, attendees = 50, 200
+
+    with SessionLocal() as db:
+        users = [User(username=f"u{i}", email=f"u{i}@example.com", password_hash="x") for i in range(attendees)]
+        event = Event(
+            title="Rush", start_time=datetime(2025, 8, 15, 10), end_time=datetime(2025, 8, 15, 12),
+            capacity=capacity,
+        )
+        db.add_all(users + [event])
+        db.commit()
+        user_ids, event_id = [u.id for u in users], event.id
+
+    async def register(user_id):
+        async with AsyncSessionLocal() as db:
+            user = await db.get(User, user_id)
+            try:
+                await create_registration(db=db, registration_in=RegistrationCreate(event_id=event_id), current_user=user)
+                return "ok"
+            except HTTPException as e:
+                return e.detail
+
+    async def rush():
+        # Every attendee fires twice so duplicates race against each other as well as for seats
+        try:
+            return await asyncio.gather(*(register(user_id) for user_id in user_ids + user_ids))
+        finally:
+            await async_engine.dispose()
+
+    outcomes = asyncio.run(rush())
+
+    assert outcomes.count("ok") == capacity
+    assert set(outcomes) <= {"ok", "Event is at full capacity", "User is already registered for this event"}
+
+    with SessionLocal() as db:
+        assert db.get(Event, event_id).registered_count == capacity
+        assert db.query(func.count(Registration.id)).scalar() == capacity
+        assert db.query(func.count(func.distinct(Registration.user_id))).scalar() == capacity
+
+
+def test_concurrent_check_ins_count_once(concurrent_engine):
+    engine, async_engine = concurrent_engine
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    with SessionLocal() as db:
+        admin = User(username="door", email="door@example.com", password_hash="x", is_admin=True)
+        event = Event(title="Gala", start_time=datetime(2025, 8, 15, 18), end_time=datetime(2025, 8, 15, 22))
+        db.add_all([admin, event])
+        db.commit()
+        registration = Registration(user_id=admin.id, event_id=event.id)
+        db.add(registration)
+        db.commit()
+        registration_id, unique_code, event_id = registration.id, registration.unique_code, event.id
+
+    async def scan():
+        async with AsyncSessionLocal() as db:
+            admin = await db.get(User, 1)
+            try:
+                await check_in(db=db, registration_id=registration_id, unique_code=unique_code, current_user=admin)
+                return "ok"
+            except HTTPException as e:
+                return e.detail
+
+    async def rush():
+        # The same ticket scanned at several doors at once
+        try:
+            return await asyncio.gather(*(scan() for _ in range(20)))
+        finally:
+            await async_engine.dispose()
+
+    outcomes = asyncio.run(rush())
+
+    assert outcomes.count("ok") == 1
+    assert all(outcome.startswith("Already checked in at 20") for outcome in outcomes if outcome != "ok")
+    with SessionLocal() as db:
+        assert db.get(Event, event_id).checked_in_count == 1
+
+
+def test_duplicate_registration_is_rejected_and_releases_seat(client, db, admin_user, user_token):
+    event = Event(
+        title="Talk", start_time=datetime(2025, 8, 15, 10), end_time=datetime(2025, 8, 15, 12),
+        capacity=10, created_by=admin_user.id,
+    )
+    db.add(event)
+    db.commit()
+
+    response = client.post("/api/v1/registrations/", json={"event_id": event.id}, headers=user_token)
+    assert response.status_code == 200
+    assert response.json()["qr_code_url"] == f"/api/v1/registrations/{response.json()['id']}/qr"
+    response = client.post("/api/v1/registrations/", json={"event_id": event.id}, headers=user_token)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "User is already registered for this event"
+
+    db.refresh(event)
+    assert event.registered_count == 1
+    assert client.post("/api/v1/registrations/", json={"event_id": 9999}, headers=user_token).status_code == 404
+
+
+def test_qr_endpoint_renders_on_demand_with_etag(client, db, admin_user, normal_user, user_token):
+    event = Event(
+        title="Talk", start_time=datetime(2025, 8, 15, 10), end_time=datetime(2025, 8, 15, 12),
+        created_by=admin_user.id,
+    )
+    db.add(event)
+    db.commit()
+    registration = Registration(user_id=normal_user.id, event_id=event.id)
+    db.add(registration)
+    db.commit()
+
+    response = client.get(f"/api/v1/registrations/{registration.id}/qr", headers=user_token)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert "immutable" in response.headers["cache-control"]
+    etag = response.headers["etag"]
+
+    response = client.get(
+        f"/api/v1/registrations/{registration.id}/qr", headers={**user_token, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    response = client.get(f"/api/v1/registrations/{registration.id}/qr?format=svg", headers=user_token)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/svg+xml"
+    assert response.headers["etag"] != etag
+
+
+def test_event_tickets_zip_contains_every_registration(client, db, admin_user, admin_token, user_token):
+    event = Event(
+        title="Gala", start_time=datetime(2025, 8, 15, 18), end_time=datetime(2025, 8, 15, 22),
+        created_by=admin_user.id,
+    )
+    users = [User(username=f"guest{i}", email=f"guest{i}@example.com", password_hash="x") for i in range(5)]
+    db.add_all(users + [event])
+    db.commit()
+    registrations = [Registration(user_id=u.id, event_id=event.id) for u in users]
+    db.add_all(registrations)
+    db.commit()
+
+    url = f"/api/v1/registrations/event/{event.id}/tickets.zip"
+    assert client.get(url, headers=user_token).status_code == 403
+
+    response = client.get(url, headers=admin_token)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == [f"registration_{r.id}.png" for r in registrations]
+        assert archive.read(archive.namelist()[0]) == render_qr(f"{registrations[0].id}:{registrations[0].unique_code}")
+
+
+def test_check_in_updates_counter_once(client, db, admin_user, admin_token, normal_user):
+    event = Event(
+        title="Talk", start_time=datetime(2025, 8, 15, 10), end_time=datetime(2025, 8, 15, 12),
+        created_by=admin_user.id,
+    )
+    db.add(event)
+    db.commit()
+    registration = Registration(user_id=normal_user.id, event_id=event.id)
+    db.add(registration)
+    db.commit()
+
+    url = f"/api/v1/registrations/{registration.id}/check-in"
+    assert client.post(url, params={"unique_code": "wrong"}, headers=admin_token).status_code == 400
+    response = client.post(url, params={"unique_code": registration.unique_code}, headers=admin_token)
+    assert response.status_code == 200
+    response = client.post(url, params={"unique_code": registration.unique_code}, headers=admin_token)
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Already checked in")
+
+    db.refresh(event)
+    db.refresh(registration)
+    assert event.checked_in_count == 1
+    assert registration.check_in_time is not None
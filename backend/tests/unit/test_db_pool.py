@@ -0,0 +1,87 @@
+# backend/tests/unit/test_db_pool.py
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.core.config import settings
+from app.db.replicas import ReplicaRouter
+from app.db.session import InstrumentedAsyncQueuePool, InstrumentedQueuePool, engine_options, pool_stats
+
+
+@pytest.fixture
+def small_pool(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 1)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT_SECONDS", 0.05)
+
+
+def test_file_database_gets_configured_queue_pool(small_pool, tmp_path):
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, **engine_options(url))
+
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    assert engine.pool.size() == 1
+    assert engine.pool._timeout == 0.05
+    engine.dispose()
+
+
+def test_async_engine_has_its_own_pool_budget(monkeypatch):
+    monkeypatch.setattr(settings, "DB_ASYNC_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "DB_ASYNC_MAX_OVERFLOW", 4)
+
+    options = engine_options("postgresql://user:pw@localhost/db", asyncio=True)
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert (options["pool_size"], options["max_overflow"]) == (3, 4)
+    options = engine_options("postgresql://user:pw@localhost/db")
+    assert (options["pool_size"], options["max_overflow"]) == (settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+
+
+def test_replica_engines_are_built_on_first_use(tmp_path):
+    router = ReplicaRouter([f"sqlite:///{tmp_path / 'replica.db'}"])
+    replica = router.replicas[0]
+    assert replica.engine is None and replica.async_engine is None
+
+    router.session().close()
+    assert replica.engine is not None
+    assert replica.async_engine is None
+    router.dispose()
+
+
+def test_in_memory_sqlite_keeps_default_pool():
+    options = engine_options("sqlite://")
+    assert "poolclass" not in options
+    assert "pool_size" not in options
+
+
+def test_statement_timeout_is_passed_to_postgres(monkeypatch):
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+
+    options = engine_options("postgresql://user:pw@localhost/db")
+    assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+    assert "connect_args" not in engine_options("sqlite:///events.db")
+
+
+def test_pool_stats_report_checkouts_overflow_and_timeouts(small_pool, tmp_path):
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, **engine_options(url))
+
+    first, second = engine.connect(), engine.connect()
+    first.execute(text("SELECT 1"))
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+
+    stats = pool_stats(engine)
+    assert stats["checked_out"] == 2
+    assert stats["overflow"] == 1
+    assert stats["checkouts"] == 3
+    assert stats["timeouts"] == 1
+    assert stats["wait_ms_max"] >= 50
+
+    first.close()
+    second.close()
+    assert pool_stats(engine)["checked_out"] == 0
+    engine.dispose()
+
+
+def test_metrics_expose_db_pool(client, admin_token):
+    metrics = client.get("/api/v1/metrics/", headers=admin_token).json()
+    assert "pool" in metrics["db_pool"]
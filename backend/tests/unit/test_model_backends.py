@@ -0,0 +1,65 @@
+# backend/tests/unit/test_model_backends.py
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.exceptions import NotFittedError
+from sklearn.metrics import roc_auc_score
+
+from app.core.config import settings
+from app.ml.attendance_predictor import AttendancePredictor
+from app.ml.backends import COMPACT_BACKENDS, LogisticScorer
+
+
+def _frame(n, seed):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "day_of_week": rng.choice(["Monday", "Saturday"], n),
+        "event_category": rng.choice(["Tech", "Music", "Sports"], n),
+        "time_slot": rng.choice(["morning", "evening"], n),
+        "days_to_event": rng.integers(0, 30, n),
+        "user_past_attendance_rate": rng.random(n),
+        "event_popularity": rng.random(n),
+        "similar_events_attended": rng.integers(0, 5, n),
+    })
+    logit = 4 * (df["user_past_attendance_rate"] - 0.5) + np.where(df["time_slot"] == "evening", -1, 1)
+    df["attended"] = (rng.random(n) < 1 / (1 + np.exp(-logit))).astype(int)
+    return df
+
+
+@pytest.mark.parametrize("backend", sorted(COMPACT_BACKENDS))
+def test_compact_backend_trains_and_scores(backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ATTENDANCE_MODEL_BACKEND", backend)
+    predictor = AttendancePredictor()
+    predictor.model_path = str(tmp_path / "attendance_model.pkl")
+    predictor.train(_frame(2000, seed=0))
+
+    test = _frame(500, seed=1)
+    test.loc[0, "event_category"] = "Never seen in training"
+    reloaded = AttendancePredictor()
+    reloaded.model_path = predictor.model_path
+    probabilities = reloaded.predict_attendance_probability(test)
+
+    assert isinstance(reloaded.model, COMPACT_BACKENDS[backend])
+    assert probabilities.shape == (500,)
+    assert ((probabilities >= 0) & (probabilities <= 1)).all()
+    assert roc_auc_score(test["attended"], probabilities) > 0.7
+
+
+def test_logistic_scorer_keeps_no_sklearn_objects():
+    model = LogisticScorer(["time_slot"], ["user_past_attendance_rate"]).fit(
+        _frame(500, seed=2), _frame(500, seed=2)["attended"]
+    )
+    assert b"sklearn" not in pickle.dumps(model)
+
+
+def test_unfitted_compact_model_raises_so_endpoint_can_fall_back():
+    with pytest.raises(NotFittedError):
+        LogisticScorer(["time_slot"], ["days_to_event"]).predict_proba(_frame(3, seed=0))
+
+
+def test_unknown_backend_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "ATTENDANCE_MODEL_BACKEND", "quantum_forest")
+    with pytest.raises(ValueError):
+        AttendancePredictor()._create_basic_model()
@@ -0,0 +1,63 @@
+# backend/tests/unit/test_model_registry.py
+import shutil
+
+from app.ml.attendance_predictor import AttendancePredictor, ModelRegistry, model_registry
+
+
+def _predictor(tmp_path):
+    predictor = AttendancePredictor()
+    predictor.model_path = str(tmp_path / "attendance_model.pkl")
+    return predictor
+
+
+def _fit(tmp_path, training_frame):
+    other = _predictor(tmp_path)
+    other._create_basic_model()
+    data = training_frame(seed=2)
+    other.model.fit(data.drop(columns="attended"), data["attended"])
+    return other.model
+
+
+def test_model_is_loaded_once_and_shared(tmp_path, training_frame):
+    _predictor(tmp_path).train(training_frame())
+    model_registry.clear()
+
+    first, second = _predictor(tmp_path), _predictor(tmp_path)
+    first.predict_attendance_probability(training_frame(5))
+    second.predict_attendance_probability(training_frame(5))
+    assert first.model is second.model
+
+
+def test_new_version_written_by_another_worker_is_swapped_in(tmp_path, training_frame):
+    predictor = _predictor(tmp_path)
+    predictor.train(training_frame(seed=1))
+    old_model = model_registry.get(predictor.model_path)
+
+    # Another worker process has its own registry and publishes a retrained model
+    ModelRegistry().publish(predictor.model_path, _fit(tmp_path, training_frame))
+
+    new_model = model_registry.get(predictor.model_path)
+    assert new_model is not old_model
+    # The old object stays usable for predictions that were already running
+    assert len(old_model.predict_proba(training_frame(3).drop(columns="attended"))) == 3
+
+
+def test_copies_of_a_model_on_other_hosts_share_its_version(tmp_path, training_frame):
+    predictor = _predictor(tmp_path)
+    predictor.train(training_frame(seed=1))
+    version, _ = model_registry.current(predictor.model_path)
+
+    # A copy deployed elsewhere has another inode and mtime but the same content
+    copy = tmp_path / "copy" / "attendance_model.pkl"
+    copy.parent.mkdir()
+    shutil.copyfile(predictor.model_path, copy)
+    assert ModelRegistry().current(str(copy))[0] == version
+
+    model_registry.publish(predictor.model_path, _fit(tmp_path, training_frame))
+    assert model_registry.current(predictor.model_path)[0] != version
+
+
+def test_missing_model_file_falls_back_to_basic_model(tmp_path):
+    predictor = _predictor(tmp_path)
+    predictor._ensure_model_loaded()
+    assert predictor.model is not None
@@ -0,0 +1,59 @@
+# backend/tests/unit/test_password_hashing.py
+import threading
+
+import pytest
+from fastapi import HTTPException
+from werkzeug.security import generate_password_hash
+
+from app.core import security
+from app.core.config import settings
+
+
+def test_new_hashes_use_configured_scheme():
+    hashed = security.get_password_hash("secret")
+
+    assert security.pwd_context.identify(hashed) == settings.PASSWORD_HASH_SCHEME
+    assert security.verify_and_update_password("secret", hashed) == (True, None)
+    assert security.verify_and_update_password("wrong", hashed) == (False, None)
+
+
+def test_werkzeug_hash_verifies_and_is_upgraded():
+    legacy = generate_password_hash("secret")
+
+    assert security.verify_and_update_password("wrong", legacy) == (False, None)
+    verified, new_hash = security.verify_and_update_password("secret", legacy)
+    assert verified
+    assert security.pwd_context.identify(new_hash) == settings.PASSWORD_HASH_SCHEME
+    assert security.verify_and_update_password("secret", new_hash) == (True, None)
+
+
+def test_upgraded_hash_is_at_least_as_costly_as_legacy():
+    legacy = generate_password_hash("secret", method="pbkdf2:sha256:600000")
+
+    _, new_hash = security.verify_and_update_password("secret", legacy)
+    assert security.pwd_context.identify(new_hash) == "pbkdf2_sha256"
+    assert int(new_hash.split("$")[2]) >= 600000
+
+
+def test_legacy_hash_is_kept_when_upgrade_would_weaken_it():
+    stronger = generate_password_hash("secret", method="pbkdf2:sha256:700000")
+    assert security.verify_and_update_password("secret", stronger) == (True, None)
+
+    scrypt = generate_password_hash("secret", method="scrypt")
+    assert security.verify_and_update_password("secret", scrypt) == (True, None)
+
+
+def test_malformed_hash_does_not_verify():
+    assert security.verify_password("secret", "not-a-hash") is False
+    assert security.verify_password("secret", "") is False
+
+
+def test_saturated_hash_pool_rejects_with_503(monkeypatch):
+    monkeypatch.setattr(security, "_hash_slots", threading.BoundedSemaphore(1))
+    monkeypatch.setattr(settings, "PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS", 0.01)
+    security._hash_slots.acquire()
+
+    with pytest.raises(HTTPException) as exc:
+        security.get_password_hash("secret")
+    assert exc.value.status_code == 503
+    assert exc.value.headers["Retry-After"] == "1"
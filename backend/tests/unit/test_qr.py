@@ -0,0 +1,30 @@
+# backend/tests/unit/test_qr.py
+import io
+import time
+
+from PIL import Image
+
+from app.services.qr import get_qr_image, qr_cache, qr_etag, render_qr, warm_qr_cache
+
+
+def test_render_qr_formats():
+    with Image.open(io.BytesIO(render_qr("1:abc", "png"))) as img:
+        assert img.format == "PNG"
+    assert b"<svg" in render_qr("1:abc", "svg")
+
+
+def test_qr_etag_is_stable_per_content():
+    assert qr_etag("1:abc", "png") == qr_etag("1:abc", "png")
+    assert qr_etag("1:abc", "png") != qr_etag("1:abc", "svg")
+    assert qr_etag("1:abc", "png") != qr_etag("2:abc", "png")
+
+
+def test_warm_qr_cache_renders_in_worker_process():
+    qr_cache.clear()
+    png = warm_qr_cache("7:warm").result(timeout=60)
+
+    deadline = time.monotonic() + 5
+    while qr_cache.get(("7:warm", "png")) is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert qr_cache.get(("7:warm", "png")) == png
+    assert get_qr_image("7:warm") is qr_cache.get(("7:warm", "png"))
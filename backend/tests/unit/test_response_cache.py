@@ -0,0 +1,84 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.cache import LocalCacheBackend, RedisCacheBackend, build_cache_backend
+from app.services.event_cache import ResponseCache, cached_response
+
+
+def test_invalidation_is_shared_between_workers_on_redis(stand_in_redis):
+    client = stand_in_redis
+    worker_a = ResponseCache(RedisCacheBackend(client), ttl=30)
+    worker_b = ResponseCache(RedisCacheBackend(client), ttl=30)
+
+    key = worker_a.key(["events"], {"limit": 10})
+    worker_a.store(key, [{"id": 1}], {"X-Next-Cursor": "abc"})
+    entry = worker_b.get(worker_b.key(["events"], {"limit": 10}))
+    assert entry["body"] == '[{"id":1}]'
+    assert entry["headers"] == {"X-Next-Cursor": "abc"}
+
+    worker_b.invalidate("events")
+    assert worker_a.get(worker_a.key(["events"], {"limit": 10})) is None
+    # An entry built under the old generation is never read again
+    worker_a.store(key, [{"id": 1}])
+    assert worker_b.get(worker_b.key(["events"], {"limit": 10})) is None
+
+    worker_a.clear()
+    assert client.data == {}
+
+
+def test_async_calls_keep_a_blocking_backend_off_the_event_loop(stand_in_redis, monkeypatch):
+    threads = set()
+    get = stand_in_redis.get
+
+    def recording_get(key):
+        threads.add(threading.get_ident())
+        return get(key)
+
+    monkeypatch.setattr(stand_in_redis, "get", recording_get)
+    cache = ResponseCache(RedisCacheBackend(stand_in_redis), ttl=30)
+
+    async def request():
+        key = await cache.key_async(["events"], {"limit": 10})
+        await cache.store_async(key, [{"id": 1}])
+        entry = await cache.get_async(key)
+        await cache.invalidate_async("events")
+        return entry, threading.get_ident()
+
+    entry, loop_thread = asyncio.run(request())
+    assert entry["body"] == '[{"id":1}]'
+    assert threads and loop_thread not in threads
+
+
+def test_local_backend_scopes_are_independent():
+    cache = ResponseCache(LocalCacheBackend(maxsize=10, ttl=30), ttl=30)
+    one, two = cache.key(["event:1"], {"id": 1}), cache.key(["event:2"], {"id": 2})
+    cache.store(one, {"id": 1})
+    cache.store(two, {"id": 2})
+
+    cache.invalidate("event:1")
+    assert cache.get(cache.key(["event:1"], {"id": 1})) is None
+    assert cache.get(cache.key(["event:2"], {"id": 2})) is not None
+
+
+def test_zero_ttl_disables_caching():
+    cache = ResponseCache(LocalCacheBackend(maxsize=10, ttl=0), ttl=0)
+    key = cache.key(["events"], {})
+    cache.store(key, [])
+    assert cache.get(key) is None
+
+
+def test_cached_response_honours_if_none_match():
+    cache = ResponseCache(LocalCacheBackend(maxsize=10, ttl=30), ttl=30)
+    entry = cache.store(cache.key(["events"], {}), [{"title": "Café"}])
+
+    assert cached_response(entry).body == '[{"title":"Café"}]'.encode()
+    assert cached_response(entry, f'W/{entry["etag"]}').status_code == 304
+    assert cached_response(entry, '"other", ' + entry["etag"]).status_code == 304
+    assert cached_response(entry, '"other"').status_code == 200
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        build_cache_backend("memcached", 10, 30)
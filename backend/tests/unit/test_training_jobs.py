@@ -0,0 +1,118 @@
+# backend/tests/unit/test_training_jobs.py
+import os
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from app.db.models.training_job import TrainingJob
+from app.ml.jobs import CANCELLED, FAILED, QUEUED, RUNNING, SUCCEEDED, TrainingJobManager
+
+
+def _stored_training_set(db, store_path):
+    # Stands in for build_training_set: the rows are pickled at store_path by the test
+    return pd.read_pickle(store_path)
+
+
+def _store(tmp_path, frame, name="training_features.pkl"):
+    path = str(tmp_path / name)
+    frame.to_pickle(path)
+    return path
+
+
+def _wait_for(manager, db, job_id, states, timeout=120):
+    deadline = time.monotonic() + timeout
+    while True:
+        db.expire_all()
+        job = manager.get(db, job_id)
+        if job.status in states or time.monotonic() >= deadline:
+            return job
+        time.sleep(0.05)
+
+
+def test_training_job_runs_in_background_and_publishes_model(tmp_path, db, training_frame):
+    manager = TrainingJobManager(build=_stored_training_set)
+    model_path = str(tmp_path / "attendance_model.pkl")
+
+    job = manager.submit(db, _store(tmp_path, training_frame(300)), model_path)
+    assert job.status in (QUEUED, RUNNING)
+
+    job = _wait_for(manager, db, job.id, (SUCCEEDED,))
+    assert job.status == SUCCEEDED, job.error
+    assert job.data_points == 300
+    assert job.progress == 1.0
+    assert job.finished_at is not None
+    assert os.path.exists(model_path)
+
+
+def test_job_without_training_data_fails(tmp_path, db, training_frame):
+    manager = TrainingJobManager(build=_stored_training_set)
+    job = manager.submit(db, _store(tmp_path, training_frame(0)), str(tmp_path / "attendance_model.pkl"))
+
+    job = _wait_for(manager, db, job.id, (FAILED,))
+    assert job.status == FAILED
+    assert job.error == "No training data could be generated"
+
+
+def test_jobs_are_shared_by_every_worker(tmp_path, db, training_frame):
+    # Two managers stand in for two API workers on the same database
+    worker_a, worker_b = TrainingJobManager(build=_stored_training_set), TrainingJobManager(build=_stored_training_set)
+    model_path = str(tmp_path / "attendance_model.pkl")
+
+    running = worker_a.submit(db, _store(tmp_path, training_frame(200_000), "large.pkl"), model_path)
+    assert _wait_for(worker_b, db, running.id, (RUNNING,)).status == RUNNING
+    queued = worker_b.submit(db, _store(tmp_path, training_frame(300)), model_path)
+    time.sleep(1)
+    # Only one job trains at a time, whichever worker it was submitted to
+    assert _wait_for(worker_a, db, queued.id, (QUEUED,)).status == QUEUED
+
+    # Cancelled from the worker that does not run it
+    worker_b.cancel(db, running.id)
+    assert _wait_for(worker_a, db, running.id, (CANCELLED,)).status == CANCELLED
+    assert _wait_for(worker_a, db, queued.id, (SUCCEEDED,)).status == SUCCEEDED
+
+
+def test_cancel_running_and_queued_jobs(tmp_path, db, training_frame):
+    manager = TrainingJobManager(build=_stored_training_set)
+    model_path = str(tmp_path / "attendance_model.pkl")
+
+    running = manager.submit(db, _store(tmp_path, training_frame(200_000), "large.pkl"), model_path)
+    queued = manager.submit(db, _store(tmp_path, training_frame(300)), model_path)
+    assert _wait_for(manager, db, running.id, (RUNNING,)).status == RUNNING
+
+    assert manager.cancel(db, queued.id).status == CANCELLED
+    manager.cancel(db, running.id)
+
+    assert _wait_for(manager, db, running.id, (CANCELLED,)).status == CANCELLED
+    assert _wait_for(manager, db, queued.id, (CANCELLED,)).status == CANCELLED
+    assert not manager._processes
+    assert not os.path.exists(model_path)
+
+
+def test_shutdown_cancels_this_workers_jobs(tmp_path, db, training_frame):
+    manager = TrainingJobManager(build=_stored_training_set)
+    model_path = str(tmp_path / "attendance_model.pkl")
+
+    running = manager.submit(db, _store(tmp_path, training_frame(200_000), "large.pkl"), model_path)
+    queued = manager.submit(db, _store(tmp_path, training_frame(300)), model_path)
+    assert _wait_for(manager, db, running.id, (RUNNING,)).status == RUNNING
+
+    manager.shutdown()
+    for job_id in (running.id, queued.id):
+        db.expire_all()
+        job = manager.get(db, job_id)
+        assert (job.status, job.finished_at is not None) == (CANCELLED, True)
+
+
+def test_stale_jobs_of_a_dead_worker_are_reaped(db):
+    stale = datetime.utcnow() - timedelta(minutes=5)
+    db.add_all([
+        TrainingJob(id="deadrunning", status=RUNNING, heartbeat_at=stale),
+        TrainingJob(id="deadqueued", status=QUEUED, heartbeat_at=stale),
+        TrainingJob(id="alive", status=QUEUED, heartbeat_at=datetime.utcnow()),
+    ])
+    db.commit()
+
+    assert TrainingJobManager(stale_seconds=60).reap_stale(db) == 2
+    statuses = {job.id: job.status for job in db.query(TrainingJob)}
+    assert statuses == {"deadrunning": FAILED, "deadqueued": FAILED, "alive": QUEUED}